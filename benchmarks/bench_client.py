@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Client throughput and latency benchmark against the local stand-in server.
+
+Starts benchmarks/standin_server.py in-process on a free port and drives the
+same number of tools/call requests through each fan-out path the CLI uses:
+
+  * sequential ``MCPClient.call_tool``;
+  * ``MCPClient.call_tool`` from a thread pool (``call --input``);
+  * ``MCPClient.batch`` (JSON-RPC array POSTs, ``call --batch``);
+  * ``AsyncMCPClient.gather`` (brand/site fan-out).
+
+Each mode gets an untimed warm-up of ``--concurrency`` calls first. Reports
+calls/s plus p50/p99 per-call latency (for ``batch``, the latency of
+the POST each call travelled in; for ``async``, including the wait for a
+concurrency slot). With any of the ``--max-p50-ms``, ``--max-p99-ms`` or
+``--min-calls-per-s`` budgets, exits 1 when a mode misses one (for CI);
+``--min-async-vs-threads RATIO`` also runs both modes and fails when async
+throughput falls below RATIO x the thread pool's.
+
+Usage:
+  python benchmarks/bench_client.py                      # 200 calls, 20 ms server
+  python benchmarks/bench_client.py --calls 1000 --latency-ms 50 --concurrency 16
+  python benchmarks/bench_client.py --error-rate 0.05 --json
+  python benchmarks/bench_client.py --mode batch --max-p99-ms 200 --min-calls-per-s 300
+  python benchmarks/bench_client.py --calls 400 --latency-ms 50 --mode threads --min-async-vs-threads 0.95
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+# Keep the registry/response caches out of the user's cache dir.
+os.environ.setdefault("SEARCHATLAS_CACHE_DIR", tempfile.mkdtemp(prefix="sa-bench-"))
+
+import searchatlas_cli as sa  # noqa: E402
+from standin_server import serve_in_thread  # noqa: E402
+
+TOOL, OP = "project_management", "list_otto_projects"
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def bench_sequential(endpoint: str, calls: list, concurrency: int) -> list[float]:
+    with sa.MCPClient("bench", endpoint) as client:
+        return [timed(lambda c=c: client.call_tool(*c))[1] for c in calls]
+
+
+def bench_threads(endpoint: str, calls: list, concurrency: int) -> list[float]:
+    with sa.MCPClient("bench", endpoint) as client:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(
+                pool.map(lambda c: timed(lambda: client.call_tool(*c))[1], calls)
+            )
+
+
+def bench_batch(endpoint: str, calls: list, concurrency: int) -> list[float]:
+    samples = []
+    with sa.MCPClient("bench", endpoint) as client:
+        for start in range(0, len(calls), sa.BATCH_CHUNK_SIZE):
+            chunk = calls[start : start + sa.BATCH_CHUNK_SIZE]
+            _, seconds = timed(lambda: client.batch(chunk, concurrency))
+            samples.extend([seconds] * len(chunk))
+    return samples
+
+
+def bench_async(endpoint: str, calls: list, concurrency: int) -> list[float]:
+    import asyncio
+
+    async def run() -> list[float]:
+        async with sa.AsyncMCPClient("bench", endpoint, concurrency) as client:
+
+            async def one(call) -> float:
+                start = time.perf_counter()
+                await client.call_tool(*call)
+                return time.perf_counter() - start
+
+            return await asyncio.gather(*(one(c) for c in calls))
+
+    return asyncio.run(run())
+
+
+MODES = {
+    "sequential": bench_sequential,
+    "threads": bench_threads,
+    "batch": bench_batch,
+    "async": bench_async,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=sa.DEFAULT_CONCURRENCY)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--items", type=int, default=20, help="Records per response")
+    parser.add_argument(
+        "--mode", action="append", choices=sorted(MODES), help="Repeatable"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument(
+        "--max-p50-ms", type=float, default=None, help="Budget: max p50 per mode"
+    )
+    parser.add_argument(
+        "--max-p99-ms", type=float, default=None, help="Budget: max p99 per mode"
+    )
+    parser.add_argument(
+        "--min-calls-per-s",
+        type=float,
+        default=None,
+        help="Budget: min throughput per mode",
+    )
+    parser.add_argument(
+        "--min-async-vs-threads",
+        type=float,
+        default=None,
+        metavar="RATIO",
+        help="Budget: min async calls/s as a multiple of threads calls/s",
+    )
+    args = parser.parse_args()
+    modes = args.mode or list(MODES)
+    if args.min_async_vs_threads is not None:
+        modes += [m for m in ("threads", "async") if m not in modes]
+
+    server, endpoint = serve_in_thread(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        items=args.items,
+        seed=0,
+    )
+    # Distinct params so nothing is served from a cache.
+    calls = [(TOOL, OP, {"page": 1, "n": i}) for i in range(args.calls)]
+    results = {}
+    try:
+        for mode in modes:
+            # Untimed warm-up so one-time costs (first import of the async
+            # stack, the first connections) don't count against one mode.
+            MODES[mode](endpoint, calls[: args.concurrency], args.concurrency)
+            samples, wall = timed(
+                lambda: MODES[mode](endpoint, calls, args.concurrency)
+            )
+            results[mode] = {
+                "calls": len(samples),
+                "wall_s": round(wall, 3),
+                "calls_per_s": round(len(samples) / wall, 1),
+                "p50_ms": round(percentile(samples, 0.50) * 1000, 1),
+                "p99_ms": round(percentile(samples, 0.99) * 1000, 1),
+            }
+        results["server"] = dict(server.state.stats)
+    finally:
+        server.shutdown()
+
+    budgeted = any(
+        b is not None
+        for b in (
+            args.max_p50_ms,
+            args.max_p99_ms,
+            args.min_calls_per_s,
+            args.min_async_vs_threads,
+        )
+    )
+    failures = []
+    for mode, r in results.items():
+        if mode == "server":
+            continue
+        if args.max_p50_ms is not None and r["p50_ms"] > args.max_p50_ms:
+            failures.append(f"{mode} p50 {r['p50_ms']} ms > {args.max_p50_ms:g}")
+        if args.max_p99_ms is not None and r["p99_ms"] > args.max_p99_ms:
+            failures.append(f"{mode} p99 {r['p99_ms']} ms > {args.max_p99_ms:g}")
+        if args.min_calls_per_s is not None and r["calls_per_s"] < args.min_calls_per_s:
+            failures.append(
+                f"{mode} {r['calls_per_s']} calls/s < {args.min_calls_per_s:g}"
+            )
+    if args.min_async_vs_threads is not None:
+        ratio = results["async"]["calls_per_s"] / results["threads"]["calls_per_s"]
+        if ratio < args.min_async_vs_threads:
+            failures.append(
+                f"async/threads {ratio:.2f}x < {args.min_async_vs_threads:g}x"
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return report(failures, quiet=True)
+    print(
+        f"{args.calls} calls, concurrency {args.concurrency}, "
+        f"server latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms\n"
+    )
+    print(f"{'mode':<12} {'calls/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'wall s':>8}")
+    for mode, r in results.items():
+        if mode == "server":
+            continue
+        print(
+            f"{mode:<12} {r['calls_per_s']:>9.1f} {r['p50_ms']:>9.1f} "
+            f"{r['p99_ms']:>9.1f} {r['wall_s']:>8.2f}"
+        )
+    print(f"\nserver: {results['server']}")
+    return report(failures, quiet=not budgeted)
+
+
+def report(failures: list[str], quiet: bool = False) -> int:
+    """Exit status for the budget checks (1 if any failed)."""
+    if failures:
+        print("\nOVER BUDGET: " + "; ".join(failures), file=sys.stderr)
+        return 1
+    if not quiet:
+        print("\nwithin budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Memory and time of rendering large responses through ``_output``.
+
+Builds a tools/call response the way the server sends it (one text item
+holding a JSON array of ``--items`` records, generated by the stand-in
+server) and renders it in each ``--format``, with stdout discarded. Reports
+wall time and the tracemalloc peak above the response itself, so a format
+that materialises extra copies of the payload shows up as a multiple of
+its size.
+
+``rich`` is opt-in: syntax-highlighting a multi-megabyte payload takes
+minutes, so it is only worth timing on small ``--items``. With a
+``--max-seconds``, ``--max-peak-mb`` or ``--max-peak-x-payload`` budget,
+exits 1 when a format exceeds it (for CI).
+
+Usage:
+  python benchmarks/bench_output.py                       # 20k records
+  python benchmarks/bench_output.py --items 100000 --fields id,url
+  python benchmarks/bench_output.py --items 500 --format rich --format json
+  python benchmarks/bench_output.py --format ndjson --max-peak-x-payload 0.5
+  python benchmarks/bench_output.py --format ndjson --max-seconds 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import searchatlas_cli as sa  # noqa: E402
+from standin_server import StandinState  # noqa: E402
+
+FORMATS = ("ndjson", "json", "rich")
+DEFAULT_FORMATS = ("ndjson", "json")
+
+
+def make_response(items: int, item_bytes: int) -> dict:
+    state = StandinState(items=items, item_bytes=item_bytes)
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": state.call("project_management", "list_otto_projects", {}),
+    }
+
+
+def measure(data: dict, fmt: str, fields: list[str] | None) -> tuple[float, int]:
+    """(seconds, peak bytes allocated) for one ``_output`` call.
+
+    Timed and traced in separate runs: tracemalloc slows every allocation,
+    which would mostly penalise formats that allocate many small objects.
+    """
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        sa._output(data, fmt, fields)
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        sa._output(data, fmt, fields)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--item-bytes", type=int, default=200)
+    parser.add_argument("--fields", default=None, help="Comma-separated projection")
+    parser.add_argument("--format", action="append", choices=FORMATS, help="Repeatable")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument(
+        "--max-seconds", type=float, default=None, help="Budget: max time per format"
+    )
+    parser.add_argument(
+        "--max-peak-mb", type=float, default=None, help="Budget: max peak per format"
+    )
+    parser.add_argument(
+        "--max-peak-x-payload",
+        type=float,
+        default=None,
+        help="Budget: max peak as a multiple of the payload size",
+    )
+    args = parser.parse_args()
+
+    fields = args.fields.split(",") if args.fields else None
+    data = make_response(args.items, args.item_bytes)
+    size = len(data["result"]["content"][0]["text"])
+    if "rich" in (args.format or ()):
+        # Warm up lazy imports (rich, pygments) so they don't count as payload cost.
+        measure(make_response(2, 10), "rich", None)
+
+    results = {}
+    for fmt in args.format or DEFAULT_FORMATS:
+        seconds, peak = measure(data, fmt, fields)
+        results[fmt] = {
+            "seconds": round(seconds, 3),
+            "peak_mb": round(peak / 1e6, 2),
+            "peak_x_payload": round(peak / size, 2),
+        }
+
+    budgeted = any(
+        b is not None
+        for b in (args.max_seconds, args.max_peak_mb, args.max_peak_x_payload)
+    )
+    failures = []
+    for fmt, r in results.items():
+        for key, budget in (
+            ("seconds", args.max_seconds),
+            ("peak_mb", args.max_peak_mb),
+            ("peak_x_payload", args.max_peak_x_payload),
+        ):
+            if budget is not None and r[key] > budget:
+                failures.append(f"{fmt} {key} {r[key]} > {budget:g}")
+
+    if args.json:
+        print(json.dumps({"payload_bytes": size, **results}, indent=2))
+        return report(failures, quiet=True)
+    print(f"{args.items} records, payload {size / 1e6:.2f} MB, fields={args.fields}\n")
+    print(f"{'format':<8} {'seconds':>9} {'peak MB':>9} {'x payload':>10}")
+    for fmt, r in results.items():
+        print(
+            f"{fmt:<8} {r['seconds']:>9.3f} {r['peak_mb']:>9.2f} "
+            f"{r['peak_x_payload']:>10.2f}"
+        )
+    return report(failures, quiet=not budgeted)
+
+
+def report(failures: list[str], quiet: bool = False) -> int:
+    """Exit status for the budget checks (1 if any failed)."""
+    if failures:
+        print("\nOVER BUDGET: " + "; ".join(failures), file=sys.stderr)
+        return 1
+    if not quiet:
+        print("\nwithin budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
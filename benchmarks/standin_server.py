@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""Local stand-in for the SearchAtlas MCP server.
+
+Speaks the JSON-RPC 2.0 subset searchatlas_cli.py uses, so benchmarks and
+offline runs never touch mcp.searchatlas.com:
+
+  * ``initialize`` (returns an ``Mcp-Session-Id`` header) and ``tools/list``,
+    with the registry parsed from AGENT_PLAYBOOK.md's tool tables (name
+    collisions included, as on the real server);
+  * ``tools/call``, single or batched, where
+      - task-starting ops (generate_*, create_*, refresh_*, ...) return a
+        ``task_id`` whose status moves PENDING -> STARTED -> SUCCESS over
+        ``--task-seconds``,
+      - ``*task_status`` / ``check_ps_status`` ops report that progress,
+      - every other op returns ``--items`` records of ``--item-bytes``
+        each, paginated when ``page``/``page_size`` or ``offset``/``limit``
+        params are sent;
+  * fault injection: ``--error-rate`` (transient "Internal Server Error"
+    results) and ``--throttle-rate`` (HTTP 429 with Retry-After: 0);
+  * MCP streamable HTTP for clients that accept ``text/event-stream``:
+    sessions (unknown ``Mcp-Session-Id`` -> 404, DELETE ends one), 202 for
+    notifications, and tools/call answered as an SSE stream of
+    ``--stream-events`` progress notifications over ``--stream-seconds``
+    followed by the result;
+  * ``GET /stats`` for request counters.
+
+Usage:
+  python benchmarks/standin_server.py --port 8765 --latency-ms 40 --items 500
+  MCP_ENDPOINT=http://127.0.0.1:8765/ MCP_API_KEY=x python searchatlas_cli.py tools
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PLAYBOOK = Path(__file__).resolve().parent.parent / "AGENT_PLAYBOOK.md"
+REGISTRY_ROW = re.compile(r"^\| *\d+\+? *\| *`([^`]+)` *\| *(.*?) *\| *(\S+) *\|\s*$")
+TASK_OPS = re.compile(
+    r"^(generate|create|start|build|refresh|bulk|submit|deploy|publish|write)_"
+)
+STATUS_OPS = re.compile(r"task_status$|^check_ps_status$")
+
+DEFAULTS = {
+    "latency_ms": 20.0,
+    "jitter_ms": 0.0,
+    "error_rate": 0.0,
+    "throttle_rate": 0.0,
+    "items": 50,
+    "item_bytes": 200,
+    "task_seconds": 2.0,
+    "stream_events": 3,
+    "stream_seconds": 1.0,
+    "seed": None,
+}
+
+
+def load_registry(path: Path = PLAYBOOK) -> list[dict]:
+    """MCP ``tools`` entries from the playbook's tool tables."""
+    tools = []
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        lines = []
+    for line in lines:
+        m = REGISTRY_ROW.match(line)
+        if not m:
+            continue
+        name, ops_cell, category = m.groups()
+        ops = re.findall(r"`([^`]+)`", ops_cell)
+        if not ops:
+            continue
+        tools.append(
+            {
+                "name": name,
+                "description": f"{category} tool ({len(ops)} operations)",
+                "annotations": {"category": category},
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "op": {"type": "string", "enum": ops},
+                        "params": {"type": "object"},
+                    },
+                    "required": ["op"],
+                },
+            }
+        )
+    return tools or [
+        {
+            "name": "project_management",
+            "description": "fallback tool",
+            "inputSchema": {"properties": {"op": {"enum": ["list_otto_projects"]}}},
+        }
+    ]
+
+
+class StandinState:
+    """Config plus mutable server state shared by all handler threads."""
+
+    def __init__(self, **config):
+        self.config = {**DEFAULTS, **config}
+        self.registry = load_registry()
+        self.random = random.Random(self.config["seed"])
+        self.tasks: dict[str, float] = {}
+        self.sessions: set[str] = set()
+        self.stats = {
+            "http_requests": 0,
+            "rpc_calls": 0,
+            "errors": 0,
+            "throttled": 0,
+            "sessions": 0,
+            "streams": 0,
+        }
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._padding = "x" * max(0, int(self.config["item_bytes"]) - 60)
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    def chance(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self.random.random() < rate
+
+    def records(self, params: dict) -> object:
+        total = int(self.config["items"])
+        if "offset" in params or "limit" in params:
+            start = int(params.get("offset") or 0)
+            size = int(params.get("limit") or 100)
+            return {
+                "total": total,
+                "offset": start,
+                "limit": size,
+                "items": [
+                    self.record(i) for i in range(start, min(total, start + size))
+                ],
+            }
+        if "page" in params or "page_size" in params:
+            page = int(params.get("page") or 1)
+            size = int(params.get("page_size") or 100)
+            start = (page - 1) * size
+            return {
+                "count": total,
+                "next": page + 1 if start + size < total else None,
+                "results": [
+                    self.record(i) for i in range(start, min(total, start + size))
+                ],
+            }
+        return [self.record(i) for i in range(total)]
+
+    def record(self, i: int) -> dict:
+        return {
+            "id": i,
+            "name": f"item-{i}",
+            "url": f"https://example.com/page/{i}",
+            "score": i % 100,
+            "padding": self._padding,
+        }
+
+    def call(self, name: str, op: str, params: dict) -> dict:
+        """The ``result`` of one tools/call."""
+        if self.chance(self.config["error_rate"]):
+            self.count("errors")
+            return _text("Internal Server Error", is_error=True)
+        if STATUS_OPS.search(op):
+            task_id = str(params.get("task_id", ""))
+            with self._lock:
+                created = self.tasks.get(task_id)
+            if created is None:
+                return _text(f"Task {task_id!r} not found", is_error=True)
+            age = time.monotonic() - created
+            duration = self.config["task_seconds"]
+            state = "PENDING" if age < duration / 2 else "STARTED"
+            if age >= duration:
+                state = "SUCCESS"
+            return _text(json.dumps({"task_id": task_id, "status": state}))
+        if TASK_OPS.match(op):
+            task_id = f"task-{next(self._ids)}"
+            with self._lock:
+                self.tasks[task_id] = time.monotonic()
+            return _text(json.dumps({"task_id": task_id, "status": "PENDING"}))
+        return _text(json.dumps(self.records(params)))
+
+    def handle(self, request: dict) -> dict:
+        self.count("rpc_calls")
+        req_id = request.get("id")
+        method = request.get("method")
+        if method == "initialize":
+            result = {
+                "protocolVersion": "2025-03-26",
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "searchatlas-standin", "version": "1"},
+            }
+        elif method == "tools/list":
+            result = {"tools": self.registry}
+        elif method == "tools/call":
+            params = request.get("params") or {}
+            arguments = params.get("arguments") or {}
+            result = self.call(
+                params.get("name", ""),
+                arguments.get("op", ""),
+                arguments.get("params") or {},
+            )
+        else:
+            return {
+                "jsonrpc": "2.0",
+                "id": req_id,
+                "error": {"code": -32601, "message": f"Method not found: {method}"},
+            }
+        return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+
+def _text(text: str, is_error: bool = False) -> dict:
+    return {"content": [{"type": "text", "text": text}], "isError": is_error}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # client's delayed ACK adds ~40 ms to every response.
+    disable_nagle_algorithm = True
+    server: ThreadingHTTPServer  # with a ``state`` attribute
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path.rstrip("/") == "/stats":
+            self._send(200, json.dumps(state.stats).encode())
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+    def do_DELETE(self):
+        state = self.server.state
+        session = self.headers.get("Mcp-Session-Id")
+        with state._lock:
+            known = session in state.sessions
+            state.sessions.discard(session)
+        self._send(200 if known else 404, b"{}")
+
+    def do_POST(self):
+        state = self.server.state
+        state.count("http_requests")
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        config = state.config
+        streamable = "text/event-stream" in self.headers.get("Accept", "")
+        session = self.headers.get("Mcp-Session-Id")
+        if streamable and session is not None:
+            with state._lock:
+                known = session in state.sessions
+            if not known:
+                self._send(404, b'{"error": "unknown session"}')
+                return
+        delay = config["latency_ms"] + state.random.uniform(
+            -config["jitter_ms"], config["jitter_ms"]
+        )
+        time.sleep(max(0.0, delay) / 1000)
+        if state.chance(config["throttle_rate"]):
+            state.count("throttled")
+            self._send(429, b'{"error": "Too Many Requests"}', {"Retry-After": "0"})
+            return
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            self._send(400, b'{"error": "invalid JSON"}')
+            return
+        if isinstance(payload, dict) and "id" not in payload:
+            self._send(202, b"")  # a notification, e.g. notifications/initialized
+            return
+        if isinstance(payload, list):
+            out = [state.handle(r) for r in payload]
+        else:
+            out = state.handle(payload)
+        headers = {}
+        if isinstance(payload, dict) and payload.get("method") == "initialize":
+            session = f"standin-{next(state._ids)}"
+            headers["Mcp-Session-Id"] = session
+            with state._lock:
+                state.sessions.add(session)
+            state.count("sessions")
+        elif (
+            streamable
+            and isinstance(payload, dict)
+            and payload.get("method") == "tools/call"
+            and config["stream_events"] > 0
+        ):
+            meta = (payload.get("params") or {}).get("_meta") or {}
+            self._stream(out, meta.get("progressToken"))
+            return
+        self._send(200, json.dumps(out).encode(), headers)
+
+    def _stream(self, result: dict, token) -> None:
+        """Answer as SSE: progress notifications, then the response."""
+        state = self.server.state
+        state.count("streams")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(message: dict) -> None:
+            data = f"data: {json.dumps(message)}\n\n".encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        total = int(state.config["stream_events"])
+        pause = state.config["stream_seconds"] / total
+        self.wfile.write(b"d\r\n: keep-alive\n\r\n")  # an SSE comment
+        for step in range(1, total + 1):
+            time.sleep(pause)
+            if token is not None:
+                event(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "notifications/progress",
+                        "params": {
+                            "progressToken": token,
+                            "progress": step,
+                            "total": total,
+                            "message": f"step {step} of {total}",
+                        },
+                    }
+                )
+        event(result)
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class StandinServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops the SYNs of a client opening
+    # more connections at once (async fan-out), which then stall for the
+    # ~1 s TCP retransmit and skew the benchmarks.
+    request_queue_size = 128
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, **config):
+    """A stand-in server (not yet serving); ``port=0`` picks a free port."""
+    server = StandinServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.state = StandinState(**config)
+    return server
+
+
+def serve_in_thread(**config):
+    """Start a stand-in on a free port; returns ``(server, endpoint_url)``.
+
+    Call ``server.shutdown()`` when done.
+    """
+    server = make_server(**config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=DEFAULTS["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULTS["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULTS["error_rate"])
+    parser.add_argument(
+        "--throttle-rate", type=float, default=DEFAULTS["throttle_rate"]
+    )
+    parser.add_argument("--items", type=int, default=DEFAULTS["items"])
+    parser.add_argument("--item-bytes", type=int, default=DEFAULTS["item_bytes"])
+    parser.add_argument("--task-seconds", type=float, default=DEFAULTS["task_seconds"])
+    parser.add_argument("--stream-events", type=int, default=DEFAULTS["stream_events"])
+    parser.add_argument(
+        "--stream-seconds", type=float, default=DEFAULTS["stream_seconds"]
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    server = make_server(host, port, **args)
+    print(
+        f"stand-in MCP server on http://{host}:{server.server_address[1]}/", flush=True
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for searchatlas_cli.py.
+
+Agents shell out to the CLI hundreds of times per run, so process start-up is
+a real cost. This script measures two things and fails when either blows its
+budget:
+
+  * import time of the module itself, from ``python -X importtime``, plus a
+    check that the heavy dependencies (rich, pygments, httpx) stay unloaded;
+  * median wall-clock time of commands that never touch the network or
+    render rich output (``--help``, ``call --dry-run --format json``).
+
+Usage:
+  python benchmarks/startup.py                    # 15 runs, default budgets
+  python benchmarks/startup.py --runs 30 --import-budget-ms 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = ROOT / "searchatlas_cli.py"
+
+# Modules that must not be imported just to load the CLI.
+HEAVY_MODULES = ("rich", "pygments", "httpx", "httpcore", "asyncio")
+
+COMMANDS = {
+    "help": ["--help"],
+    "dry-run": ["call", "project_management", "list_otto_projects", "--dry-run"],
+    "dry-run-json": [
+        "call",
+        "project_management",
+        "list_otto_projects",
+        "--dry-run",
+        "--format",
+        "json",
+    ],
+}
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("MCP_API_KEY", "benchmark")
+    return env
+
+
+def import_profile() -> tuple[float, set[str]]:
+    """Return (cumulative import ms of searchatlas_cli, top-level modules loaded by it)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import searchatlas_cli"],
+        cwd=ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_ms = 0.0
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if name == "searchatlas_cli":
+            cumulative_ms = int(cumulative) / 1000
+    return cumulative_ms, loaded
+
+
+def wall_time(args: list[str], runs: int) -> float:
+    """Median wall-clock milliseconds of running the CLI with ``args``."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(CLI), *args],
+            cwd=ROOT,
+            env=_env(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15, help="Runs per command")
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        default=100.0,
+        help="Max cumulative import time of searchatlas_cli",
+    )
+    parser.add_argument(
+        "--wall-budget-ms",
+        type=float,
+        default=250.0,
+        help="Max median wall time per command",
+    )
+    args = parser.parse_args()
+
+    failures = []
+
+    # Measure with fresh bytecode, as an installed CLI would run; don't rely
+    # on imports writing it (PYTHONDONTWRITEBYTECODE is common in CI).
+    py_compile.compile(str(CLI), doraise=True)
+    import_ms, loaded = import_profile()
+    heavy = sorted(m for m in HEAVY_MODULES if m in loaded)
+    print(
+        f"import searchatlas_cli   {import_ms:8.1f} ms  (budget {args.import_budget_ms:.0f})"
+    )
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import took {import_ms:.1f} ms")
+    if heavy:
+        print(f"  eagerly loaded: {', '.join(heavy)}")
+        failures.append(f"heavy modules loaded at import: {', '.join(heavy)}")
+
+    for label, cmd in COMMANDS.items():
+        ms = wall_time(cmd, args.runs)
+        print(
+            f"{label:<24} {ms:8.1f} ms  (median of {args.runs}, budget {args.wall_budget_ms:.0f})"
+        )
+        if ms > args.wall_budget_ms:
+            failures.append(f"{label} took {ms:.1f} ms")
+
+    if failures:
+        print("\nOVER BUDGET: " + "; ".join(failures), file=sys.stderr)
+        return 1
+    print("\nwithin budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
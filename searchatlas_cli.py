@@ -20,59 +20,1186 @@ Requires: MCP_API_KEY env var (or --api-key flag)
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import importlib
 import json
 import logging
 import os
+import random
+import re
 import sys
+import threading
 import time
 from pathlib import Path
 
 import click
-import httpx
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.syntax import Syntax
-from rich.markdown import Markdown
-
-console = Console()
+
+
+class _Lazy:
+    """Stand-in that builds the real object on first attribute access.
+
+    httpx, asyncio and rich (with pygments) dominate import time, and
+    ``--format json`` / ``--dry-run`` invocations never need most of them.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._target = None
+
+    def __getattr__(self, name):
+        if self._target is None:
+            self._target = self._factory()
+        return getattr(self._target, name)
+
+
+asyncio = _Lazy(lambda: importlib.import_module("asyncio"))
+httpx = _Lazy(lambda: importlib.import_module("httpx"))
+console = _Lazy(lambda: importlib.import_module("rich.console").Console())
 log = logging.getLogger("searchatlas")
 
 MCP_ENDPOINT = "https://mcp.searchatlas.com/api/v1/mcp"
 PLAYBOOK_FILE = Path(__file__).parent / "summit-challenge-playbooks.json"
+CACHE_DIR = Path(
+    os.environ.get("SEARCHATLAS_CACHE_DIR")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "searchatlas"
+)
+REGISTRY_FILE = CACHE_DIR / "registry.json"
+REGISTRY_TTL = 24 * 3600  # seconds
+ROUTES_FILE = CACHE_DIR / "routes.json"  # op -> owning tools, derived from the registry
+SCHEMA_FILE = CACHE_DIR / "schemas.json"
+RESPONSE_CACHE_FILE = CACHE_DIR / "responses.sqlite"
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_CONCURRENCY = 8
+BATCH_CHUNK_SIZE = 50
+ACCOUNTS_PER_WORKER = 25  # --accounts spreads larger runs over worker processes
+DEFAULT_PREFETCH = 4  # pages in flight for iter_pages
+NDJSON_WRITE_LINES = 1000  # ndjson records joined per stdout write
+
+# ---------------------------------------------------------------------------
+# Retries and circuit breaking (AGENT_PLAYBOOK Rule 2)
+# ---------------------------------------------------------------------------
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# Checked first: these never succeed on retry.
+TERMINAL_ERRORS = (
+    "parameter validation error",
+    "credentials not provided",
+    "authentication failed",
+    "not found in registry",
+    "unsupported operation",
+    "local validation failed",
+    "quota exhausted",
+)
+TRANSIENT_ERRORS = (
+    "internal server error",
+    "server error",
+    "timed out",
+    "timeout",
+    "temporarily unavailable",
+    "service unavailable",
+    "bad gateway",
+    "overloaded",
+    "too many requests",
+    "rate limit",
+)
+# Write ops are only retried on these: the server refused them unprocessed.
+UNPROCESSED_ERRORS = ("too many requests", "rate limit")
+
+
+def _classify_error(resp: dict) -> str | None:
+    """Classify a response as ``"retryable"``, ``"terminal"`` or None (success).
+
+    Unrecognized errors count as terminal so we never hammer on a guess.
+    """
+    msg = _error_message(resp)
+    if msg is None:
+        return None
+    lowered = msg.lower()
+    if any(marker in lowered for marker in TERMINAL_ERRORS):
+        return "terminal"
+    if any(marker in lowered for marker in TRANSIENT_ERRORS):
+        return "retryable"
+    return "terminal"
+
+
+def _is_transient_http(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(
+        exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+    )
+
+
+def _is_read_request(method: str, params: dict) -> bool:
+    """Is this request safe to send twice (anything but a write tools/call)?"""
+    if method != "tools/call":
+        return True
+    return _is_read_op(str(params.get("arguments", {}).get("op", "")))
+
+
+def _should_retry(
+    read: bool, exc: Exception | None = None, resp: dict | None = None
+) -> bool:
+    """May a failed request be retried automatically?
+
+    Reads retry on any transient failure. A write may already have been
+    applied when it timed out or got a 5xx, so it is only retried when the
+    server never processed it: connect errors, 429, 503 with Retry-After,
+    or an RPC rate-limit rejection.
+    """
+    if exc is not None:
+        if read:
+            return _is_transient_http(exc)
+        if isinstance(exc, httpx.HTTPStatusError):
+            status = exc.response.status_code
+            return status == 429 or (
+                status == 503 and "Retry-After" in exc.response.headers
+            )
+        return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+    if _classify_error(resp) != "retryable":
+        return False
+    return read or any(
+        marker in _error_message(resp).lower() for marker in UNPROCESSED_ERRORS
+    )
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Seconds requested by a ``Retry-After`` header (delta or HTTP date)."""
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    value = exc.response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for transient failures."""
+
+    def __init__(
+        self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 30.0
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Sleep before retry number ``attempt`` (0-based), honoring Retry-After."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # "Full jitter": spreads retries from many workers apart.
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    """Per tool+op breaker that stops calls to a backend that keeps failing.
+
+    After ``threshold`` consecutive calls that failed transiently (retries
+    already exhausted), the circuit opens for ``cooldown`` seconds; then a
+    single trial call is let through and its outcome closes or re-opens it.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        with self._lock:
+            opened = self._opened_at.get(key)
+            if opened is None:
+                return True
+            if time.monotonic() - opened >= self.cooldown:
+                # Half-open: let this one call probe the backend.
+                self._opened_at[key] = time.monotonic()
+                return True
+            return False
+
+    def retry_in(self, key: str) -> float:
+        opened = self._opened_at.get(key, 0.0)
+        return max(0.0, self.cooldown - (time.monotonic() - opened))
+
+    def record(self, key: str, failed: bool) -> None:
+        with self._lock:
+            if not failed:
+                self._failures.pop(key, None)
+                self._opened_at.pop(key, None)
+                return
+            self._failures[key] = self._failures.get(key, 0) + 1
+            if self._failures[key] >= self.threshold:
+                if key not in self._opened_at:
+                    log.warning(
+                        "Circuit open for %s after %d failures",
+                        key,
+                        self._failures[key],
+                    )
+                self._opened_at[key] = time.monotonic()
+
+
+def _breaker_key(method: str, params: dict) -> str | None:
+    if method != "tools/call":
+        return None
+    return f"{params.get('name')} -> {params.get('arguments', {}).get('op')}"
+
+
+def _circuit_open_response(key: str, breaker: CircuitBreaker) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": None,
+        "error": {
+            "code": -32001,
+            "message": f"Circuit open for {key}: backend keeps failing; "
+            f"not calling it again for {breaker.retry_in(key):.0f}s",
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting and quota guard (opt-in: --rate-limit, --quota-guard)
+# ---------------------------------------------------------------------------
+
+RATE_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens/s, holding up to ``capacity``.
+
+    ``reserve`` always takes its tokens (the balance may go negative) and
+    returns how long the caller must sleep first, so sync and async callers
+    share one bucket and are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back, e.g. for a server's Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def _parse_rate_limit(spec: str) -> tuple[str, float, float | None]:
+    """Parse ``[KEY=]RATE[/s|/m|/h][:BURST]`` into (key, tokens/s, burst).
+
+    KEY is a tool name or category; without one the limit applies to every
+    tool that has no more specific limit ("*").
+    """
+    key, _, rest = spec.rpartition("=")
+    rate, _, burst = rest.partition(":")
+    count, _, unit = rate.partition("/")
+    if unit not in ("", *RATE_UNITS):
+        raise ValueError(f"unknown rate unit {unit!r} in {spec!r}")
+    per_second = float(count) / RATE_UNITS.get(unit or "s")
+    if per_second <= 0:
+        raise ValueError(f"rate must be positive in {spec!r}")
+    return key.strip() or "*", per_second, float(burst) if burst else None
+
+
+class RateLimiter:
+    """Token buckets per tool, per category or for everything (``*``).
+
+    A tool uses the first bucket found for its own name, then for any of
+    its categories, then ``*``; tools sharing a category share its bucket.
+    """
+
+    def __init__(
+        self,
+        buckets: dict[str, TokenBucket],
+        categories: dict[str, list[str]] | None = None,
+    ):
+        self.buckets = buckets
+        self.categories = categories or {}
+
+    @classmethod
+    def from_specs(
+        cls, specs, categories: dict[str, list[str]] | None = None
+    ) -> RateLimiter:
+        buckets = {}
+        for spec in specs:
+            key, rate, burst = _parse_rate_limit(spec)
+            buckets[key] = TokenBucket(rate, burst)
+        return cls(buckets, categories)
+
+    def bucket(self, tool: str) -> TokenBucket | None:
+        for key in (tool, *self.categories.get(tool, ()), "*"):
+            if key in self.buckets:
+                return self.buckets[key]
+        return None
+
+    def reserve(self, tool: str, tokens: float = 1.0) -> float:
+        bucket = self.bucket(tool)
+        return bucket.reserve(tokens) if bucket else 0.0
+
+    def pause(self, tool: str, seconds: float) -> None:
+        bucket = self.bucket(tool)
+        if bucket:
+            bucket.pause(seconds)
+
+
+# Quota snapshots read before the first quota-consuming call.
+QUOTA_SOURCES = (
+    ("quota_management", "get_otto_quota"),
+    ("payment", "get_hdc_balance"),
+    ("grids", "get_heatmap_quota"),
+)
+# (label, tool, op pattern, QUOTA_SOURCES entry or None for any, pattern
+# matched against balance field paths within that source's response)
+QUOTA_RULES = (
+    (
+        "otto_ai_suggestions",
+        "seo_analysis",
+        r"generate_(bulk|single)_recommendations?",
+        ("quota_management", "get_otto_quota"),
+        r"suggestion|recommendation",
+    ),
+    (
+        "hdc_credits",
+        "distribution",
+        r"publish_press_release|build_cloud_stack",
+        ("payment", "get_hdc_balance"),
+        r"hdc|hyperdrive",
+    ),
+    (
+        "content_generation",
+        "content_generation",
+        r"(auto_)?generate_.*article",
+        None,
+        r"content",
+    ),
+    (
+        "heatmap_points",
+        "grids",
+        r"(bulk_)?refresh_grids?|setup_grids",
+        ("grids", "get_heatmap_quota"),
+        r"heatmap|point",
+    ),
+)
+REMAINING_KEYS = ("remaining", "available", "balance", "left")
+LIMIT_KEYS = ("limit", "total", "max", "quota", "allowed")
+USED_KEYS = ("used", "consumed", "spent")
+
+
+def _number(value) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", ""))
+        except ValueError:
+            return None
+    return None
+
+
+def _quota_balances(payload, prefix: str = "") -> dict[str, float]:
+    """Flatten a quota payload into ``{name: remaining}``.
+
+    Understands ``{"remaining": n}``-style entries, ``{"limit": a, "used":
+    b}`` pairs and scalar fields whose name says remaining/available/balance.
+    """
+    found: dict[str, float] = {}
+    if isinstance(payload, list):
+        for i, item in enumerate(payload):
+            name = item.get("name") if isinstance(item, dict) else None
+            found.update(_quota_balances(item, f"{prefix}.{name or i}"))
+        return found
+    if not isinstance(payload, dict):
+        return found
+    lowered = {str(k).lower(): v for k, v in payload.items()}
+    remaining = next(
+        (n for n in map(_number, map(lowered.get, REMAINING_KEYS)) if n is not None),
+        None,
+    )
+    if remaining is None:
+        limit = next(
+            (_number(lowered.get(k)) for k in LIMIT_KEYS if k in lowered), None
+        )
+        used = next((_number(lowered.get(k)) for k in USED_KEYS if k in lowered), None)
+        if limit is not None and used is not None:
+            remaining = limit - used
+    if remaining is not None and prefix:
+        found[prefix] = remaining
+    for key, value in payload.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, (dict, list)):
+            found.update(_quota_balances(value, path))
+        elif remaining is None and any(w in str(key).lower() for w in REMAINING_KEYS):
+            number = _number(value)
+            if number is not None:
+                found[path] = number
+    return found
+
+
+def _quota_units(op: str, params: dict | None) -> float:
+    """Quota a call consumes: one per list item for bulk ops, else one."""
+    if "bulk" in op and params:
+        sizes = [len(v) for v in params.values() if isinstance(v, list)]
+        if sizes:
+            return float(max(sizes))
+    return 1.0
+
+
+class QuotaGuard:
+    """Refuses calls that would spend more quota than the account has left.
+
+    Balances come from QUOTA_SOURCES, read once before the first call that
+    matches a QUOTA_RULES entry, and are decremented locally per call. A
+    server "quota" error marks the matching balance as exhausted.
+    """
+
+    def __init__(self):
+        self.balances: dict[str, float] | None = None
+        # balance name -> (source, field path without the "tool.op" prefix)
+        self._fields: dict[str, tuple[tuple[str, str], str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def rule(tool: str, op: str):
+        for rule in QUOTA_RULES:
+            if rule[1] == tool and re.fullmatch(rule[2], op):
+                return rule
+        return None
+
+    def pending(self, tool: str, op: str) -> bool:
+        """True if this call needs the quota snapshot and it isn't loaded yet."""
+        return self.balances is None and self.rule(tool, op) is not None
+
+    def load(self, responses: dict[tuple[str, str], dict]) -> None:
+        balances: dict[str, float] = {}
+        fields = {}
+        for (tool, op), resp in responses.items():
+            if _error_message(resp) is not None:
+                log.debug("Quota source %s -> %s unavailable", tool, op)
+                continue
+            prefix = f"{tool}.{op}"
+            for name, value in _quota_balances(_payload(resp), prefix).items():
+                balances[name] = value
+                fields[name] = ((tool, op), name[len(prefix) :].lstrip("."))
+        log.debug("Quota balances: %s", balances)
+        with self._lock:
+            if self.balances is None:
+                self.balances = balances
+                self._fields = fields
+
+    def _balance_key(self, rule) -> str:
+        """Balance spent by ``rule``: a matching field of its source, else the
+        source's own top-level balance, else the rule label.
+
+        Patterns see field paths without the ``tool.op`` prefix, so a source
+        name such as ``payment.get_hdc_balance`` never matches by itself.
+        """
+        label, _, _, source, pattern = rule
+        whole = None
+        for name in self.balances or {}:
+            if name not in self._fields:
+                continue
+            src, field = self._fields[name]
+            if source is not None and src != source:
+                continue
+            if field and re.search(pattern, field, re.IGNORECASE):
+                return name
+            if not field and source is not None and whole is None:
+                whole = name
+        return whole or label
+
+    def reserve(self, tool: str, op: str, params: dict | None) -> dict | None:
+        """Take this call's quota, or return an error response refusing it."""
+        rule = self.rule(tool, op)
+        if rule is None:
+            return None
+        units = _quota_units(op, params)
+        with self._lock:
+            key = self._balance_key(rule)
+            remaining = (self.balances or {}).get(key)
+            if remaining is None:
+                return None  # no snapshot for this quota: let the server decide
+            if remaining < units:
+                return {
+                    "jsonrpc": "2.0",
+                    "id": None,
+                    "error": {
+                        "code": -32003,
+                        "message": f"Quota exhausted for {rule[0]} ({key}): "
+                        f"{remaining:g} left, {tool} -> {op} needs {units:g}",
+                    },
+                }
+            self.balances[key] = remaining - units
+        return None
+
+    def observe(self, tool: str, op: str, resp: dict) -> None:
+        rule = self.rule(tool, op)
+        msg = _error_message(resp)
+        if rule is None or msg is None or "quota" not in msg.lower():
+            return
+        with self._lock:
+            if self.balances is None:
+                self.balances = {}
+            key = self._balance_key(rule)
+            self.balances[key] = 0.0
+        log.warning("%s reported exhausted by the server; refusing further calls", key)
+
+
+# ---------------------------------------------------------------------------
+# Call metrics (opt-in: --profile, --metrics-out)
+# ---------------------------------------------------------------------------
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# phase -> (start mark, end mark) from httpcore trace events; DNS resolution
+# happens inside connect_tcp, so it is counted as part of "connect".
+TRACE_PHASES = {
+    "connect": ("connect_tcp.started", "connect_tcp.complete"),
+    "tls": ("start_tls.started", "start_tls.complete"),
+    "send": ("send_request_headers.started", "send_request_body.complete"),
+    "server": ("send_request_body.complete", "receive_response_headers.complete"),
+    "receive": (
+        "receive_response_headers.complete",
+        "receive_response_body.complete",
+    ),
+}
+PHASES = (*TRACE_PHASES, "decode", "render")
+
+
+class _CallTrace:
+    """Times one HTTP attempt for ``Metrics`` and hands it to a ``Recorder``.
+
+    Passed to httpx as the ``trace`` request extension, it timestamps the
+    connection/HTTP events that TRACE_PHASES turns into phase durations.
+    A no-op when both metrics and recorder are None.
+    """
+
+    def __init__(
+        self,
+        metrics: Metrics | None,
+        key: str,
+        is_async: bool = False,
+        recorder: Recorder | None = None,
+        request: dict | list | None = None,
+        attempt: int = 0,
+    ):
+        self.metrics = metrics
+        self.key = key
+        self.recorder = recorder
+        self.request = request
+        self.attempt = attempt
+        self.marks: dict[str, float] = {}
+        self.decode_s = 0.0
+        self.started = time.perf_counter()
+        self.extensions = None
+        if metrics is not None:
+            self.extensions = {"trace": self.atrace if is_async else self}
+
+    def __call__(self, name: str, info: dict) -> None:
+        # "http11.send_request_headers.started" -> "send_request_headers.started"
+        self.marks[name.split(".", 1)[-1]] = time.perf_counter()
+
+    async def atrace(self, name: str, info: dict) -> None:
+        self(name, info)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+
+    def decode(self, resp, reader=None) -> dict:
+        # A streamed (SSE) body is read while decoding, so its "decode" time
+        # includes waiting for events.
+        start = time.perf_counter()
+        data = reader(resp) if reader else resp.json()
+        self.decode_s = time.perf_counter() - start
+        return data
+
+    def finish(self, resp=None, data: dict | list | None = None, exc=None) -> None:
+        if self.metrics is None and self.recorder is None:
+            return
+        duration = time.perf_counter() - self.started
+        if resp is None and exc is not None:
+            resp = getattr(exc, "response", None)
+        if self.recorder is not None:
+            self.recorder.record(self.request, duration, resp, data, exc, self.attempt)
+        if self.metrics is None:
+            return
+        phases = {"decode": self.decode_s}
+        for phase, (start, end) in TRACE_PHASES.items():
+            if start in self.marks and end in self.marks:
+                phases[phase] = max(0.0, self.marks[end] - self.marks[start])
+        try:
+            request = resp.request if resp is not None else exc.request
+            request_bytes = len(request.content)
+        except (AttributeError, RuntimeError):
+            request_bytes = 0
+        self.metrics.observe(
+            self.key,
+            duration,
+            phases,
+            request_bytes,
+            _response_bytes(resp),
+            _error_class(data if isinstance(data, dict) else None, exc),
+        )
+
+
+class Metrics:
+    """Per tool/op latency histograms, phase timings, byte counts and errors."""
+
+    def __init__(self):
+        self.calls: dict[str, dict] = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str) -> dict:
+        if key not in self.calls:
+            self.calls[key] = {
+                "count": 0,
+                "durations": [],
+                "buckets": [0] * len(LATENCY_BUCKETS),
+                "phases": dict.fromkeys(PHASES, 0.0),
+                "request_bytes": 0,
+                "response_bytes": 0,
+                "errors": {},
+            }
+        return self.calls[key]
+
+    def observe(
+        self,
+        key: str,
+        duration: float,
+        phases: dict[str, float],
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        error_class: str | None = None,
+    ) -> None:
+        """Record one HTTP attempt of ``key`` ("tool -> op" or a method)."""
+        with self._lock:
+            entry = self._entry(key)
+            entry["count"] += 1
+            entry["durations"].append(duration)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    entry["buckets"][i] += 1
+            for phase, seconds in phases.items():
+                entry["phases"][phase] += seconds
+            entry["request_bytes"] += request_bytes
+            entry["response_bytes"] += response_bytes
+            if error_class:
+                entry["errors"][error_class] = entry["errors"].get(error_class, 0) + 1
+
+    def observe_render(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._entry(key)["phases"]["render"] += seconds
+
+    def summary(self) -> dict:
+        """JSON-friendly per-key summary, slowest total time first."""
+        out = {}
+        with self._lock:
+            items = sorted(self.calls.items(), key=lambda kv: -sum(kv[1]["durations"]))
+            for key, entry in items:
+                durations = sorted(entry["durations"])
+                n = len(durations)
+                out[key] = {
+                    "count": entry["count"],
+                    "total_s": round(sum(durations), 4),
+                    "p50_s": round(durations[n // 2], 4) if n else None,
+                    "p95_s": (
+                        round(durations[min(n - 1, int(n * 0.95))], 4) if n else None
+                    ),
+                    "max_s": round(durations[-1], 4) if n else None,
+                    "phases_s": {k: round(v, 4) for k, v in entry["phases"].items()},
+                    "request_bytes": entry["request_bytes"],
+                    "response_bytes": entry["response_bytes"],
+                    "errors": dict(entry["errors"]),
+                }
+        return out
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (for a node_exporter textfile)."""
+        with self._lock:
+            calls = {k: dict(v) for k, v in self.calls.items()}
+        hist = "searchatlas_call_duration_seconds"
+        lines = [
+            f"# HELP {hist} Wall time of MCP HTTP calls.",
+            f"# TYPE {hist} histogram",
+        ]
+        for key, entry in calls.items():
+            for bound, count in zip(LATENCY_BUCKETS, entry["buckets"]):
+                lines.append(f"{hist}_bucket{_prom_labels(key, le=bound)} {count}")
+            lines += [
+                f"{hist}_bucket{_prom_labels(key, le='+Inf')} {entry['count']}",
+                f"{hist}_sum{_prom_labels(key)} {sum(entry['durations']):.6f}",
+                f"{hist}_count{_prom_labels(key)} {entry['count']}",
+            ]
+
+        def counter(name: str, help_text: str, samples) -> None:
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} counter"])
+            lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+        counter(
+            "searchatlas_call_phase_seconds_total",
+            "Time spent per call phase.",
+            (
+                (_prom_labels(key, phase=phase), f"{seconds:.6f}")
+                for key, entry in calls.items()
+                for phase, seconds in entry["phases"].items()
+            ),
+        )
+        counter(
+            "searchatlas_request_bytes_total",
+            "Request body bytes sent.",
+            ((_prom_labels(k), e["request_bytes"]) for k, e in calls.items()),
+        )
+        counter(
+            "searchatlas_response_bytes_total",
+            "Response body bytes received.",
+            ((_prom_labels(k), e["response_bytes"]) for k, e in calls.items()),
+        )
+        counter(
+            "searchatlas_call_errors_total",
+            "Failed calls by error class.",
+            (
+                (_prom_labels(key, error_class=cls), count)
+                for key, entry in calls.items()
+                for cls, count in entry["errors"].items()
+            ),
+        )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Prometheus textfile for ``*.prom``, else a JSON summary; atomic."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        if path.suffix == ".prom":
+            tmp.write_text(self.prometheus())
+        else:
+            summary = {
+                "wall_s": round(time.monotonic() - self.started, 4),
+                "calls": self.summary(),
+            }
+            tmp.write_text(json.dumps(summary, indent=2))
+        tmp.replace(path)
+
+
+def _prom_labels(key: str, **extra) -> str:
+    tool, _, op = key.partition(" -> ")
+    pairs = {"tool": tool, "op": op, **extra}
+    escaped = (
+        str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for v in pairs.values()
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(pairs, escaped)) + "}"
+
+
+def _response_bytes(resp) -> int:
+    if resp is None:
+        return 0
+    try:
+        return len(resp.content)
+    except httpx.ResponseNotRead:  # streamed, or an error before the body
+        return resp.num_bytes_downloaded
+
+
+def _error_class(data: dict | None = None, exc: Exception | None = None) -> str | None:
+    """Short error class for metrics: http_429, ReadTimeout, rpc_terminal, ..."""
+    if exc is not None:
+        response = getattr(exc, "response", None)
+        if response is not None:
+            return f"http_{response.status_code}"
+        return type(exc).__name__
+    kind = _classify_error(data) if data is not None else None
+    return f"rpc_{kind}" if kind else None
+
+
+# ---------------------------------------------------------------------------
+# Traffic capture (opt-in: --record) — replayed by the ``replay`` command
+# ---------------------------------------------------------------------------
+
+
+class Recorder:
+    """Append every HTTP attempt to a JSONL capture file.
+
+    One line per attempt: the wall-clock ``ts`` it was sent, the JSON-RPC
+    request (an object, or an array for batches), HTTP ``status``,
+    ``latency_ms`` and the decoded ``response`` or transport ``error``.
+    Retries are captured with ``attempt`` > 0. The file is opened for
+    append, so successive CLI invocations build up one session capture;
+    the API key (a header) is never written.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        request: dict | list | None,
+        duration: float,
+        resp=None,
+        data: dict | list | None = None,
+        exc: Exception | None = None,
+        attempt: int = 0,
+    ) -> None:
+        entry = {
+            "ts": round(time.time() - duration, 6),
+            "latency_ms": round(duration * 1000, 2),
+            "attempt": attempt,
+            "status": resp.status_code if resp is not None else None,
+            "request": request,
+        }
+        if data is None and exc is not None:
+            entry["error"] = f"{type(exc).__name__}: {exc}"
+        else:
+            entry["response"] = data
+        line = json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self._fh.write(line)
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+def _iter_capture(fh):
+    """Yield ``(lineno, entry)`` for each first-attempt request in a capture.
+
+    Retries (``attempt`` > 0) are skipped because the replaying client
+    retries by itself; blank, torn or foreign lines are skipped too.
+    """
+    for lineno, line in enumerate(fh, 1):
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if (
+            isinstance(entry, dict)
+            and isinstance(entry.get("ts"), (int, float))
+            and isinstance(entry.get("request"), (dict, list))
+            and not entry.get("attempt")
+        ):
+            yield lineno, entry
+
+
+# ---------------------------------------------------------------------------
+# Response cache for read-only ops (opt-in: --cache)
+# ---------------------------------------------------------------------------
+
+# Seconds a read op's response stays fresh, by exact op, then by prefix.
+# Task/progress status must always be live, so it is never cached.
+RESPONSE_TTLS = {
+    "help": 24 * 3600,
+    "list_": 300,
+    "get_": 300,
+    "retrieve_": 600,
+    "find_": 300,
+    "check_": 0,
+    "show_": 300,
+    "view_": 300,
+}
+
+
+def _response_ttl(op: str) -> float:
+    """Cache lifetime for ``op``; 0 for ops that must never be served from cache."""
+    if "status" in op or "progress" in op or not _is_read_op(op):
+        return 0
+    if op in RESPONSE_TTLS:
+        return RESPONSE_TTLS[op]
+    for prefix, ttl in RESPONSE_TTLS.items():
+        if prefix.endswith("_") and op.startswith(prefix):
+            return ttl
+    return 0
+
+
+class ResponseCache:
+    """SQLite-backed TTL cache of tools/call responses with LRU eviction.
+
+    Keys cover tool, op, canonical params and a hash of the API key, so
+    accounts never see each other's data. ``refresh`` skips lookups but
+    still stores fresh responses. Total body size is kept under
+    ``max_bytes`` by dropping the least recently used entries.
+    """
+
+    def __init__(
+        self,
+        path: Path = RESPONSE_CACHE_FILE,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        refresh: bool = False,
+    ):
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, tool TEXT NOT NULL, op TEXT NOT NULL,"
+            " expires REAL NOT NULL, accessed REAL NOT NULL,"
+            " size INTEGER NOT NULL, body TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_tool ON responses (tool)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key(api_key: str, tool: str, op: str, params: dict | None) -> str:
+        canonical = json.dumps(
+            [tool, op, params or {}], sort_keys=True, separators=(",", ":")
+        )
+        account = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        return hashlib.sha256(f"{account}:{canonical}".encode()).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        if self.refresh:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, tool: str, op: str, resp: dict, ttl: float) -> None:
+        body = json.dumps(resp, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, tool, op, now + ttl, now, len(body), body),
+            )
+            # Keep the most recently used entries that fit in max_bytes.
+            self._db.execute(
+                "DELETE FROM responses WHERE expires <= ? OR key IN ("
+                " SELECT key FROM (SELECT key, SUM(size) OVER"
+                " (ORDER BY accessed DESC, key) AS running FROM responses)"
+                " WHERE running > ?)",
+                (now, self.max_bytes),
+            )
+            self._db.commit()
+
+    def invalidate(self, tool: str) -> int:
+        """Drop every cached response of ``tool`` (after a mutating op)."""
+        with self._lock:
+            cur = self._db.execute("DELETE FROM responses WHERE tool = ?", (tool,))
+            self._db.commit()
+        if cur.rowcount:
+            log.debug("Invalidated %d cached %s responses", cur.rowcount, tool)
+        return cur.rowcount
+
+    def close(self) -> None:
+        self._db.close()
+
 
 # ---------------------------------------------------------------------------
 # MCP JSON-RPC transport
 # ---------------------------------------------------------------------------
 
+# "http": one JSON response per POST. "streamable": MCP streamable HTTP, where
+# a POST may answer with an SSE stream of notifications ending in the response.
+TRANSPORTS = ("http", "streamable")
+MCP_PROTOCOL_VERSION = "2025-03-26"
+# Streams only time out after this long *between* events (progress keeps them alive).
+STREAM_READ_TIMEOUT = 600.0
+
+
+def _iter_sse(lines):
+    """Yield the decoded JSON ``data`` of each server-sent event."""
+    data: list[str] = []
+    for line in lines:
+        if line:
+            if line.startswith("data:"):
+                data.append(line[5:].removeprefix(" "))
+            continue  # comments (keep-alives), event:, id:, retry:
+        if data:
+            try:
+                yield json.loads("\n".join(data))
+            except json.JSONDecodeError:
+                log.debug("Skipping undecodable SSE event: %.200s", data)
+            data = []
+    if data:
+        try:
+            yield json.loads("\n".join(data))
+        except json.JSONDecodeError:
+            pass
+
+
+def _read_streamed(resp, req_id: int, on_notification=None) -> dict:
+    """The JSON-RPC response to ``req_id`` from a JSON or SSE response body.
+
+    Notifications that arrive first (``notifications/progress``,
+    ``notifications/message``) go to ``on_notification`` as they stream in.
+    """
+    if "text/event-stream" not in resp.headers.get("content-type", ""):
+        resp.read()
+        return resp.json()
+    for event in _iter_sse(resp.iter_lines()):
+        for message in event if isinstance(event, list) else [event]:
+            if not isinstance(message, dict):
+                continue
+            if message.get("id") == req_id and (
+                "result" in message or "error" in message
+            ):
+                return message
+            if "method" in message and "id" not in message:
+                if on_notification is not None:
+                    on_notification(message)
+            else:
+                log.debug("Ignoring server message: %.200s", message)
+    raise httpx.RemoteProtocolError(
+        f"Event stream ended without a response to request {req_id}",
+        request=resp.request,
+    )
+
 
 class MCPClient:
-    """Thin JSON-RPC 2.0 client for the SearchAtlas MCP server."""
+    """Thin JSON-RPC 2.0 client for the SearchAtlas MCP server.
+
+    Transient failures (timeouts, 429/5xx, "Internal Server Error") are
+    retried per ``retry``; ``breaker`` short-circuits tool+ops that keep
+    failing.
+
+    With ``transport="streamable"`` the client speaks MCP streamable HTTP:
+    one ``initialize`` handshake, then every request reuses its
+    ``Mcp-Session-Id`` (re-initializing if the server expires it), asks for
+    progress, and reads SSE responses incrementally, handing each
+    notification to ``on_notification``. Long calls then only time out
+    after STREAM_READ_TIMEOUT seconds of silence, not 60s overall.
+    """
 
-    def __init__(self, api_key: str, endpoint: str = MCP_ENDPOINT):
+    def __init__(
+        self,
+        api_key: str,
+        endpoint: str = MCP_ENDPOINT,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
+        limiter: RateLimiter | None = None,
+        quota: QuotaGuard | None = None,
+        metrics: Metrics | None = None,
+        recorder: Recorder | None = None,
+        transport: str = "http",
+        on_notification=None,
+    ):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {', '.join(TRANSPORTS)}")
         self.api_key = api_key
         self.endpoint = endpoint
-        self._http = httpx.Client(
-            timeout=60.0,
-            headers={
-                "Content-Type": "application/json",
-                "X-API-KEY": api_key,
-            },
-        )
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.cache = cache
+        self.limiter = limiter
+        self.quota = quota
+        self.metrics = metrics
+        self.recorder = recorder
+        self.transport = transport
+        self.on_notification = on_notification
+        self.session_id: str | None = None
+        self._session_lock = threading.Lock()
+        self._initialized = False
+        if transport == "streamable":
+            self._http = httpx.Client(
+                timeout=httpx.Timeout(60.0, read=STREAM_READ_TIMEOUT),
+                headers={
+                    **_headers(api_key),
+                    "Accept": "application/json, text/event-stream",
+                },
+            )
+            # Batches are not part of the streamable transport; send singles.
+            self._batch_supported: bool | None = False
+        else:
+            self._http = httpx.Client(timeout=60.0, headers=_headers(api_key))
+            self._batch_supported = None
         self._req_id = 0
+        self._id_lock = threading.Lock()
 
     def _next_id(self) -> int:
-        self._req_id += 1
-        return self._req_id
+        with self._id_lock:
+            self._req_id += 1
+            return self._req_id
 
     def list_tools(self) -> dict:
         """Call tools/list to discover all available tools."""
         return self._jsonrpc("tools/list", {})
 
     def call_tool(self, name: str, op: str, params: dict | None = None) -> dict:
-        """Call tools/call with a specific tool, operation, and params."""
+        """Call tools/call with a specific tool, operation, and params.
+
+        With a ``quota`` guard, calls that would overspend a known quota are
+        refused locally.
+        """
+        if self.quota is not None:
+            if self.quota.pending(name, op):
+                self.quota.load({src: self.call_tool(*src) for src in QUOTA_SOURCES})
+            refused = self.quota.reserve(name, op, params)
+            if refused:
+                return refused
+        resp = self._call_tool_cached(name, op, params)
+        if self.quota is not None:
+            self.quota.observe(name, op, resp)
+        return resp
+
+    def _call_tool_cached(self, name: str, op: str, params: dict | None) -> dict:
+        """tools/call through the response cache, when there is one.
+
+        Fresh read-op responses are served locally and any other op
+        invalidates the tool's cached responses.
+        """
         arguments = {"op": op, "params": params or {}}
-        return self._jsonrpc("tools/call", {"name": name, "arguments": arguments})
+        if self.cache is None:
+            return self._jsonrpc("tools/call", {"name": name, "arguments": arguments})
+
+        ttl = _response_ttl(op)
+        if not ttl:
+            resp = self._jsonrpc("tools/call", {"name": name, "arguments": arguments})
+            if not _is_read_op(op):
+                self.cache.invalidate(name)
+            return resp
+        key = ResponseCache.key(self.api_key, name, op, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            log.debug("Cache hit: %s -> %s", name, op)
+            return cached
+        resp = self._jsonrpc("tools/call", {"name": name, "arguments": arguments})
+        if _error_message(resp) is None:
+            self.cache.put(key, name, op, resp, ttl)
+        return resp
 
     def discover_schema(self, name: str, op: str) -> dict:
         """Send an intentionally empty call to discover the real schema.
@@ -81,28 +1208,379 @@ class MCPClient:
         """
         return self.call_tool(name, op, {})
 
-    def _jsonrpc(self, method: str, params: dict) -> dict:
-        """Send a JSON-RPC 2.0 request."""
-        payload = {
-            "jsonrpc": "2.0",
-            "id": self._next_id(),
-            "method": method,
-            "params": params,
-        }
-        log.debug("POST %s method=%s", self.endpoint, method)
-        log.debug("Payload: %s", json.dumps(payload, indent=2))
+    def iter_pages(
+        self,
+        name: str,
+        op: str,
+        params: dict | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        max_pages: int | None = None,
+    ):
+        """Yield every record of a paginated op, fetching pages as needed.
+
+        The scheme (page number, offset/limit or cursor) is detected from
+        the first response. When it reports a total, the next ``prefetch``
+        pages are requested concurrently; otherwise pages are fetched one
+        by one until an empty or short page, a null ``next``, or no cursor.
+        Raises RuntimeError if any page comes back as an error.
+        """
+        params = dict(params or {})
+        payload, records = _page_records(self.call_tool(name, op, params))
+        yield from records
+        plan = _page_plan(payload, params, len(records))
+        fetched = 1
+        if plan is None or not records:
+            return
+
+        def more(count: int) -> bool:
+            return max_pages is None or count < max_pages
+
+        if "cursor_key" in plan:
+            cursor = payload.get(plan["cursor_key"])
+            while cursor and more(fetched):
+                params[plan["param"]] = cursor
+                payload, records = _page_records(self.call_tool(name, op, params))
+                fetched += 1
+                yield from records
+                cursor = payload.get(plan["cursor_key"]) if records else None
+            return
 
-        resp = self._http.post(self.endpoint, json=payload)
-        resp.raise_for_status()
-        data = resp.json()
+        last_page = isinstance(payload, dict) and "next" in payload
+        if plan["remaining"] is None and (
+            len(records) < plan["size"] or (last_page and not payload["next"])
+        ):
+            return
 
-        if "error" in data:
-            log.debug("RPC error: %s", data["error"])
+        def page_params(k: int) -> dict:
+            return {**params, plan["param"]: plan["start"] + k * plan["step"]}
+
+        if plan["remaining"] is not None:
+            last = plan["remaining"]
+            if max_pages is not None:
+                last = min(last, max_pages - 1)
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=max(1, prefetch)) as pool:
+                window = {}
+                for k in range(1, last + 1):
+                    # Keep up to ``prefetch`` pages in flight ahead of the consumer.
+                    for ahead in range(k, min(last, k + prefetch - 1) + 1):
+                        if ahead not in window:
+                            window[ahead] = pool.submit(
+                                self.call_tool, name, op, page_params(ahead)
+                            )
+                    _, records = _page_records(window.pop(k).result())
+                    yield from records
+                    if not records:
+                        for pending in window.values():
+                            pending.cancel()
+                        return
+            return
 
-        return data
+        previous = records
+        k = 1
+        while more(fetched):
+            payload, records = _page_records(self.call_tool(name, op, page_params(k)))
+            fetched += 1
+            if not records:
+                return
+            if records == previous:
+                log.warning(
+                    "%s -> %s ignored %r; stopping pagination", name, op, plan["param"]
+                )
+                return
+            yield from records
+            if len(records) < plan["size"] or (
+                isinstance(payload, dict) and "next" in payload and not payload["next"]
+            ):
+                return
+            previous = records
+            k += 1
+
+    def batch(
+        self,
+        calls: list[tuple[str, str, dict | None]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> list[dict]:
+        """Send many ``(tool, op, params)`` calls as JSON-RPC 2.0 batches.
+
+        Calls are packed into array POSTs of up to BATCH_CHUNK_SIZE requests
+        and responses are matched back by ``id``, so the result list is in
+        submission order. If the server rejects arrays, this (and every later
+        batch on this client) falls back to parallel single requests.
+
+        With a response cache, fresh read items are served from it (unless
+        the batch also writes to their tool), successful reads fill it, and
+        every tool written to has its cached responses invalidated. Ops a
+        quota guard rule covers are sent singly through ``call_tool``, and
+        items whose circuit is open are answered locally.
+        """
+        calls = list(calls)
+        results: list[dict | None] = [None] * len(calls)
+        keys: dict[int, str] = {}
+        if self.cache is not None:
+            written = {name for name, op, _ in calls if not _is_read_op(op)}
+            for i, (name, op, params) in enumerate(calls):
+                if _response_ttl(op) and name not in written:
+                    keys[i] = ResponseCache.key(self.api_key, name, op, params)
+                    results[i] = self.cache.get(keys[i])
+        pending = [i for i, resp in enumerate(results) if resp is None]
+        hits = set(keys).difference(pending)
+        batched = []
+        for i in pending:
+            name, op, _ = calls[i]
+            key = f"{name} -> {op}"
+            if self.quota is not None and self.quota.rule(name, op) is not None:
+                results[i] = self.call_tool(*calls[i])
+            elif not self.breaker.allow(key):
+                results[i] = _circuit_open_response(key, self.breaker)
+            else:
+                batched.append(i)
+        for start in range(0, len(batched), BATCH_CHUNK_SIZE):
+            indices = batched[start : start + BATCH_CHUNK_SIZE]
+            chunk = [calls[i] for i in indices]
+            responses = None
+            if self._batch_supported is not False:
+                try:
+                    responses = self._post_batch(chunk)
+                except httpx.HTTPError as exc:
+                    # Resend one by one (with retries) only if that is safe.
+                    read = all(_is_read_op(op) for _, op, _ in chunk)
+                    if not _should_retry(read, exc=exc):
+                        raise
+                    log.debug("Batch failed (%s); sending calls singly", exc)
+            if responses is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    responses = list(pool.map(lambda c: self.call_tool(*c), chunk))
+            for i, resp in zip(indices, responses):
+                results[i] = resp
+
+        if self.cache is not None:
+            for i, key in keys.items():
+                name, op, _ = calls[i]
+                if i not in hits and _error_message(results[i]) is None:
+                    self.cache.put(key, name, op, results[i], _response_ttl(op))
+            for name in written:
+                self.cache.invalidate(name)
+        return results
+
+    def _post_batch(
+        self, calls: list[tuple[str, str, dict | None]]
+    ) -> list[dict] | None:
+        """POST one batch array. Returns None if the server rejects batching."""
+        payloads = [
+            _rpc_payload(
+                self._next_id(),
+                "tools/call",
+                {"name": name, "arguments": {"op": op, "params": params or {}}},
+            )
+            for name, op, params in calls
+        ]
+        if self.limiter:
+            wait = max(self.limiter.reserve(name) for name, _, _ in calls)
+            if wait:
+                log.debug("Rate limit: batch waits %.2fs", wait)
+                time.sleep(wait)
+        log.debug("POST %s batch of %d", self.endpoint, len(payloads))
+
+        trace = _CallTrace(
+            self.metrics,
+            "batch -> tools/call",
+            recorder=self.recorder,
+            request=payloads,
+        )
+        try:
+            resp = self._http.post(
+                self.endpoint, json=payloads, extensions=trace.extensions
+            )
+            if resp.status_code in (400, 404, 405, 413, 415, 422, 501):
+                log.debug("Batch rejected with HTTP %s", resp.status_code)
+                trace.finish(resp)
+                self._batch_supported = False
+                return None
+            resp.raise_for_status()
+            data = trace.decode(resp)
+        except httpx.HTTPError as exc:
+            trace.finish(exc=exc)
+            raise
+        trace.finish(resp, data)
+        if not isinstance(data, list):
+            log.debug("Batch rejected: %s", data)
+            self._batch_supported = False
+            return None
+
+        self._batch_supported = True
+        by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+        results = []
+        for payload in payloads:
+            item = by_id.get(payload["id"])
+            if item is None:
+                item = {
+                    "jsonrpc": "2.0",
+                    "id": payload["id"],
+                    "error": {
+                        "code": -32603,
+                        "message": "No response for batched request",
+                    },
+                }
+            elif "error" in item:
+                log.debug("RPC error (id=%s): %s", payload["id"], item["error"])
+            results.append(item)
+
+        # Transient per-item failures go back through the retrying path,
+        # writes only when the server refused them unprocessed; the rest
+        # count towards their circuit breaker as in ``_jsonrpc``.
+        for i, (item, call) in enumerate(zip(results, calls)):
+            if _should_retry(_is_read_op(call[1]), resp=item):
+                results[i] = self.call_tool(*call)
+            else:
+                failed = _classify_error(item) == "retryable"
+                self.breaker.record(f"{call[0]} -> {call[1]}", failed=failed)
+        return results
+
+    def _jsonrpc(self, method: str, params: dict) -> dict:
+        """Send a JSON-RPC 2.0 request, retrying failures that are safe to repeat."""
+        key = _breaker_key(method, params)
+        if key and not self.breaker.allow(key):
+            return _circuit_open_response(key, self.breaker)
+        tool = params.get("name") if self.limiter and method == "tools/call" else None
+        read = _is_read_request(method, params)
+
+        attempt = 0
+        while True:
+            payload = _rpc_payload(self._next_id(), method, params)
+            if tool:
+                wait = self.limiter.reserve(tool)
+                if wait:
+                    log.debug("Rate limit: %s waits %.2fs", tool, wait)
+                    time.sleep(wait)
+            log.debug("POST %s method=%s", self.endpoint, method)
+            log.debug("Payload: %s", json.dumps(payload, indent=2))
+
+            trace = _CallTrace(
+                self.metrics, key or method, False, self.recorder, payload, attempt
+            )
+            try:
+                resp, data = self._send(payload, trace)
+            except httpx.HTTPError as exc:
+                trace.finish(exc=exc)
+                transient = _is_transient_http(exc)
+                retry = _should_retry(read, exc=exc)
+                if not retry or attempt + 1 >= self.retry.max_attempts:
+                    if key:
+                        self.breaker.record(key, failed=transient)
+                    raise
+                retry_after = _retry_after(exc)
+                if tool and retry_after:
+                    self.limiter.pause(tool, retry_after)
+                delay = self.retry.delay(attempt, retry_after)
+                log.debug("%s: %s", type(exc).__name__, exc)
+            else:
+                trace.finish(resp, data)
+                kind = _classify_error(data)
+                if kind:
+                    log.debug(
+                        "RPC error (%s): %s",
+                        kind,
+                        data.get("error", data.get("result")),
+                    )
+                retry = _should_retry(read, resp=data)
+                if not retry or attempt + 1 >= self.retry.max_attempts:
+                    if key:
+                        self.breaker.record(key, failed=kind == "retryable")
+                    return data
+                delay = self.retry.delay(attempt)
+
+            attempt += 1
+            log.debug(
+                "Retrying %s in %.2fs (attempt %d)", key or method, delay, attempt + 1
+            )
+            time.sleep(delay)
+
+    def _send(self, payload: dict, trace: _CallTrace):
+        """POST one request over the configured transport: ``(resp, data)``."""
+        if self.transport == "http":
+            resp = self._http.post(
+                self.endpoint, json=payload, extensions=trace.extensions
+            )
+            resp.raise_for_status()
+            return resp, trace.decode(resp)
+
+        self._ensure_session()
+        if payload["method"] == "tools/call":
+            meta = {"progressToken": payload["id"]}
+            payload = {**payload, "params": {**payload["params"], "_meta": meta}}
+        for retry_session in (True, False):
+            session = self.session_id
+            with self._http.stream(
+                "POST",
+                self.endpoint,
+                json=payload,
+                headers={"Mcp-Session-Id": session} if session else None,
+                extensions=trace.extensions,
+            ) as resp:
+                if resp.status_code == 404 and session and retry_session:
+                    log.debug("MCP session %s expired; re-initializing", session)
+                    resp.read()  # keep the connection reusable
+                    with self._session_lock:
+                        if self.session_id == session:
+                            self.session_id, self._initialized = None, False
+                    self._ensure_session()
+                    continue
+                resp.raise_for_status()
+                data = trace.decode(
+                    resp,
+                    lambda r: _read_streamed(r, payload["id"], self.on_notification),
+                )
+                return resp, data
+
+    def _ensure_session(self) -> None:
+        """Run the ``initialize`` handshake once per client (thread-safe)."""
+        if self._initialized:
+            return
+        with self._session_lock:
+            if self._initialized:
+                return
+            req_id = self._next_id()
+            payload = _rpc_payload(
+                req_id,
+                "initialize",
+                {
+                    "protocolVersion": MCP_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "searchatlas-cli", "version": "1"},
+                },
+            )
+            with self._http.stream("POST", self.endpoint, json=payload) as resp:
+                resp.raise_for_status()
+                data = _read_streamed(resp, req_id)
+                session = resp.headers.get("mcp-session-id")
+            if "error" in data:
+                raise httpx.HTTPError(f"MCP initialize failed: {data['error']}")
+            headers = {"Mcp-Session-Id": session} if session else None
+            self._http.post(
+                self.endpoint,
+                json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+                headers=headers,
+            )
+            self.session_id, self._initialized = session, True
+            log.debug("MCP session %s initialized", session or "(stateless)")
 
     def close(self):
+        if self.session_id:
+            try:  # let the server free the session; best effort
+                self._http.delete(
+                    self.endpoint,
+                    headers={"Mcp-Session-Id": self.session_id},
+                    timeout=5.0,
+                )
+            except httpx.HTTPError:
+                pass
         self._http.close()
+        if self.cache is not None:
+            self.cache.close()
 
     def __enter__(self):
         return self
@@ -111,6 +1589,183 @@ class MCPClient:
         self.close()
 
 
+class AsyncMCPClient:
+    """Async JSON-RPC 2.0 client with bounded-concurrency fan-out.
+
+    Same surface as MCPClient, but every method is a coroutine. At most
+    ``concurrency`` requests are in flight at once, all sharing one
+    keep-alive connection pool.
+
+    Unlike MCPClient it has no response cache: ``--cache``/``--no-cache``
+    do not apply to the commands that fan out through it, which always
+    fetch live.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        endpoint: str = MCP_ENDPOINT,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        limiter: RateLimiter | None = None,
+        quota: QuotaGuard | None = None,
+        metrics: Metrics | None = None,
+        recorder: Recorder | None = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.concurrency = concurrency
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter
+        self.quota = quota
+        self.metrics = metrics
+        self.recorder = recorder
+        self._http = httpx.AsyncClient(
+            timeout=60.0,
+            headers=_headers(api_key),
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+            ),
+        )
+        self._sem = asyncio.Semaphore(concurrency)
+        self._req_id = 0
+
+    def _next_id(self) -> int:
+        self._req_id += 1
+        return self._req_id
+
+    async def list_tools(self) -> dict:
+        """Call tools/list to discover all available tools."""
+        return await self._jsonrpc("tools/list", {})
+
+    async def call_tool(self, name: str, op: str, params: dict | None = None) -> dict:
+        """Call tools/call with a specific tool, operation, and params."""
+        if self.quota is not None:
+            if self.quota.pending(name, op):
+                sources = await self.gather(
+                    [(tool, src_op, {}) for tool, src_op in QUOTA_SOURCES]
+                )
+                self.quota.load(dict(zip(QUOTA_SOURCES, sources)))
+            refused = self.quota.reserve(name, op, params)
+            if refused:
+                return refused
+        arguments = {"op": op, "params": params or {}}
+        resp = await self._jsonrpc("tools/call", {"name": name, "arguments": arguments})
+        if self.quota is not None:
+            self.quota.observe(name, op, resp)
+        return resp
+
+    async def discover_schema(self, name: str, op: str) -> dict:
+        """Send an intentionally empty call to discover the real schema."""
+        return await self.call_tool(name, op, {})
+
+    async def gather(
+        self,
+        calls: list[tuple[str, str, dict | None]],
+        return_exceptions: bool = False,
+    ) -> list:
+        """Run many ``(tool, op, params)`` calls concurrently.
+
+        Results come back in submission order regardless of completion
+        order. With ``return_exceptions`` a failed call yields its exception
+        in place instead of aborting the whole batch.
+        """
+        return await asyncio.gather(
+            *(self.call_tool(name, op, params) for name, op, params in calls),
+            return_exceptions=return_exceptions,
+        )
+
+    async def _jsonrpc(self, method: str, params: dict) -> dict:
+        """Send a JSON-RPC 2.0 request, waiting for a free concurrency slot.
+
+        Retries and circuit breaking behave as in ``MCPClient._jsonrpc``;
+        backoff sleeps release the slot for other requests.
+        """
+        key = _breaker_key(method, params)
+        if key and not self.breaker.allow(key):
+            return _circuit_open_response(key, self.breaker)
+        tool = params.get("name") if self.limiter and method == "tools/call" else None
+        read = _is_read_request(method, params)
+
+        attempt = 0
+        while True:
+            payload = _rpc_payload(self._next_id(), method, params)
+            if tool:
+                wait = self.limiter.reserve(tool)
+                if wait:
+                    log.debug("Rate limit: %s waits %.2fs", tool, wait)
+                    await asyncio.sleep(wait)
+            trace = _CallTrace(
+                self.metrics, key or method, True, self.recorder, payload, attempt
+            )
+            try:
+                async with self._sem:
+                    log.debug(
+                        "POST %s method=%s id=%s", self.endpoint, method, payload["id"]
+                    )
+                    trace.start()
+                    resp = await self._http.post(
+                        self.endpoint, json=payload, extensions=trace.extensions
+                    )
+                resp.raise_for_status()
+                data = trace.decode(resp)
+            except httpx.HTTPError as exc:
+                trace.finish(exc=exc)
+                transient = _is_transient_http(exc)
+                retry = _should_retry(read, exc=exc)
+                if not retry or attempt + 1 >= self.retry.max_attempts:
+                    if key:
+                        self.breaker.record(key, failed=transient)
+                    raise
+                retry_after = _retry_after(exc)
+                if tool and retry_after:
+                    self.limiter.pause(tool, retry_after)
+                delay = self.retry.delay(attempt, retry_after)
+            else:
+                trace.finish(resp, data)
+                kind = _classify_error(data)
+                if kind:
+                    log.debug(
+                        "RPC error (%s): %s",
+                        kind,
+                        data.get("error", data.get("result")),
+                    )
+                retry = _should_retry(read, resp=data)
+                if not retry or attempt + 1 >= self.retry.max_attempts:
+                    if key:
+                        self.breaker.record(key, failed=kind == "retryable")
+                    return data
+                delay = self.retry.delay(attempt)
+
+            attempt += 1
+            log.debug(
+                "Retrying %s in %.2fs (attempt %d)", key or method, delay, attempt + 1
+            )
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+
+def _headers(api_key: str) -> dict:
+    return {"Content-Type": "application/json", "X-API-KEY": api_key}
+
+
+def _rpc_payload(req_id: int, method: str, params: dict) -> dict:
+    return {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -254,6 +1909,39 @@ TOOL_CATEGORIES = {
         "tools": ["batch", "reports"],
     },
 }
+# Phrases in a registry entry's name, server category or description that
+# place it in a TOOL_CATEGORIES group (matched as whole words, "_" = " ").
+CATEGORY_MARKERS = {
+    "otto": ("otto",),
+    "ppc": (
+        "ppc",
+        "google ads",
+        "ads account",
+        "ad group",
+        "ad content",
+        "keyword cluster",
+    ),
+    "site": ("site explorer",),
+    "content": (
+        "content genius",
+        "content generation",
+        "article management",
+        "content retrieval",
+        "content publication",
+        "content strategy",
+    ),
+    "gbp": ("gbp", "google business profile"),
+    "local": ("local seo", "gmb"),
+    "pr": ("press release",),
+    "cloud": ("cloud stack",),
+    "dpr": ("digital pr",),
+    "linklab": ("linklab",),
+    "geo": ("llm visibility", "prompt simulator", "geo"),
+    "brand": ("brandvault", "brand vault"),
+    "studio": ("website studio",),
+    "gsc": ("gsc", "search console"),
+    "util": ("indexer", "reports"),
+}
 
 
 def _get_api_key(ctx_key: str | None) -> str:
@@ -267,67 +1955,1142 @@ def _get_api_key(ctx_key: str | None) -> str:
     return key
 
 
-def _load_playbooks() -> list[dict]:
-    if not PLAYBOOK_FILE.exists():
-        console.print(f"[red]Error:[/red] Playbook file not found: {PLAYBOOK_FILE}")
-        sys.exit(1)
-    data = json.loads(PLAYBOOK_FILE.read_text())
-    return data.get("playbooks", [])
+def _have_api_key(ctx) -> bool:
+    return bool(ctx.obj.get("api_key") or os.environ.get("MCP_API_KEY"))
 
 
-def _output(data: dict, fmt: str) -> None:
-    """Output response in requested format."""
-    if fmt == "json":
-        click.echo(json.dumps(data, indent=2))
-    else:
-        # Extract the meaningful content
-        if "result" in data:
-            result = data["result"]
-            if isinstance(result, list) and len(result) == 1:
-                content = result[0]
-                if isinstance(content, dict) and "text" in content:
-                    try:
-                        parsed = json.loads(content["text"])
-                        console.print(Syntax(json.dumps(parsed, indent=2), "json"))
-                    except (json.JSONDecodeError, TypeError):
-                        console.print(content["text"])
-                else:
-                    console.print(Syntax(json.dumps(content, indent=2), "json"))
-            elif isinstance(result, list):
-                console.print(Syntax(json.dumps(result, indent=2), "json"))
-            else:
-                console.print(Syntax(json.dumps(result, indent=2), "json"))
-        elif "error" in data:
-            err = data["error"]
-            msg = err.get("message", str(err)) if isinstance(err, dict) else str(err)
-            console.print(f"[red]Error:[/red] {msg}")
-            # Show the full error for schema discovery
-            if isinstance(err, dict) and "data" in err:
-                console.print(Syntax(json.dumps(err["data"], indent=2), "json"))
-        else:
-            console.print(Syntax(json.dumps(data, indent=2), "json"))
+def _spinner(message: str, fmt: str = "rich"):
+    """A rich status spinner, or a no-op outside rich output (keeps rich unloaded)."""
+    if fmt != "rich":
+        return contextlib.nullcontext()
+    return console.status(message)
 
 
-# ---------------------------------------------------------------------------
-# CLI group
-# ---------------------------------------------------------------------------
+def _rate_limiter(ctx, specs) -> RateLimiter | None:
+    """A RateLimiter for ``specs`` with tool categories from the registry."""
+    if not specs:
+        return None
+    if "rate_categories" not in ctx.obj:
+        categories: dict[str, list[str]] = {}
+        entry = _read_registry()
+        if entry:
+            groups = _registry_categories(_tool_list(entry["response"]))
+        else:
+            groups = {key: cat["tools"] for key, cat in TOOL_CATEGORIES.items()}
+        for category, names in groups.items():
+            for name in names:
+                categories.setdefault(name, []).append(category)
+        ctx.obj["rate_categories"] = categories
+    return RateLimiter.from_specs(specs, ctx.obj["rate_categories"])
 
 
-@click.group()
-@click.option("--api-key", default=None, envvar="MCP_API_KEY", help="MCP API key.")
-@click.option("-v", "--verbose", is_flag=True, help="Debug logging.")
-@click.pass_context
-def cli(ctx, api_key, verbose):
-    """SearchAtlas MCP CLI — 112 omnichannel marketing tools at your fingertips."""
-    logging.basicConfig(
-        level=logging.DEBUG if verbose else logging.WARNING,
-        format="%(levelname)s %(name)s: %(message)s",
-    )
-    ctx.ensure_object(dict)
-    ctx.obj["api_key"] = api_key
+def _throttling(ctx) -> tuple[RateLimiter | None, QuotaGuard | None]:
+    """The command's shared rate limiter and quota guard (None when off)."""
+    if "limiter" not in ctx.obj:
+        ctx.obj["limiter"] = _rate_limiter(ctx, ctx.obj.get("rate_limits"))
+        ctx.obj["quota"] = QuotaGuard() if ctx.obj.get("quota_guard") else None
+    return ctx.obj["limiter"], ctx.obj["quota"]
 
 
-# ---------------------------------------------------------------------------
+def _client(ctx, account: dict | None = None, fmt: str | None = None) -> MCPClient:
+    """Build an MCPClient from the global CLI options.
+
+    For an ``account`` from --accounts, its key, endpoint and extra rate
+    limits apply, and it gets a limiter and quota guard of its own. With a
+    ``fmt``, streamed progress notifications are printed in that format;
+    otherwise they are dropped.
+    """
+    cache = None
+    if ctx.obj.get("cache"):
+        cache = ResponseCache(refresh=ctx.obj.get("refresh_cache", False))
+    if account is None:
+        api_key = _get_api_key(ctx.obj["api_key"])
+        endpoint = ctx.obj.get("endpoint", MCP_ENDPOINT)
+        limiter, quota = _throttling(ctx)
+    else:
+        api_key = account["api_key"]
+        endpoint = account["endpoint"] or ctx.obj.get("endpoint", MCP_ENDPOINT)
+        specs = (*ctx.obj.get("rate_limits", ()), *account["rate_limits"])
+        limiter = _rate_limiter(ctx, specs)
+        quota = QuotaGuard() if ctx.obj.get("quota_guard") else None
+    return MCPClient(
+        api_key,
+        endpoint,
+        retry=RetryPolicy(max_attempts=ctx.obj["retries"] + 1),
+        cache=cache,
+        limiter=limiter,
+        quota=quota,
+        metrics=ctx.obj.get("metrics"),
+        recorder=ctx.obj.get("recorder"),
+        transport=ctx.obj.get("transport", "http"),
+        on_notification=_notification_printer(fmt) if fmt else None,
+    )
+
+
+def _notification_printer(fmt: str):
+    """Progressive output for streamed server notifications.
+
+    Rich output prints a dim line per progress/log message (above any
+    spinner); other formats write ``{"notification": ...}`` JSON lines to
+    stderr so stdout stays machine-readable.
+    """
+
+    def show(message: dict) -> None:
+        method = message.get("method", "")
+        params = message.get("params") or {}
+        if fmt != "rich":
+            click.echo(
+                json.dumps({"notification": method, **params}, default=str), err=True
+            )
+            return
+        if method == "notifications/progress":
+            amount = str(params.get("progress", ""))
+            if params.get("total"):
+                amount += f"/{params['total']}"
+            text = " ".join(p for p in (amount, params.get("message")) if p)
+        else:
+            text = str(params.get("data", params))
+        console.print(f"… {text}", style="dim", markup=False, highlight=False)
+
+    return show
+
+
+def _async_client(ctx, concurrency: int = DEFAULT_CONCURRENCY) -> AsyncMCPClient:
+    """Build an AsyncMCPClient from the global CLI options."""
+    limiter, quota = _throttling(ctx)
+    return AsyncMCPClient(
+        _get_api_key(ctx.obj["api_key"]),
+        ctx.obj.get("endpoint", MCP_ENDPOINT),
+        concurrency=concurrency,
+        retry=RetryPolicy(max_attempts=ctx.obj["retries"] + 1),
+        limiter=limiter,
+        quota=quota,
+        metrics=ctx.obj.get("metrics"),
+        recorder=ctx.obj.get("recorder"),
+    )
+
+
+def _load_playbooks(path: Path = PLAYBOOK_FILE) -> list[dict]:
+    if not path.exists():
+        console.print(f"[red]Error:[/red] Playbook file not found: {path}")
+        sys.exit(1)
+    data = json.loads(path.read_text())
+    if isinstance(data, dict) and "playbooks" not in data and "name" in data:
+        return [data]  # a file holding a single playbook
+    return data.get("playbooks", [])
+
+
+def _write_json_atomic(path: Path, obj) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj))
+    tmp.replace(path)
+
+
+# ---------------------------------------------------------------------------
+# Tool registry cache
+# ---------------------------------------------------------------------------
+
+
+def _tool_list(resp: dict) -> list:
+    """Extract the tool list from a tools/list response."""
+    result = resp.get("result", {})
+    tool_list = result.get("tools", []) if isinstance(result, dict) else []
+    if not tool_list:
+        # Try alternate response shapes
+        tool_list = resp.get("result", [])
+        if isinstance(tool_list, dict):
+            tool_list = tool_list.get("tools", [])
+    return tool_list if isinstance(tool_list, list) else []
+
+
+def _tool_ops(tool) -> list[str]:
+    """Operation names a registry entry accepts (from its ``op`` enum)."""
+    if not isinstance(tool, dict):
+        return []
+    schema = tool.get("inputSchema") or tool.get("input_schema") or {}
+    op = schema.get("properties", {}).get("op", {}) if isinstance(schema, dict) else {}
+    ops = op.get("enum", []) if isinstance(op, dict) else []
+    return [str(o) for o in ops]
+
+
+def _tool_category(tool) -> str | None:
+    """Server-side category of a registry entry, if the server reports one."""
+    if not isinstance(tool, dict):
+        return None
+    for holder in (tool, tool.get("annotations") or {}, tool.get("_meta") or {}):
+        if isinstance(holder, dict) and holder.get("category"):
+            return str(holder["category"])
+    return None
+
+
+def _registry_hash(tools: list) -> str:
+    canonical = json.dumps(tools, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _marker_text(*parts) -> str:
+    return (
+        " " + " ".join(re.sub(r"[^a-z0-9]+", " ", str(p).lower()) for p in parts) + " "
+    )
+
+
+def _registry_categories(tools: list) -> dict[str, list[str]]:
+    """Group registry tool names into categories derived from the registry.
+
+    A tool joins every TOOL_CATEGORIES group whose CATEGORY_MARKERS appear
+    in its name, server-reported category or description, and the group
+    named by its server category itself. A tool no marker places keeps the
+    group that lists it by name, so a renamed or removed tool drops out.
+    """
+    categories: dict[str, list[str]] = {}
+    listed: dict[str, list[str]] = {}
+    for key, cat in TOOL_CATEGORIES.items():
+        for name in cat["tools"]:
+            listed.setdefault(name, []).append(key)
+
+    def add(category: str, name: str) -> None:
+        if name not in categories.setdefault(category, []):
+            categories[category].append(name)
+
+    for t in tools:
+        name = t.get("name") if isinstance(t, dict) else None
+        if not name:
+            continue
+        server = _tool_category(t)
+        text = _marker_text(name, server or "", t.get("description") or "")
+        keys = [
+            key
+            for key, markers in CATEGORY_MARKERS.items()
+            if any(f" {marker} " in text for marker in markers)
+        ]
+        for key in keys or listed.get(name, []):
+            add(key, name)
+        if server:
+            add(server, name)
+    return categories
+
+
+def _registry_diff(old: list, new: list) -> dict:
+    """Report tool names and operations that changed between two registries."""
+
+    def index(tools: list) -> dict[str, set[str]]:
+        out: dict[str, set[str]] = {}
+        for t in tools:
+            name = t.get("name", "?") if isinstance(t, dict) else str(t)
+            out.setdefault(name, set()).update(_tool_ops(t))
+        return out
+
+    before, after = index(old), index(new)
+    ops_changed = {}
+    for name in sorted(before.keys() & after.keys()):
+        added, removed = after[name] - before[name], before[name] - after[name]
+        if added or removed:
+            ops_changed[name] = {"added": sorted(added), "removed": sorted(removed)}
+    return {
+        "added": sorted(after.keys() - before.keys()),
+        "removed": sorted(before.keys() - after.keys()),
+        "ops_changed": ops_changed,
+    }
+
+
+def _read_registry() -> dict | None:
+    try:
+        entry = json.loads(REGISTRY_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    return entry if isinstance(entry, dict) and "response" in entry else None
+
+
+def _registry(
+    ctx, refresh: bool = False, fmt: str = "rich"
+) -> tuple[dict, dict | None]:
+    """Return the cached tools/list registry, refreshing it when stale.
+
+    Returns ``(entry, diff)`` where ``entry`` holds ``fetched_at``, ``hash``
+    and the full ``response``, and ``diff`` is a ``_registry_diff`` report
+    when a refresh found a changed registry (otherwise None). A failed
+    refresh falls back to the stale cache when there is one, as does a stale
+    cache with no API key to refresh it with.
+    """
+    cached = _read_registry()
+    if cached and not refresh:
+        if time.time() - cached.get("fetched_at", 0) < REGISTRY_TTL:
+            return cached, None
+        if not _have_api_key(ctx):
+            log.warning("Registry cache is stale and MCP_API_KEY is not set.")
+            return cached, None
+
+    try:
+        with _client(ctx) as client:
+            with _spinner(
+                "[bold blue]Fetching tool list from MCP server...[/bold blue]", fmt
+            ):
+                resp = client.list_tools()
+    except httpx.HTTPError as exc:
+        if cached is None:
+            raise
+        log.warning("Registry refresh failed (%s); using cached copy.", exc)
+        return cached, None
+
+    return _store_registry(resp, cached)
+
+
+def _store_registry(resp: dict, cached: dict | None) -> tuple[dict, dict | None]:
+    """Persist a fresh tools/list response and diff it against ``cached``."""
+    tools = _tool_list(resp)
+    entry = {"fetched_at": time.time(), "hash": _registry_hash(tools), "response": resp}
+    if "error" in resp or not tools:
+        return entry, None
+    _write_json_atomic(REGISTRY_FILE, entry)
+    _write_json_atomic(
+        ROUTES_FILE, _build_routes(tools, entry["hash"], entry["fetched_at"])
+    )
+
+    diff = None
+    if cached and cached.get("hash") != entry["hash"]:
+        diff = _registry_diff(_tool_list(cached["response"]), tools)
+    return entry, diff
+
+
+def _category_tools(tools: list, category: str) -> tuple[str, set[str]]:
+    """Resolve a category to ``(title, tool names)`` in this registry.
+
+    Membership comes from ``_registry_categories``; TOOL_CATEGORIES only
+    supplies the title.
+    """
+    derived = _registry_categories(tools)
+    if category in derived or category in TOOL_CATEGORIES:
+        label = TOOL_CATEGORIES.get(category, {}).get("label", category)
+        return f"{label} Tools", set(derived.get(category, []))
+    choices = sorted(set(derived) | set(TOOL_CATEGORIES))
+    raise click.BadParameter(
+        f"unknown category {category!r}. Choose from: {', '.join(choices)}",
+        param_hint="--category",
+    )
+
+
+def _build_routes(tools: list, registry_hash: str, fetched_at: float = 0) -> dict:
+    """Index every op to the registry entries that accept it.
+
+    ``ops`` maps an op to ``[tool, registry_index, shadowed]`` triples in
+    registry order (index is 1-based). ``shadowed`` marks an entry whose
+    name an earlier entry already uses: the server routes by name to the
+    first match, so its ops are unreachable under that name.
+    """
+    ops: dict[str, list] = {}
+    first: dict[str, int] = {}
+    for index, tool in enumerate(tools, 1):
+        name = tool.get("name") if isinstance(tool, dict) else None
+        if not name:
+            continue
+        first.setdefault(name, index)
+        for op in _tool_ops(tool):
+            ops.setdefault(op, []).append([name, index, first[name] != index])
+    return {"hash": registry_hash, "fetched_at": fetched_at, "ops": ops}
+
+
+def _routes(ctx, fmt: str = "rich", refresh: bool = False) -> dict | None:
+    """The op routing index for the current registry.
+
+    Read from its own small JSON file while the registry it was built from
+    is fresh and unchanged (the registry file is no newer), so a lookup
+    rarely parses the full tools/list response. Otherwise the registry is
+    refreshed through ``_registry`` when stale (or ``refresh``) and the
+    index rebuilt if its hash changed. None when no registry is cached and
+    it cannot be fetched.
+    """
+    routes = None
+    try:
+        routes = json.loads(ROUTES_FILE.read_text())
+        if not isinstance(routes, dict) or not isinstance(routes.get("ops"), dict):
+            routes = None
+        elif (
+            not refresh
+            and time.time() - routes.get("fetched_at", 0) < REGISTRY_TTL
+            and REGISTRY_FILE.stat().st_mtime <= ROUTES_FILE.stat().st_mtime
+        ):
+            return routes
+    except (OSError, json.JSONDecodeError):
+        pass
+    try:
+        entry, _ = _registry(ctx, refresh=refresh, fmt=fmt)
+    except httpx.HTTPError as exc:
+        log.debug("No registry for op routing: %s", exc)
+        entry = _read_registry()
+        if entry is None:
+            return routes
+    if routes is not None and routes.get("hash") == entry.get("hash"):
+        if routes.get("fetched_at") != entry.get("fetched_at"):
+            routes["fetched_at"] = entry.get("fetched_at", 0)
+            _write_json_atomic(ROUTES_FILE, routes)
+        return routes
+    routes = _build_routes(
+        _tool_list(entry["response"]), entry.get("hash", ""), entry.get("fetched_at", 0)
+    )
+    if not routes["ops"]:
+        return None
+    _write_json_atomic(ROUTES_FILE, routes)
+    return routes
+
+
+def _route(
+    ctx, category: str, op: str, default_tool: str, fmt: str = "rich"
+) -> tuple[str, dict | None]:
+    """Pick the tool for an op given without one: ``(tool, error)``.
+
+    Candidates reachable by name come first, then tools in the command's
+    TOOL_CATEGORIES entry. An op the registry does not know (unless
+    --no-validate), or one that several equally good tools offer (``ppc
+    list``), is rejected locally with a JSON-RPC style error, like
+    ``_validate_params``. With no registry at all the command's default
+    tool is used.
+    """
+    routes = _routes(ctx, fmt)
+    if routes is None:
+        return default_tool, None
+    candidates = routes["ops"].get(op)
+    if not candidates:
+        if ctx.obj.get("no_validate"):
+            return default_tool, None
+        if _have_api_key(ctx) and not ctx.obj.get("routes_refreshed"):
+            # The op may be new: re-fetch the registry once before rejecting it.
+            ctx.obj["routes_refreshed"] = True
+            routes = _routes(ctx, fmt, refresh=True) or routes
+            candidates = routes["ops"].get(op)
+    if not candidates:
+        import difflib
+
+        similar = difflib.get_close_matches(op, routes["ops"], n=3, cutoff=0.6)
+        hint = f" Did you mean: {', '.join(similar)}?" if similar else ""
+        return default_tool, {
+            "error": {
+                "code": -32601,
+                "message": f"Unknown operation {op!r}: no tool in the registry "
+                f"offers it.{hint} Check the name, or name the tool explicitly.",
+                "data": {"suggestions": similar},
+            }
+        }
+    own = set(TOOL_CATEGORIES.get(category, {}).get("tools", []))
+
+    def rank(candidate: list) -> tuple[bool, bool]:
+        return candidate[2], candidate[0] not in own
+
+    best = min(rank(c) for c in candidates)
+    tier = [c for c in candidates if rank(c) == best]
+    names = list(dict.fromkeys(c[0] for c in tier))
+    if len(names) > 1:
+        return default_tool, {
+            "error": {
+                "code": -32602,
+                "message": f"Operation {op!r} is offered by {', '.join(names)}; "
+                "name the tool explicitly: TOOL OPERATION.",
+                "data": {"tools": names},
+            }
+        }
+    tool, index, shadowed = tier[0]
+    if shadowed:
+        log.warning(
+            "%s is only offered by %s (registry #%d), which an earlier tool of "
+            "the same name shadows; the server may not reach it",
+            op,
+            tool,
+            index,
+        )
+    log.debug("Routed %s -> %s (registry #%d)", op, tool, index)
+    return tool, None
+
+
+def _print_registry_diff(diff: dict) -> None:
+    from rich.panel import Panel
+
+    lines = [f"[green]+ {name}[/green]" for name in diff["added"]]
+    lines += [f"[red]- {name}[/red]" for name in diff["removed"]]
+    for name, ops in diff["ops_changed"].items():
+        lines += [
+            f"[yellow]~ {name}[/yellow] [green]+{op}[/green]" for op in ops["added"]
+        ]
+        lines += [
+            f"[yellow]~ {name}[/yellow] [red]-{op}[/red]" for op in ops["removed"]
+        ]
+    console.print(
+        Panel(
+            "\n".join(lines) or "Registry content changed (descriptions/schemas only).",
+            title="Registry changed since last fetch",
+            border_style="yellow",
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+# Schema index and pre-flight validation (Golden Rule 1, locally)
+# ---------------------------------------------------------------------------
+
+
+def _result_items(resp: dict) -> list:
+    """Content items of a tools/call result (bare list or MCP ``content``)."""
+    result = resp.get("result")
+    if isinstance(result, dict):
+        result = result.get("content", [])
+    return result if isinstance(result, list) else []
+
+
+def _result_text(resp: dict) -> str:
+    return "\n".join(
+        str(item.get("text", ""))
+        for item in _result_items(resp)
+        if isinstance(item, dict) and "text" in item
+    )
+
+
+def _payload(resp: dict):
+    """Decoded JSON payload of a tools/call result.
+
+    Tools return JSON inside the text item, sometimes behind a label
+    ("Location details \\n{...}"). Falls back to the raw text, or to the
+    bare result when there is no text item.
+    """
+    text = _result_text(resp)
+    if not text:
+        return resp.get("result")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    m = re.search(r"[\[{]", text)
+    if m:
+        try:
+            return json.loads(text[m.start() :])
+        except json.JSONDecodeError:
+            pass
+    return text
+
+
+RECORD_KEYS = ("results", "items", "data", "issues", "records", "rows")
+_JSON_WS = re.compile(r"\s*")
+
+
+def _iter_json_array(text: str, pos: int):
+    """Decode the JSON array starting at ``text[pos]`` one element at a time."""
+    decoder = json.JSONDecoder()
+    pos = _JSON_WS.match(text, pos + 1).end()
+    if text[pos : pos + 1] == "]":
+        return
+    while True:
+        item, pos = decoder.raw_decode(text, pos)
+        yield item
+        pos = _JSON_WS.match(text, pos).end()
+        sep = text[pos : pos + 1]
+        if sep == "]":
+            return
+        if sep != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos = _JSON_WS.match(text, pos + 1).end()
+
+
+def _iter_records(resp: dict):
+    """Yield the records of a tools/call result one at a time.
+
+    A JSON array in the text item is decoded element by element, so huge
+    lists never exist as a second, fully-parsed copy. An object payload
+    yields the items of its record list (``results``, ``items``, ...) or
+    itself; plain text yields one string.
+    """
+    text = _result_text(resp)
+    m = re.search(r"[\[{]", text)
+    if m and text[m.start()] == "[":
+        prefix = text[: m.start()].rstrip(" ")
+        if not prefix.strip() or prefix.endswith("\n"):
+            items, end = _iter_json_array(text, m.start()), object()
+            try:
+                first = next(items, end)
+            except json.JSONDecodeError:
+                pass  # not a JSON array after all; treat like any payload
+            else:
+                if first is not end:
+                    yield first
+                    yield from items
+                return
+    payload = _payload(resp)
+    records = _record_list(payload)
+    if records is not None:
+        yield from records
+    elif payload is not None:
+        yield payload
+
+
+def _record_list(payload) -> list | None:
+    """The list of records in a decoded payload (``results``, ``items``, ...)."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        lists = [k for k in RECORD_KEYS if isinstance(payload.get(k), list)]
+        if not lists:
+            lists = [k for k, v in payload.items() if isinstance(v, list)]
+        if len(lists) == 1 or (lists and lists[0] in RECORD_KEYS):
+            return payload[lists[0]]
+    return None
+
+
+def _project(record, fields: list[str] | None):
+    """Keep only the given dotted paths of a record (missing paths become null)."""
+    if not fields:
+        return record
+    out = {}
+    for path in fields:
+        try:
+            out[path] = _lookup(record, "." + path)
+        except (KeyError, IndexError, TypeError, ValueError):
+            out[path] = None
+    return out
+
+
+def _projected(resp: dict, fields: list[str]) -> dict:
+    """A response whose result is the projected record list (errors untouched)."""
+    if _error_message(resp) is not None:
+        return resp
+    return {"result": [_project(r, fields) for r in _iter_records(resp)]}
+
+
+# Response keys that carry the next cursor -> the request param that takes it.
+CURSOR_KEYS = {
+    "next_cursor": "cursor",
+    "nextCursor": "cursor",
+    "next_page_token": "page_token",
+    "nextPageToken": "pageToken",
+}
+TOTAL_KEYS = ("count", "total", "total_count", "totalCount", "total_results")
+PAGE_COUNT_KEYS = ("total_pages", "num_pages", "page_count", "totalPages")
+
+
+def _first_int(meta: dict, keys) -> int | None:
+    for key in keys:
+        value = meta.get(key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def _page_plan(payload, params: dict, first_len: int) -> dict | None:
+    """Work out how to fetch the pages after the first, or None if unpaginated.
+
+    Returns ``{"param", "start", "step", "size", "remaining"}`` for page or
+    offset schemes (``remaining`` is None when no total was reported) and
+    ``{"param", "cursor_key"}`` for cursor schemes.
+    """
+    meta = payload if isinstance(payload, dict) else {}
+    for key, param in CURSOR_KEYS.items():
+        if key in meta:
+            return {"param": param, "cursor_key": key}
+
+    total = _first_int(meta, TOTAL_KEYS)
+    pages = _first_int(meta, PAGE_COUNT_KEYS)
+    if "offset" in params or "offset" in meta:
+        size = int(params.get("limit") or meta.get("limit") or first_len)
+        start = int(params.get("offset") or meta.get("offset") or 0)
+        plan = {"param": "offset", "start": start, "step": size, "size": size}
+        consumed = start + first_len
+    elif (
+        "page" in params
+        or "page" in meta
+        or "next" in meta
+        or total is not None
+        or pages is not None
+    ):
+        size = int(
+            params.get("page_size")
+            or meta.get("page_size")
+            or params.get("limit")
+            or first_len
+        )
+        start = int(params.get("page") or meta.get("page") or 1)
+        plan = {"param": "page", "start": start, "step": 1, "size": size}
+        consumed = (start + (1 if start == 0 else 0)) * size
+        if pages is not None:
+            total = None
+            plan["remaining"] = max(0, pages - start - (1 if start == 0 else 0))
+            return plan if size else None
+    else:
+        return None
+    if not size:
+        return None
+    plan["remaining"] = (
+        None if total is None else max(0, -(-(total - consumed) // size))
+    )
+    return plan
+
+
+def _page_records(resp: dict) -> tuple[object, list]:
+    """(decoded payload, records) of one page; raises RuntimeError on errors."""
+    msg = _error_message(resp)
+    if msg is not None:
+        raise RuntimeError(msg)
+    payload = _payload(resp)
+    records = _record_list(payload)
+    if records is None:
+        records = [] if payload is None else [payload]
+    return payload, records
+
+
+def _error_message(resp: dict) -> str | None:
+    """The error text of a response: a JSON-RPC error or an ``isError`` result."""
+    err = resp.get("error")
+    if err is not None:
+        if isinstance(err, dict):
+            msg = str(err.get("message", ""))
+            if "data" in err:
+                msg += "\n" + json.dumps(err["data"])
+            return msg
+        return str(err)
+    result = resp.get("result")
+    if isinstance(result, dict) and result.get("isError"):
+        return _result_text(resp)
+    return None
+
+
+def _split_top_level(body: str) -> list[str]:
+    """Split on commas that are not nested inside brackets or parens."""
+    parts, depth, buf = [], 0, []
+    for ch in body:
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(buf))
+            buf = []
+        else:
+            buf.append(ch)
+    parts.append("".join(buf))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_expected_schema(text: str) -> dict | None:
+    """Parse the ``Expected Schema: { ... }`` block of a server error message.
+
+    Handles both the terse form ``{ name (REQUIRED), mode, ... }`` and JSON
+    objects whose values mention ``REQUIRED``. Returns
+    ``{"required": [...], "optional": [...]}`` or None if there is no schema.
+    """
+    marker = re.search(r"Expected Schema\s*:?\s*", text, re.IGNORECASE)
+    if not marker or "{" not in text[marker.end() :]:
+        return None
+    start = text.index("{", marker.end())
+    depth = 0
+    for end in range(start, len(text)):
+        depth += {"{": 1, "}": -1}.get(text[end], 0)
+        if depth == 0:
+            break
+    block = text[start : end + 1]
+
+    required, optional = [], []
+    try:
+        fields = json.loads(block)
+    except json.JSONDecodeError:
+        fields = None
+    if isinstance(fields, dict):
+        for name, spec in fields.items():
+            (required if "REQUIRED" in json.dumps(spec).upper() else optional).append(
+                name
+            )
+    else:
+        for field in _split_top_level(block.strip()[1:-1]):
+            m = re.match(r"[\"']?([A-Za-z_][\w.-]*)", field)
+            if not m:
+                continue
+            upper = field.upper()
+            is_required = "REQUIRED" in upper and "NOT REQUIRED" not in upper
+            (required if is_required else optional).append(m.group(1))
+    if not required and not optional:
+        return None
+    return {"required": required, "optional": optional}
+
+
+def _load_schemas() -> dict:
+    try:
+        index = json.loads(SCHEMA_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _cached_schema(tool: str, op: str) -> dict | None:
+    return _load_schemas().get(f"{tool}.{op}")
+
+
+def _schema_param(tool: str, op: str, candidates, default):
+    """The first candidate param (or tuple of params) the cached schema has.
+
+    ``default`` when the op has no cached schema or none of them match.
+    """
+    schema = _cached_schema(tool, op) or {"required": [], "optional": []}
+    known = {*schema["required"], *schema["optional"]}
+    return next(
+        (c for c in candidates if set(c if isinstance(c, tuple) else [c]) <= known),
+        default,
+    )
+
+
+def _learn_schema(
+    tool: str, op: str, resp: dict, params: dict | None = None
+) -> dict | None:
+    """Update the local schema index from a tools/call response.
+
+    An ``Expected Schema`` in an error replaces the entry; a successful call
+    with a known schema records any extra params it used as optional.
+    """
+    index = _load_schemas()
+    key = f"{tool}.{op}"
+    msg = _error_message(resp)
+    if msg:
+        parsed = _parse_expected_schema(msg)
+        if not parsed:
+            return index.get(key)
+        index[key] = {**parsed, "raw": msg, "discovered_at": time.time()}
+    elif key in index and params:
+        entry = index[key]
+        extra = [
+            p
+            for p in params
+            if p not in entry["required"] and p not in entry["optional"]
+        ]
+        if not extra:
+            return entry
+        entry["optional"] = entry["optional"] + extra
+    else:
+        return index.get(key)
+    _write_json_atomic(SCHEMA_FILE, index)
+    return index[key]
+
+
+def _validate_params(tool: str, op: str, params: dict) -> dict | None:
+    """Check params against the cached schema before sending anything.
+
+    Returns a JSON-RPC style error response when a required field is
+    missing (so callers can hand it straight to ``_output``), else None.
+    Unknown fields only warn: harvested schemas are sometimes partial.
+    """
+    schema = _cached_schema(tool, op)
+    if not schema:
+        return None
+    missing = [f for f in schema["required"] if f not in params]
+    unknown = [
+        f for f in params if f not in schema["required"] and f not in schema["optional"]
+    ]
+    if unknown:
+        log.warning(
+            "%s -> %s: params not in cached schema: %s", tool, op, ", ".join(unknown)
+        )
+    if not missing:
+        return None
+    return {
+        "error": {
+            "code": -32602,
+            "message": f"Local validation failed for {tool} -> {op}: "
+            f"missing required field(s) {', '.join(missing)}",
+            "data": {
+                "missing": missing,
+                "unknown": unknown,
+                "expected_schema": {
+                    "required": schema["required"],
+                    "optional": schema["optional"],
+                },
+            },
+        }
+    }
+
+
+READ_OP_PREFIXES = ("list_", "get_", "retrieve_", "find_", "check_", "show_", "view_")
+
+
+def _is_read_op(op: str) -> bool:
+    """Heuristic: does this operation only read data?"""
+    return op in ("get", "list", "help") or op.startswith(READ_OP_PREFIXES)
+
+
+def _parse_fields(ctx, param, value: str | None) -> list[str] | None:
+    """Click callback: "id, url,meta.score" -> ["id", "url", "meta.score"]."""
+    if not value:
+        return None
+    return [f.strip() for f in value.split(",") if f.strip()]
+
+
+def _parse_params(params: str) -> dict:
+    try:
+        params_dict = json.loads(params)
+    except json.JSONDecodeError as exc:
+        console.print(f"[red]Invalid JSON params:[/red] {exc}")
+        sys.exit(1)
+    if not isinstance(params_dict, dict):
+        console.print("[red]Invalid JSON params:[/red] expected a JSON object.")
+        sys.exit(1)
+    return params_dict
+
+
+def _invoke(
+    ctx, tool: str, op: str, params: dict, fmt: str, fields: list[str] | None = None
+) -> None:
+    """Validate, send and print a single tool call (shared by all commands)."""
+    if not ctx.obj.get("no_validate"):
+        invalid = _validate_params(tool, op, params)
+        if invalid:
+            _output(invalid, fmt)
+            sys.exit(1)
+
+    with _client(ctx, fmt=fmt) as client:
+        with _spinner(f"[bold blue]{tool} -> {op}...[/bold blue]", fmt):
+            resp = client.call_tool(tool, op, params)
+    _learn_schema(tool, op, resp, params)
+    started = time.perf_counter()
+    _output(resp, fmt, fields)
+    if ctx.obj.get("metrics"):
+        ctx.obj["metrics"].observe_render(
+            f"{tool} -> {op}", time.perf_counter() - started
+        )
+
+
+def _output(data: dict, fmt: str, fields: list[str] | None = None) -> None:
+    """Output response in requested format.
+
+    ``ndjson`` streams one record per line (see ``_iter_records``), written
+    to stdout NDJSON_WRITE_LINES at a time, and writes errors to stderr;
+    ``fields`` projects each record to the given dotted paths in every
+    format.
+    """
+    msg = _error_message(data)
+    if fmt == "ndjson":
+        if msg is not None:
+            click.echo(json.dumps({"error": msg}), err=True)
+            return
+        encode = json.JSONEncoder(default=str).encode
+        out = sys.stdout
+        lines = []
+        try:
+            for record in _iter_records(data):
+                lines.append(encode(_project(record, fields)))
+                if len(lines) >= NDJSON_WRITE_LINES:
+                    out.write("\n".join(lines) + "\n")
+                    lines.clear()
+        except json.JSONDecodeError as exc:
+            click.echo(json.dumps({"error": f"Undecodable payload: {exc}"}), err=True)
+        finally:
+            if lines:
+                out.write("\n".join(lines) + "\n")
+            out.flush()
+        return
+    payload = None
+    if fields and msg is None:
+        data = _projected(data, fields)
+        payload = data["result"]
+    if fmt == "json":
+        click.echo(json.dumps(data, indent=2))
+        return
+
+    from rich.syntax import Syntax
+
+    if "error" in data:
+        err = data["error"]
+        msg = err.get("message", str(err)) if isinstance(err, dict) else str(err)
+        console.print(f"[red]Error:[/red] {msg}")
+        # Show the full error for schema discovery
+        if isinstance(err, dict) and "data" in err:
+            console.print(Syntax(json.dumps(err["data"], indent=2), "json"))
+        return
+    if "result" not in data:
+        console.print(Syntax(json.dumps(data, indent=2), "json"))
+        return
+    if msg is not None:
+        console.print(f"[red]Error:[/red] {msg}")
+        return
+    # Extract the meaningful content: JSON text is pretty-printed, any other
+    # text (e.g. "Location details \n{...}") is shown as the server sent it.
+    if payload is None:
+        text = _result_text(data)
+        if not text:
+            payload = data["result"]
+        else:
+            try:
+                payload = json.loads(text)
+            except json.JSONDecodeError:
+                console.print(text)
+                return
+    console.print(Syntax(json.dumps(payload, indent=2), "json"))
+
+
+# ---------------------------------------------------------------------------
+# CLI group
+# ---------------------------------------------------------------------------
+
+
+@click.group()
+@click.option("--api-key", default=None, envvar="MCP_API_KEY", help="MCP API key.")
+@click.option(
+    "--endpoint",
+    default=MCP_ENDPOINT,
+    envvar="MCP_ENDPOINT",
+    show_default=True,
+    help="MCP server URL (e.g. a local stand-in for benchmarks).",
+)
+@click.option(
+    "--transport",
+    type=click.Choice(TRANSPORTS),
+    default="http",
+    envvar="SEARCHATLAS_TRANSPORT",
+    show_default=True,
+    help="streamable: MCP streamable HTTP (session reuse, SSE responses, "
+    "live progress) for long calls. Async fan-out stays on plain HTTP.",
+)
+@click.option("-v", "--verbose", is_flag=True, help="Debug logging.")
+@click.option(
+    "--no-validate",
+    is_flag=True,
+    help="Skip local pre-flight validation against cached schemas.",
+)
+@click.option(
+    "--retries",
+    default=2,
+    show_default=True,
+    type=click.IntRange(0, 10),
+    help="Retries for transient errors (timeouts, 429/5xx, Internal Server Error).",
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    envvar="SEARCHATLAS_RESPONSE_CACHE",
+    show_default=True,
+    help="Serve repeated read-only calls (list_*, get_*, ...) from a local TTL cache.",
+)
+@click.option(
+    "--refresh-cache",
+    is_flag=True,
+    help="With --cache: ignore cached responses but store the fresh ones.",
+)
+@click.option(
+    "--rate-limit",
+    "rate_limits",
+    multiple=True,
+    envvar="SEARCHATLAS_RATE_LIMIT",
+    metavar="[KEY=]RATE[/s|/m|/h][:BURST]",
+    help="Client-side token bucket for a tool, category or (no KEY) all calls. "
+    "Repeatable, e.g. --rate-limit 10 --rate-limit site=30/m.",
+)
+@click.option(
+    "--quota-guard",
+    is_flag=True,
+    envvar="SEARCHATLAS_QUOTA_GUARD",
+    help="Read account quotas before quota-consuming calls and refuse "
+    "calls that would exceed them.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print per tool/op latency, phase, byte and error stats to stderr.",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write call metrics on exit: Prometheus textfile for *.prom, else JSON.",
+)
+@click.option(
+    "--record",
+    "record_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    envvar="SEARCHATLAS_RECORD",
+    help="Append every request/response pair, timestamped, to this JSONL file "
+    "(see replay).",
+)
+@click.pass_context
+def cli(
+    ctx,
+    api_key,
+    endpoint,
+    transport,
+    verbose,
+    no_validate,
+    retries,
+    use_cache,
+    refresh_cache,
+    rate_limits,
+    quota_guard,
+    profile,
+    metrics_out,
+    record_file,
+):
+    """SearchAtlas MCP CLI — 112 omnichannel marketing tools at your fingertips."""
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+    ctx.ensure_object(dict)
+    ctx.obj["api_key"] = api_key
+    ctx.obj["endpoint"] = endpoint
+    ctx.obj["transport"] = transport
+    ctx.obj["no_validate"] = no_validate
+    ctx.obj["retries"] = retries
+    ctx.obj["cache"] = use_cache
+    ctx.obj["refresh_cache"] = refresh_cache
+    for spec in rate_limits:
+        try:
+            _parse_rate_limit(spec)
+        except ValueError as exc:
+            raise click.BadParameter(str(exc), param_hint="--rate-limit") from exc
+    ctx.obj["rate_limits"] = rate_limits
+    ctx.obj["quota_guard"] = quota_guard
+    if profile or metrics_out:
+        metrics = ctx.obj["metrics"] = Metrics()
+        ctx.obj["metrics_out"] = metrics_out
+
+        def report():
+            if ctx.obj["metrics_out"]:  # per-shard path for --accounts workers
+                metrics.write(ctx.obj["metrics_out"])
+            if profile:
+                _print_profile(metrics)
+
+        ctx.call_on_close(report)
+    if record_file:
+        recorder = ctx.obj["recorder"] = Recorder(record_file)
+        ctx.call_on_close(recorder.close)
+
+
+def _print_profile(metrics: Metrics) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    summary = metrics.summary()
+    wall = time.monotonic() - metrics.started
+    latency = Table(title=f"Call latency ({wall:.2f}s wall)", show_header=True)
+    latency.add_column("Tool -> op", style="cyan")
+    for column in ("Calls", "Err", "Total s", "p50", "p95", "Max", "KB out/in"):
+        latency.add_column(column, justify="right")
+    phases = Table(title="Time per phase (s)", show_header=True)
+    phases.add_column("Tool -> op", style="cyan")
+    for phase in PHASES:
+        phases.add_column(phase, justify="right")
+
+    def fmt(value) -> str:
+        return "" if value is None else f"{value:.3f}"
+
+    for key, stats in summary.items():
+        latency.add_row(
+            key,
+            str(stats["count"]),
+            str(sum(stats["errors"].values()) or ""),
+            fmt(stats["total_s"]),
+            fmt(stats["p50_s"]),
+            fmt(stats["p95_s"]),
+            fmt(stats["max_s"]),
+            f"{stats['request_bytes'] / 1024:.1f}/{stats['response_bytes'] / 1024:.1f}",
+        )
+        phases.add_row(key, *(fmt(stats["phases_s"][p]) for p in PHASES))
+    err = Console(stderr=True)
+    err.print(latency)
+    err.print(phases)
+
+
+# ---------------------------------------------------------------------------
 # tools — list all available MCP tools
 # ---------------------------------------------------------------------------
 
@@ -337,8 +3100,12 @@ def cli(ctx, api_key, verbose):
     "--category",
     "-c",
     default=None,
-    type=click.Choice(list(TOOL_CATEGORIES.keys())),
-    help="Filter by tool category.",
+    help="Filter by category: a registry category or one of "
+    + ", ".join(TOOL_CATEGORIES)
+    + ".",
+)
+@click.option(
+    "--refresh", is_flag=True, help="Re-fetch the registry instead of using the cache."
 )
 @click.option(
     "--format",
@@ -348,13 +3115,25 @@ def cli(ctx, api_key, verbose):
     show_default=True,
 )
 @click.pass_context
-def tools(ctx, category, fmt):
-    """List all 112 MCP tools (or filter by category)."""
-    if category:
+def tools(ctx, category, refresh, fmt):
+    """List all 112 MCP tools (or filter by category).
+
+    The tools/list registry is cached under ~/.cache/searchatlas for 24h;
+    --refresh forces a live fetch and reports tools/ops that changed.
+    """
+    if (
+        category
+        and not refresh
+        and category in TOOL_CATEGORIES
+        and not _read_registry()
+    ):
+        # No registry cached yet — fall back to the built-in category map.
         cat = TOOL_CATEGORIES[category]
         if fmt == "json":
             click.echo(json.dumps(cat, indent=2))
             return
+        from rich.table import Table
+
         table = Table(
             title=f"{cat['label']} Tools",
             show_header=True,
@@ -367,40 +3146,50 @@ def tools(ctx, category, fmt):
         console.print(table)
         return
 
-    # Live discovery from MCP server
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(
-            "[bold blue]Fetching tool list from MCP server...[/bold blue]"
-        ):
-            resp = client.list_tools()
+    entry, diff = _registry(ctx, refresh=refresh, fmt=fmt)
+    resp = entry["response"]
+    tool_list = _tool_list(resp)
+    indexed = list(enumerate(tool_list, 1))
+    title = f"MCP Tools ({len(tool_list)})"
+
+    if category:
+        title, names = _category_tools(tool_list, category)
+        indexed = [
+            (i, t) for i, t in indexed if isinstance(t, dict) and t.get("name") in names
+        ]
 
     if fmt == "json":
-        click.echo(json.dumps(resp, indent=2))
+        if diff:
+            click.echo(json.dumps({"registry_diff": diff}), err=True)
+        if category:
+            click.echo(json.dumps([t for _, t in indexed], indent=2))
+        else:
+            click.echo(json.dumps(resp, indent=2))
         return
 
-    tool_list = resp.get("result", {}).get("tools", [])
-    if not tool_list:
-        # Try alternate response shapes
-        tool_list = resp.get("result", [])
-        if isinstance(tool_list, dict):
-            tool_list = tool_list.get("tools", [])
+    if diff:
+        _print_registry_diff(diff)
+
+    from rich.table import Table
 
     table = Table(
-        title=f"MCP Tools ({len(tool_list)})",
+        title=title,
         show_header=True,
         expand=True,
     )
     table.add_column("#", style="dim", max_width=4)
     table.add_column("Name", style="cyan")
+    table.add_column("Ops", style="dim", max_width=4)
     table.add_column("Description", ratio=1)
 
-    for i, t in enumerate(tool_list, 1):
+    for i, t in indexed:
         name = t.get("name", "?") if isinstance(t, dict) else str(t)
         desc = t.get("description", "")[:80] if isinstance(t, dict) else ""
-        table.add_row(str(i), name, desc)
+        table.add_row(str(i), name, str(len(_tool_ops(t)) or ""), desc)
 
     console.print(table)
+    age = int(time.time() - entry["fetched_at"])
+    console.print(f"[dim]Registry {entry['hash'][:12]} · fetched {age}s ago[/dim]")
 
 
 # ---------------------------------------------------------------------------
@@ -409,8 +3198,35 @@ def tools(ctx, category, fmt):
 
 
 @cli.command()
-@click.argument("tool_name")
-@click.argument("operation")
+@click.argument("tool_name", required=False)
+@click.argument("operation", required=False)
+@click.option(
+    "--refresh", is_flag=True, help="Probe the server even if the schema is cached."
+)
+@click.option("--all", "discover_all", is_flag=True, help="Probe the whole registry.")
+@click.option(
+    "--category", "-c", default=None, help="Probe only the tools in this category."
+)
+@click.option(
+    "--ops",
+    "probe_ops",
+    is_flag=True,
+    help="With --all/--category, also probe every read-only op with empty params.",
+)
+@click.option(
+    "--concurrency",
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(1, 64),
+    help="Max probes in flight.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write --all/--category results here as JSON (default: stdout).",
+)
 @click.option(
     "--format",
     "fmt",
@@ -419,29 +3235,184 @@ def tools(ctx, category, fmt):
     show_default=True,
 )
 @click.pass_context
-def discover(ctx, tool_name, operation, fmt):
+def discover(
+    ctx,
+    tool_name,
+    operation,
+    refresh,
+    discover_all,
+    category,
+    probe_ops,
+    concurrency,
+    output,
+    fmt,
+):
     """Discover the real schema for a tool+operation by sending an empty call.
 
     The MCP server returns expected parameter schemas in error responses.
-    """
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(
-            f"[bold blue]Discovering schema: {tool_name} -> {operation}[/bold blue]"
-        ):
-            resp = client.discover_schema(tool_name, operation)
+    Parsed schemas are kept in ~/.cache/searchatlas/schemas.json and used
+    to validate --params locally; cached schemas are served without a call.
 
-    if fmt == "json":
-        click.echo(json.dumps(resp, indent=2))
-    else:
-        console.print(
-            Panel(
-                f"[bold cyan]{tool_name}[/bold cyan] -> [yellow]{operation}[/yellow]",
-                title="Schema Discovery",
-                border_style="blue",
+    With --all (or --category) the whole registry is fetched via tools/list
+    and every tool gets a ``help`` probe, run concurrently over one
+    connection pool; results are written untruncated as JSON.
+    """
+    if discover_all or category:
+        client = _async_client(ctx, concurrency)
+        with _spinner("[bold blue]Rediscovering tool registry...[/bold blue]", fmt):
+            report = asyncio.run(_discover_registry(client, category, probe_ops))
+        text = json.dumps(report, indent=2)
+        if output:
+            Path(output).write_text(text)
+        if fmt == "json" and not output:
+            click.echo(text)
+        elif fmt == "rich":
+            _print_discovery(report, output)
+        return
+    if not tool_name or not operation:
+        raise click.UsageError("TOOL_NAME and OPERATION are required (or use --all).")
+
+    schema = None if refresh else _cached_schema(tool_name, operation)
+    if schema is None:
+        with _client(ctx) as client:
+            with _spinner(
+                f"[bold blue]Discovering schema: {tool_name} -> {operation}[/bold blue]",
+                fmt,
+            ):
+                resp = client.discover_schema(tool_name, operation)
+        schema = _learn_schema(tool_name, operation, resp)
+        if fmt == "json":
+            click.echo(json.dumps(resp, indent=2))
+            return
+    elif fmt == "json":
+        click.echo(
+            json.dumps(
+                {"tool": tool_name, "op": operation, "cached": True, "schema": schema},
+                indent=2,
             )
         )
-        _output(resp, "rich")
+        return
+    else:
+        resp = None
+
+    from rich.panel import Panel
+
+    console.print(
+        Panel(
+            f"[bold cyan]{tool_name}[/bold cyan] -> [yellow]{operation}[/yellow]",
+            title="Schema Discovery" + (" (cached)" if resp is None else ""),
+            border_style="blue",
+        )
+    )
+    if resp is not None:
+        _output(resp, "rich")
+    if schema:
+        required = ", ".join(schema["required"]) or "-"
+        optional = ", ".join(schema["optional"]) or "-"
+        console.print(f"[bold]Required:[/bold] {required}")
+        console.print(f"[bold]Optional:[/bold] {optional}")
+
+
+async def _discover_registry(
+    client: AsyncMCPClient, category: str | None, probe_ops: bool
+) -> dict:
+    """Fetch tools/list, then probe each tool (and optionally its ops)."""
+    started = time.perf_counter()
+    async with client:
+        resp = await client.list_tools()
+        if "error" in resp:
+            return {"error": resp["error"]}
+        entry, diff = _store_registry(resp, _read_registry())
+        tool_list = _tool_list(resp)
+
+        names = None
+        if category:
+            _, names = _category_tools(tool_list, category)
+        seen: dict[str, dict] = {}
+        for i, t in enumerate(tool_list, 1):
+            name = t.get("name") if isinstance(t, dict) else None
+            if not name or (names is not None and name not in names) or name in seen:
+                continue  # duplicate names route to the first registration
+            seen[name] = {
+                "name": name,
+                "index": i,
+                "description": t.get("description", ""),
+                "ops": _tool_ops(t),
+            }
+
+        calls = [(name, "help", None) for name in seen]
+        if probe_ops:
+            calls += [
+                (name, op, None)
+                for name, info in seen.items()
+                for op in info["ops"]
+                if op != "help" and _is_read_op(op)
+            ]
+        responses = await client.gather(calls, return_exceptions=True)
+
+    index = _load_schemas()
+    for (name, op, _), res in zip(calls, responses):
+        if isinstance(res, Exception):
+            res = {"error": {"message": f"{type(res).__name__}: {res}"}}
+        if op == "help":
+            seen[name]["help"] = res
+            continue
+        schema = _parse_expected_schema(_error_message(res) or "")
+        if schema:
+            index[f"{name}.{op}"] = {
+                **schema,
+                "raw": _error_message(res),
+                "discovered_at": time.time(),
+            }
+        seen[name].setdefault("probes", {})[op] = schema or res
+    if probe_ops:
+        _write_json_atomic(SCHEMA_FILE, index)
+
+    return {
+        "endpoint": client.endpoint,
+        "registry_hash": entry["hash"],
+        "registry_diff": diff,
+        "tool_count": len(tool_list),
+        "probe_count": len(calls),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "tools": list(seen.values()),
+    }
+
+
+def _print_discovery(report: dict, output: str | None) -> None:
+    if "error" in report:
+        _output(report, "rich")
+        return
+    if report.get("registry_diff"):
+        _print_registry_diff(report["registry_diff"])
+
+    from rich.table import Table
+
+    table = Table(
+        title=f"Registry Discovery ({len(report['tools'])} tools)", expand=True
+    )
+    table.add_column("#", style="dim", max_width=4)
+    table.add_column("Tool", style="cyan")
+    table.add_column("Ops", max_width=4)
+    table.add_column("help", max_width=6)
+    table.add_column("Schemas", max_width=8)
+    for t in report["tools"]:
+        help_ok = "error" not in t["help"] and not _error_message(t["help"])
+        probes = t.get("probes", {})
+        schemas = sum(1 for v in probes.values() if "required" in v)
+        table.add_row(
+            str(t["index"]),
+            t["name"],
+            str(len(t["ops"])),
+            "[green]ok[/green]" if help_ok else "[red]err[/red]",
+            f"{schemas}/{len(probes)}" if probes else "",
+        )
+    console.print(table)
+    console.print(
+        f"[dim]{report['probe_count']} probes in {report['elapsed_s']}s"
+        + (f" · written to {output}" if output else "")
+        + "[/dim]"
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -449,32 +3420,189 @@ def discover(ctx, tool_name, operation, fmt):
 # ---------------------------------------------------------------------------
 
 
+def _parse_shard(ctx, param, value) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise click.BadParameter("expected K/N") from None
+    if not 0 <= index < count:
+        raise click.BadParameter("expected 0 <= K < N")
+    return index, count
+
+
 @cli.command()
-@click.argument("tool_name")
-@click.argument("operation")
+@click.argument("tool_name", required=False)
+@click.argument("operation", required=False)
 @click.option("--params", "-p", default="{}", help="JSON params (default: {}).")
+@click.option(
+    "--batch",
+    "batch_file",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+    default=None,
+    help='JSON array of {"tool","op","params"} calls sent as JSON-RPC batches.',
+)
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["rich", "json"]),
+    type=click.Choice(["rich", "json", "ndjson"]),
     default="rich",
     show_default=True,
 )
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
+@click.option(
+    "--input",
+    "input_file",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+    default=None,
+    help="NDJSON file (or - for stdin) of params objects, one call per line.",
+)
+@click.option(
+    "--concurrency",
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(1, 64),
+    help="With --input: calls in flight. With --accounts: accounts in flight "
+    "per process.",
+)
+@click.option(
+    "--journal",
+    "journal_file",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="With --input: append each outcome to this JSONL checkpoint journal.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="With --journal: skip lines whose request already succeeded.",
+)
+@click.option(
+    "--all-pages",
+    is_flag=True,
+    help="Follow page/offset/cursor pagination and return every record.",
+)
+@click.option(
+    "--prefetch",
+    default=DEFAULT_PREFETCH,
+    show_default=True,
+    type=click.IntRange(1, 32),
+    help="With --all-pages: pages fetched concurrently when a total is known.",
+)
+@click.option(
+    "--max-pages",
+    default=None,
+    type=click.IntRange(1),
+    help="With --all-pages: stop after this many pages.",
+)
+@click.option(
+    "--accounts",
+    "accounts_file",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="TOML file of [accounts.NAME] tables: run the call once per account, "
+    "output NDJSON tagged by account.",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(1, 64),
+    help="With --accounts: worker processes (default: one per "
+    f"{ACCOUNTS_PER_WORKER} accounts, up to the CPU count).",
+)
+@click.option("--shard", default=None, hidden=True, callback=_parse_shard)
 @click.option("--dry-run", is_flag=True, help="Show the request without sending.")
 @click.pass_context
-def call(ctx, tool_name, operation, params, fmt, dry_run):
+def call(
+    ctx,
+    tool_name,
+    operation,
+    params,
+    batch_file,
+    fmt,
+    fields,
+    input_file,
+    concurrency,
+    journal_file,
+    resume,
+    all_pages,
+    prefetch,
+    max_pages,
+    accounts_file,
+    workers,
+    shard,
+    dry_run,
+):
     """Execute an MCP tool call.
 
     Examples:
       searchatlas call project_management list_otto_projects
       searchatlas call brand_vault get_brand_vault_overview -p '{"hostname":"searchatlas.com"}'
       searchatlas call seo_analysis get_project_issues_summary -p '{"project_uuid":"abc123"}'
+      searchatlas call --batch calls.json
+      searchatlas call reports list_reports_paginated --all-pages --format ndjson
+      searchatlas call citation submit_citation --input locations.ndjson > results.ndjson
+      searchatlas call citation submit_citation --input locations.ndjson --journal run.jsonl --resume
+      searchatlas call project_management list_otto_projects --accounts accounts.toml
     """
-    try:
-        params_dict = json.loads(params)
-    except json.JSONDecodeError as exc:
-        console.print(f"[red]Invalid JSON params:[/red] {exc}")
-        sys.exit(1)
+    if accounts_file and (batch_file or input_file or all_pages):
+        raise click.UsageError(
+            "--accounts runs a single call per account; "
+            "it cannot be combined with --batch, --input or --all-pages."
+        )
+    if input_file and (batch_file or all_pages):
+        raise click.UsageError(
+            "--input runs one call per line; "
+            "it cannot be combined with --batch or --all-pages."
+        )
+    fmt_given = ctx.get_parameter_source("fmt") != click.core.ParameterSource.DEFAULT
+    if input_file and fmt_given and fmt != "ndjson":
+        raise click.UsageError("--input always writes NDJSON; use --format ndjson.")
+    if batch_file:
+        _call_batch(ctx, batch_file, fmt, dry_run, fields)
+        return
+    if not tool_name or not operation:
+        raise click.UsageError("TOOL_NAME and OPERATION are required (or use --batch).")
+
+    if resume and not journal_file:
+        raise click.UsageError("--resume needs --journal.")
+    if input_file and dry_run:
+        _dry_run_bulk(tool_name, operation, input_file)
+        return
+    if input_file:
+        _call_bulk(
+            ctx,
+            tool_name,
+            operation,
+            input_file,
+            fields,
+            concurrency,
+            journal_file,
+            resume,
+        )
+        return
+
+    params_dict = _parse_params(params)
+
+    if accounts_file and not dry_run:
+        _call_accounts(
+            ctx,
+            tool_name,
+            operation,
+            params_dict,
+            fields,
+            accounts_file,
+            concurrency,
+            workers,
+            shard,
+        )
+        return
 
     if dry_run:
         payload = {
@@ -486,16 +3614,504 @@ def call(ctx, tool_name, operation, params, fmt, dry_run):
                 "arguments": {"op": operation, "params": params_dict},
             },
         }
-        console.print("[yellow]DRY RUN[/yellow] — would send:")
-        console.print(Syntax(json.dumps(payload, indent=2), "json"))
+        if fmt != "json":
+            click.echo("DRY RUN — would send:", err=True)
+        click.echo(json.dumps(payload, indent=2))
+        return
+
+    if all_pages:
+        _call_all_pages(
+            ctx, tool_name, operation, params_dict, fmt, fields, prefetch, max_pages
+        )
+        return
+    _invoke(ctx, tool_name, operation, params_dict, fmt, fields)
+
+
+def _call_all_pages(
+    ctx,
+    tool: str,
+    op: str,
+    params: dict,
+    fmt: str,
+    fields: list[str] | None,
+    prefetch: int,
+    max_pages: int | None,
+) -> None:
+    """Print every record of a paginated op; ndjson streams as pages arrive."""
+    if not ctx.obj.get("no_validate"):
+        invalid = _validate_params(tool, op, params)
+        if invalid:
+            _output(invalid, fmt)
+            sys.exit(1)
+
+    records = []
+    with _client(ctx) as client:
+        pages = client.iter_pages(tool, op, params, prefetch, max_pages)
+        try:
+            if fmt == "ndjson":
+                for record in pages:
+                    click.echo(json.dumps(_project(record, fields), default=str))
+                return
+            with _spinner(f"[bold blue]{tool} -> {op} (all pages)...[/bold blue]", fmt):
+                records = [_project(r, fields) for r in pages]
+        except RuntimeError as exc:
+            _output({"error": {"code": -32000, "message": str(exc)}}, fmt)
+            sys.exit(1)
+
+    if fmt == "json":
+        click.echo(json.dumps(records, indent=2))
+        return
+    from rich.syntax import Syntax
+
+    console.print(Syntax(json.dumps(records, indent=2), "json"))
+    console.print(f"[dim]{len(records)} records[/dim]")
+
+
+JOURNAL_FSYNC_EVERY = 64  # records
+JOURNAL_FSYNC_INTERVAL = 1.0  # seconds
+
+
+class Journal:
+    """Append-only JSONL checkpoint of bulk call outcomes.
+
+    Every record is written through to the OS as soon as it is appended;
+    fsync is batched (every JOURNAL_FSYNC_EVERY records or
+    JOURNAL_FSYNC_INTERVAL seconds, and on close) so a 10k-item run is not
+    bound by disk flushes. A torn last line from a crash is ignored on load.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    @staticmethod
+    def request_hash(tool: str, op: str, params: dict) -> str:
+        canonical = json.dumps(
+            [tool, op, params], sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def completed(self) -> set[str]:
+        """Hashes whose latest journaled outcome succeeded."""
+        latest: dict[str, bool] = {}
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                        latest[entry["hash"]] = bool(entry["ok"])
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+        except OSError:
+            return set()
+        return {h for h, ok in latest.items() if ok}
+
+    def append(self, entry: dict) -> None:
+        self._fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._fh.flush()
+        self._unsynced += 1
+        if (
+            self._unsynced >= JOURNAL_FSYNC_EVERY
+            or time.monotonic() - self._synced_at >= JOURNAL_FSYNC_INTERVAL
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        if self._unsynced:
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def close(self) -> None:
+        self.sync()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _iter_param_lines(fh):
+    """Yield ``(line_number, params, error)`` for each non-blank NDJSON line."""
+    for lineno, line in enumerate(fh, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            params = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield lineno, None, f"Invalid JSON params: {exc}"
+            continue
+        if not isinstance(params, dict):
+            yield lineno, None, "Invalid JSON params: expected a JSON object."
+            continue
+        yield lineno, params, None
+
+
+def _dry_run_bulk(tool: str, op: str, input_file: str) -> None:
+    """Print the JSON-RPC payload each --input line would send, one per line."""
+    click.echo("DRY RUN — would send:", err=True)
+    invalid = 0
+    with click.open_file(input_file) as fh:
+        for lineno, params, err in _iter_param_lines(fh):
+            if err:
+                click.echo(f"line {lineno}: {err}", err=True)
+                invalid += 1
+                continue
+            arguments = {"op": op, "params": params}
+            payload = _rpc_payload(
+                lineno, "tools/call", {"name": tool, "arguments": arguments}
+            )
+            click.echo(json.dumps(payload, separators=(",", ":")))
+    if invalid:
+        sys.exit(1)
+
+
+def _call_bulk(
+    ctx,
+    tool: str,
+    op: str,
+    input_file: str,
+    fields: list[str] | None,
+    concurrency: int,
+    journal_file: str | None = None,
+    resume: bool = False,
+) -> None:
+    """Run one call per NDJSON params line; write one NDJSON result per line.
+
+    Lines are read lazily and at most ``2 * concurrency`` calls are queued,
+    so memory stays flat however long the input is. Results are written as
+    they finish, tagged with their input line number and latency. With a
+    journal, each outcome is checkpointed and ``resume`` skips every line
+    whose identical request already succeeded.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+    from concurrent.futures import wait as wait_futures
+
+    validate = not ctx.obj.get("no_validate")
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+    started = time.monotonic()
+    journal = Journal(journal_file) if journal_file else None
+    done_hashes = journal.completed() if journal and resume else set()
+    if done_hashes:
+        click.echo(f"Resuming: {len(done_hashes)} requests already done", err=True)
+
+    def run(client, lineno: int, params: dict):
+        start = time.perf_counter()
+        try:
+            resp = (validate and _validate_params(tool, op, params)) or (
+                client.call_tool(tool, op, params)
+            )
+        except Exception as exc:  # retries exhausted: record it, keep going
+            resp = {"error": {"message": f"{type(exc).__name__}: {exc}"}}
+        return lineno, params, resp, (time.perf_counter() - start) * 1000
+
+    def emit(lineno: int, params, resp: dict, latency_ms: float) -> None:
+        record = {"line": lineno, "ok": False, "latency_ms": round(latency_ms, 1)}
+        msg = _error_message(resp)
+        if params is not None:
+            _learn_schema(tool, op, resp, params)
+        if msg is None:
+            record["ok"] = True
+            if fields:
+                record["result"] = [_project(r, fields) for r in _iter_records(resp)]
+            else:
+                record["result"] = _payload(resp)
+        else:
+            record["error"] = msg
+        counts["ok" if record["ok"] else "failed"] += 1
+        click.echo(json.dumps(record, default=str))
+        if journal and params is not None:
+            entry = {
+                "hash": Journal.request_hash(tool, op, params),
+                "line": lineno,
+                "ok": record["ok"],
+                "at": time.time(),
+            }
+            if msg is not None:
+                entry["error"] = msg[:500]
+            journal.append(entry)
+
+    with contextlib.ExitStack() as stack:
+        fh = stack.enter_context(click.open_file(input_file))
+        client = stack.enter_context(_client(ctx))
+        if journal:
+            stack.enter_context(journal)
+        pool = stack.enter_context(ThreadPoolExecutor(max_workers=concurrency))
+        pending = set()
+        for lineno, params, err in _iter_param_lines(fh):
+            if err:
+                emit(lineno, None, {"error": {"message": err}}, 0.0)
+                continue
+            if done_hashes and Journal.request_hash(tool, op, params) in done_hashes:
+                counts["skipped"] += 1
+                continue
+            pending.add(pool.submit(run, client, lineno, params))
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(*future.result())
+        while pending:
+            done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                emit(*future.result())
+
+    skipped = f", {counts['skipped']} skipped" if counts["skipped"] else ""
+    click.echo(
+        f"{counts['ok']} ok, {counts['failed']} failed{skipped} "
+        f"in {time.monotonic() - started:.1f}s",
+        err=True,
+    )
+    if counts["failed"]:
+        sys.exit(1)
+
+
+def _load_accounts(path: str) -> list[dict]:
+    """Accounts from ``[accounts.NAME]`` TOML tables.
+
+    Each needs ``api_key`` or ``api_key_env`` (the name of an environment
+    variable holding it) and may set ``params`` (merged over -p),
+    ``rate_limit`` (specs added to --rate-limit) and ``endpoint``.
+    """
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise click.ClickException(
+                "--accounts needs Python 3.11+ or `pip install tomli`."
+            ) from None
+    try:
+        data = tomllib.loads(Path(path).read_text())
+    except (OSError, tomllib.TOMLDecodeError) as exc:
+        raise click.BadParameter(str(exc), param_hint="--accounts") from exc
+    table = data.get("accounts")
+    if not isinstance(table, dict) or not table:
+        raise click.BadParameter(
+            f"{path} has no [accounts.NAME] tables", param_hint="--accounts"
+        )
+
+    accounts = []
+    for name, spec in table.items():
+
+        def bad(msg: str) -> click.BadParameter:
+            return click.BadParameter(
+                f"account {name!r}: {msg}", param_hint="--accounts"
+            )
+
+        if not isinstance(spec, dict):
+            raise bad("expected a table")
+        key = spec.get("api_key") or os.environ.get(spec.get("api_key_env") or "")
+        if not key:
+            raise bad("set api_key, or api_key_env to a variable that is set")
+        params = spec.get("params", {})
+        if not isinstance(params, dict):
+            raise bad("params must be a table")
+        limits = spec.get("rate_limit", [])
+        limits = [limits] if isinstance(limits, str) else list(limits)
+        for limit in limits:
+            try:
+                _parse_rate_limit(limit)
+            except ValueError as exc:
+                raise bad(str(exc)) from exc
+        accounts.append(
+            {
+                "name": name,
+                "api_key": key,
+                "endpoint": spec.get("endpoint"),
+                "params": params,
+                "rate_limits": tuple(limits),
+            }
+        )
+    return accounts
+
+
+def _call_accounts(
+    ctx,
+    tool: str,
+    op: str,
+    params: dict,
+    fields: list[str] | None,
+    accounts_file: str,
+    concurrency: int,
+    workers: int | None,
+    shard: tuple[int, int] | None,
+) -> None:
+    """Run one call per account; write NDJSON records tagged by account.
+
+    Every account gets its own client (connection pool, rate limiter, quota
+    guard, circuit breaker). Up to ``concurrency`` accounts run at once per
+    process. Above ACCOUNTS_PER_WORKER accounts the run is split over
+    worker processes, each re-running this command on a ``--shard``, and
+    their output is merged line by line as it arrives.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    accounts = _load_accounts(accounts_file)
+    started = time.monotonic()
+    if shard is None:
+        workers = workers or min(
+            os.cpu_count() or 1, -(-len(accounts) // ACCOUNTS_PER_WORKER)
+        )
+        if workers > 1:
+            counts = _run_account_shards(min(workers, len(accounts)))
+            _accounts_summary(counts, len(accounts), started)
+            return
+    else:
+        index, count = shard
+        accounts = accounts[index::count]
+        if ctx.obj.get("metrics_out"):
+            out = ctx.obj["metrics_out"]
+            ctx.obj["metrics_out"] = out.with_name(
+                f"{out.stem}.shard{index}{out.suffix}"
+            )
+
+    validate = not ctx.obj.get("no_validate")
+    counts = {"ok": 0, "failed": 0}
+
+    def run(account: dict):
+        merged = {**params, **account["params"]}
+        start = time.perf_counter()
+        try:
+            resp = (validate and _validate_params(tool, op, merged)) or None
+            if resp is None:
+                with _client(ctx, account) as client:
+                    resp = client.call_tool(tool, op, merged)
+        except Exception as exc:  # retries exhausted: record it, keep going
+            resp = {"error": {"message": f"{type(exc).__name__}: {exc}"}}
+        return account, merged, resp, (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run, account) for account in accounts]
+        for future in as_completed(futures):
+            account, merged, resp, latency_ms = future.result()
+            record = {
+                "account": account["name"],
+                "ok": False,
+                "latency_ms": round(latency_ms, 1),
+            }
+            msg = _error_message(resp)
+            _learn_schema(tool, op, resp, merged)
+            if msg is None:
+                record["ok"] = True
+                if fields:
+                    record["result"] = [
+                        _project(r, fields) for r in _iter_records(resp)
+                    ]
+                else:
+                    record["result"] = _payload(resp)
+            else:
+                record["error"] = msg
+            counts["ok" if record["ok"] else "failed"] += 1
+            click.echo(json.dumps(record, default=str))
+
+    if shard is None:
+        _accounts_summary(counts, len(accounts), started)
+    elif counts["failed"]:
+        sys.exit(1)
+
+
+def _run_account_shards(workers: int) -> dict:
+    """Re-run this command as ``workers`` shard processes; merge their stdout."""
+    import subprocess
+
+    argv = [sys.executable, sys.argv[0], *sys.argv[1:]]
+    counts = {"ok": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def pump(proc) -> None:
+        for line in proc.stdout:
+            try:
+                ok = bool(json.loads(line).get("ok"))
+            except (json.JSONDecodeError, AttributeError):
+                continue
+            with lock:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+                counts["ok" if ok else "failed"] += 1
+
+    procs = [
+        subprocess.Popen(
+            [*argv, "--shard", f"{k}/{workers}"], stdout=subprocess.PIPE, text=True
+        )
+        for k in range(workers)
+    ]
+    pumps = [threading.Thread(target=pump, args=(proc,)) for proc in procs]
+    for thread in pumps:
+        thread.start()
+    for proc, thread in zip(procs, pumps):
+        thread.join()
+        if proc.wait() not in (0, 1):
+            log.error("Account worker exited with status %s", proc.returncode)
+            counts["crashed"] = counts.get("crashed", 0) + 1
+    return counts
+
+
+def _accounts_summary(counts: dict, total: int, started: float) -> None:
+    missing = total - counts["ok"] - counts["failed"]
+    lost = f", {missing} lost to crashed workers" if missing > 0 else ""
+    click.echo(
+        f"{total} accounts: {counts['ok']} ok, {counts['failed']} failed{lost} "
+        f"in {time.monotonic() - started:.1f}s",
+        err=True,
+    )
+    if counts["failed"] or missing > 0:
+        sys.exit(1)
+
+
+def _call_batch(
+    ctx, batch_file: str, fmt: str, dry_run: bool, fields: list[str] | None = None
+) -> None:
+    with click.open_file(batch_file) as fh:
+        try:
+            entries = json.load(fh)
+        except json.JSONDecodeError as exc:
+            console.print(f"[red]Invalid batch file:[/red] {exc}")
+            sys.exit(1)
+    if not isinstance(entries, list):
+        console.print("[red]Invalid batch file:[/red] expected a JSON array of calls.")
+        sys.exit(1)
+
+    calls = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            entry = {}
+        tool = entry.get("tool") or entry.get("name")
+        op = entry.get("op") or entry.get("operation")
+        if not tool or not op:
+            console.print(
+                f"[red]Invalid batch entry #{i}:[/red] needs 'tool' and 'op'."
+            )
+            sys.exit(1)
+        calls.append((tool, op, entry.get("params") or {}))
+
+    if dry_run:
+        click.echo(f"DRY RUN — would send {len(calls)} batched calls:", err=True)
+        for tool, op, p in calls:
+            click.echo(f"  {tool} -> {op} {json.dumps(p)}")
         return
 
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]{tool_name} -> {operation}...[/bold blue]"):
-            resp = client.call_tool(tool_name, operation, params_dict)
+    with _client(ctx) as client:
+        with _spinner(
+            f"[bold blue]Sending {len(calls)} batched calls...[/bold blue]", fmt
+        ):
+            responses = client.batch(calls)
 
-    _output(resp, fmt)
+    if fmt == "json":
+        if fields:
+            responses = [_projected(r, fields) for r in responses]
+        click.echo(json.dumps(responses, indent=2))
+        return
+    for (tool, op, _), resp in zip(calls, responses):
+        if fmt == "rich":
+            console.rule(f"[cyan]{tool}[/cyan] -> [yellow]{op}[/yellow]")
+        _output(resp, fmt, fields)
 
 
 # ---------------------------------------------------------------------------
@@ -503,8 +4119,107 @@ def call(ctx, tool_name, operation, params, fmt, dry_run):
 # ---------------------------------------------------------------------------
 
 
+TASK_DONE_STATES = ("SUCCESS", "COMPLETED", "FAILED", "FAILURE", "ERROR", "REVOKED")
+TASK_STATES = re.compile(
+    r"\b(PENDING|QUEUED|STARTED|RUNNING|PROGRESS|RETRY|"
+    + "|".join(TASK_DONE_STATES)
+    + r")\b"
+)
+POLL_STATS_FILE = CACHE_DIR / "poll_stats.json"
+POLL_MIN_INTERVAL = 1.0  # seconds
+POLL_MAX_INTERVAL = 30.0
+POLL_BACKOFF = 1.5
+
+
+def _task_status(resp: dict) -> str:
+    """Upper-cased task state from a task status response ("" if unknown)."""
+    text = _result_text(resp)
+    try:
+        parsed = json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        parsed = None
+    if isinstance(parsed, dict):
+        return str(parsed.get("status", parsed.get("state", ""))).upper()
+    m = TASK_STATES.search(text.upper())
+    return m.group(1) if m else text.strip().upper()
+
+
+async def _poll_tasks(
+    client: AsyncMCPClient,
+    tool_name: str,
+    op_name: str,
+    task_ids: list[str],
+    timeout: float,
+    on_transition,
+) -> list[dict]:
+    """Poll many tasks concurrently until each finishes or ``timeout`` passes.
+
+    Each task starts polling fast and backs off geometrically, so short tasks
+    resolve quickly and long ones are not hammered. The starting interval is
+    learned per tool from how long previous tasks took to finish.
+    ``on_transition(task_id, old, new, elapsed)`` fires on every state change.
+    """
+    try:
+        stats = json.loads(POLL_STATS_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        stats = {}
+    learned = stats.get(tool_name, {}).get("avg_s")
+    first_interval = (
+        min(10.0, max(POLL_MIN_INTERVAL, learned / 8)) if learned else POLL_MIN_INTERVAL
+    )
+    deadline = time.monotonic() + timeout
+
+    async def poll_one(task_id: str) -> dict:
+        started = time.monotonic()
+        interval, state, polls, resp = first_interval, None, 0, {}
+        while True:
+            try:
+                resp = await client.call_tool(tool_name, op_name, {"task_id": task_id})
+                new = (
+                    "ERROR"
+                    if _classify_error(resp) == "terminal"
+                    else _task_status(resp)
+                )
+            except httpx.HTTPError as exc:
+                resp = {"error": {"message": f"{type(exc).__name__}: {exc}"}}
+                new = "ERROR"
+            polls += 1
+            new = new or "UNKNOWN"
+            if new != state:
+                on_transition(task_id, state, new, time.monotonic() - started)
+                state = new
+            if state in TASK_DONE_STATES:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                on_transition(task_id, state, "TIMEOUT", time.monotonic() - started)
+                state = "TIMEOUT"
+                break
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(POLL_MAX_INTERVAL, interval * POLL_BACKOFF)
+        return {
+            "task_id": task_id,
+            "status": state,
+            "elapsed_s": round(time.monotonic() - started, 1),
+            "polls": polls,
+            "response": resp,
+        }
+
+    results = await asyncio.gather(*(poll_one(t) for t in task_ids))
+
+    done = [r["elapsed_s"] for r in results if r["status"] in ("SUCCESS", "COMPLETED")]
+    if done:
+        avg = learned or sum(done) / len(done)
+        for d in done:
+            avg = 0.7 * avg + 0.3 * d  # exponential moving average
+        samples = stats.get(tool_name, {}).get("samples", 0) + len(done)
+        stats[tool_name] = {"avg_s": round(avg, 2), "samples": samples}
+        _write_json_atomic(POLL_STATS_FILE, stats)
+    return results
+
+
 @cli.command()
-@click.argument("task_id")
+@click.argument("task_ids", nargs=-1, required=True)
 @click.option(
     "--tool",
     "tool_type",
@@ -513,10 +4228,19 @@ def call(ctx, tool_name, operation, params, fmt, dry_run):
     show_default=True,
     help="Which task management tool to use.",
 )
-@click.option("--poll", is_flag=True, help="Poll until SUCCESS/FAILURE (5s intervals).")
+@click.option(
+    "--poll", is_flag=True, help="Poll until SUCCESS/FAILURE with adaptive backoff."
+)
 @click.option(
     "--timeout", default=120, show_default=True, help="Max poll time in seconds."
 )
+@click.option(
+    "--concurrency",
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(1, 64),
+    help="Max status requests in flight.",
+)
 @click.option(
     "--format",
     "fmt",
@@ -525,125 +4249,861 @@ def call(ctx, tool_name, operation, params, fmt, dry_run):
     show_default=True,
 )
 @click.pass_context
-def status(ctx, task_id, tool_type, poll, timeout, fmt):
+def status(ctx, task_ids, tool_type, poll, timeout, concurrency, fmt):
     """Check or poll async task status.
 
     OTTO tasks: uses task_management -> get_otto_task_status
     PPC tasks:  uses task -> get_otto_ppc_task_status
+
+    Accepts many task IDs; pass "-" to read IDs from stdin (one per line).
+    With --poll, all tasks are polled concurrently over one client and only
+    state transitions are printed, followed by a summary.
     """
     tool_map = {
         "otto": ("task_management", "get_otto_task_status"),
         "ppc": ("task", "get_otto_ppc_task_status"),
     }
     tool_name, op_name = tool_map[tool_type]
-    key = _get_api_key(ctx.obj["api_key"])
-
-    with MCPClient(key) as client:
-        start = time.time()
-        while True:
-            with console.status(f"[bold blue]Checking task {task_id}...[/bold blue]"):
-                resp = client.call_tool(tool_name, op_name, {"task_id": task_id})
-
-            _output(resp, fmt)
-
-            if not poll:
-                break
 
-            # Check if done
-            result_text = ""
-            result = resp.get("result", [])
-            if isinstance(result, list) and result:
-                item = result[0]
-                if isinstance(item, dict):
-                    result_text = item.get("text", "")
+    ids: list[str] = []
+    for task_id in task_ids:
+        batch = [line.strip() for line in sys.stdin] if task_id == "-" else [task_id]
+        ids.extend(t for t in batch if t and t not in ids)
+
+    if not poll:
+        with _client(ctx, fmt=fmt) as client:
+            for task_id in ids:
+                with _spinner(
+                    f"[bold blue]Checking task {task_id}...[/bold blue]", fmt
+                ):
+                    resp = client.call_tool(tool_name, op_name, {"task_id": task_id})
+                if len(ids) > 1 and fmt == "rich":
+                    console.rule(f"[cyan]{task_id}[/cyan]")
+                _output(resp, fmt)
+        return
 
-            status_val = ""
-            try:
-                parsed = json.loads(result_text)
-                status_val = str(parsed.get("status", parsed.get("state", ""))).upper()
-            except (json.JSONDecodeError, TypeError, AttributeError):
-                status_val = result_text.upper() if result_text else ""
+    def on_transition(task_id, old, new, elapsed):
+        if fmt != "rich":
+            return
+        colour = (
+            "green"
+            if new in ("SUCCESS", "COMPLETED")
+            else ("red" if new in TASK_DONE_STATES + ("TIMEOUT",) else "blue")
+        )
+        arrow = f"{old} -> " if old else ""
+        console.print(
+            f"[dim]{elapsed:6.1f}s[/dim] [cyan]{task_id}[/cyan] {arrow}[{colour}]{new}[/{colour}]"
+        )
 
-            if status_val in ("SUCCESS", "COMPLETED", "FAILED", "ERROR"):
-                console.print(f"[bold]Final status: {status_val}[/bold]")
-                break
+    async def poll_all():
+        async with _async_client(ctx, concurrency) as client:
+            return await _poll_tasks(
+                client, tool_name, op_name, ids, timeout, on_transition
+            )
 
-            if time.time() - start > timeout:
-                console.print("[yellow]Timeout reached — task still running.[/yellow]")
-                break
+    results = asyncio.run(poll_all())
 
-            console.print("[dim]Waiting 5s...[/dim]")
-            time.sleep(5)
+    if fmt == "json":
+        click.echo(json.dumps(results, indent=2))
+        return
+    from rich.table import Table
+
+    table = Table(title=f"Task Summary ({len(results)})", expand=True)
+    table.add_column("Task", style="cyan")
+    table.add_column("Final status")
+    table.add_column("Elapsed", justify="right")
+    table.add_column("Polls", justify="right")
+    for r in results:
+        table.add_row(r["task_id"], r["status"], f"{r['elapsed_s']}s", str(r["polls"]))
+    console.print(table)
 
 
 # ---------------------------------------------------------------------------
-# wait — convenience wrapper for otto_wait
+# shell — long-lived session over one connection pool
 # ---------------------------------------------------------------------------
 
+SHELL_HELP = """\
+  TOOL OP [JSON]            call a tool (also: call TOOL OP [JSON])
+  discover TOOL OP          show the cached schema or probe for it
+  tools                     list tool names from the cached registry
+  help | exit | quit"""
+
 
 @cli.command()
-@click.option("--seconds", "-s", default=5, show_default=True, help="Seconds to wait.")
 @click.option(
-    "--tool",
-    "tool_type",
-    type=click.Choice(["otto", "ppc"]),
-    default="otto",
+    "--jsonl",
+    is_flag=True,
+    help='Serve JSON-lines on stdin/stdout: {"id","tool","op","params"} per line.',
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["rich", "json"]),
+    default="rich",
     show_default=True,
 )
 @click.pass_context
-def wait(ctx, seconds, tool_type):
-    """Server-side wait (calls otto_wait on the MCP server)."""
-    tool_map = {"otto": "task_management", "ppc": "task"}
-    tool_name = tool_map[tool_type]
-    key = _get_api_key(ctx.obj["api_key"])
-
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]Waiting {seconds}s...[/bold blue]"):
-            resp = client.call_tool(tool_name, "otto_wait", {})
-    _output(resp, "rich")
+def shell(ctx, jsonl, fmt):
+    """Interactive shell that keeps one MCP connection alive across calls.
 
+    Avoids per-call interpreter startup and TLS handshakes. Tool and op
+    names tab-complete from the cached registry; every call reports its
+    latency. With --jsonl, reads one request object per stdin line and
+    writes one response object per stdout line, for driving from agents.
+    """
+    with _client(ctx, fmt="json" if jsonl else fmt) as client:
+        if jsonl:
+            _serve_jsonl(ctx, client)
+        else:
+            _repl(ctx, client, fmt)
+
+
+def _session_call(
+    ctx, client: MCPClient, tool: str, op: str, params: dict
+) -> tuple[dict, float]:
+    """Validate and send one call on an open client; returns (response, ms)."""
+    if not ctx.obj.get("no_validate"):
+        invalid = _validate_params(tool, op, params)
+        if invalid:
+            return invalid, 0.0
+    started = time.perf_counter()
+    resp = client.call_tool(tool, op, params)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _learn_schema(tool, op, resp, params)
+    return resp, elapsed_ms
+
+
+def _serve_jsonl(ctx, client: MCPClient) -> None:
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        req_id = None
+        try:
+            req = json.loads(line)
+            req_id = req.get("id")
+            if req.get("method") == "tools/list":
+                started = time.perf_counter()
+                resp = client.list_tools()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            else:
+                params = req.get("params") or {}
+                if (
+                    not req.get("tool")
+                    or not req.get("op")
+                    or not isinstance(params, dict)
+                ):
+                    raise ValueError(
+                        'expected {"tool": ..., "op": ..., "params": {...}}'
+                    )
+                resp, elapsed_ms = _session_call(
+                    ctx, client, req["tool"], req["op"], params
+                )
+            out = {"id": req_id, "response": resp, "latency_ms": round(elapsed_ms, 1)}
+        except (ValueError, AttributeError) as exc:
+            out = {"id": req_id, "error": f"Invalid request: {exc}"}
+        except httpx.HTTPError as exc:
+            out = {"id": req_id, "error": f"{type(exc).__name__}: {exc}"}
+        sys.stdout.write(json.dumps(out) + "\n")
+        sys.stdout.flush()
+
+
+def _shell_completer(tools: list):
+    ops_by_tool: dict[str, list[str]] = {}
+    for t in tools:
+        if isinstance(t, dict) and t.get("name"):
+            ops_by_tool.setdefault(t["name"], []).extend(_tool_ops(t))
+    commands = sorted(
+        set(ops_by_tool) | {"call", "discover", "tools", "help", "exit", "quit"}
+    )
 
-# ---------------------------------------------------------------------------
-# playbook — summit challenge playbook management
-# ---------------------------------------------------------------------------
+    def complete(text: str, state: int):
+        import readline
+
+        words = readline.get_line_buffer()[: readline.get_endidx()].split()
+        if text:
+            words = words[:-1]
+        if words and words[0] in ("call", "discover"):
+            words = words[1:]
+        if not words:
+            options = commands
+        elif len(words) == 1:
+            options = ops_by_tool.get(words[0], [])
+        else:
+            options = []
+        matches = [o for o in options if o.startswith(text)]
+        return matches[state] if state < len(matches) else None
 
+    return complete
 
-@cli.group()
-def playbook():
-    """Summit challenge playbooks — 15 ready-to-run marketing workflows."""
-    pass
 
+def _repl(ctx, client: MCPClient, fmt: str) -> None:
+    try:
+        tool_list = _tool_list(_registry(ctx)[0]["response"])
+    except httpx.HTTPError as exc:
+        log.warning("Could not load registry for completion: %s", exc)
+        tool_list = []
+    try:
+        import readline
 
-@playbook.command("list")
-def playbook_list():
-    """List all 15 summit challenge playbooks."""
-    playbooks = _load_playbooks()
+        readline.set_completer(_shell_completer(tool_list))
+        readline.set_completer_delims(" \t")
+        readline.parse_and_bind("tab: complete")
+    except ImportError:
+        pass
 
-    table = Table(
-        title="Summit Challenge Playbooks (15)",
-        show_header=True,
-        expand=True,
+    console.print(
+        f"[bold blue]SearchAtlas MCP shell[/bold blue] — {len(tool_list)} tools. "
+        "Type [cyan]help[/cyan] for commands."
     )
-    table.add_column("#", style="dim", max_width=4)
-    table.add_column("Day", style="yellow", max_width=4)
-    table.add_column("Playbook", style="cyan", ratio=1)
-    table.add_column("Time", max_width=8)
-    table.add_column("Agents", style="dim")
+    while True:
+        try:
+            line = input("searchatlas> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            console.print()
+            break
+        if not line:
+            continue
+        parts = line.split(None, 3 if line.startswith("call ") else 2)
+        if parts[0] == "call":
+            parts = parts[1:]
+            if not parts:
+                console.print("[red]Usage:[/red] call TOOL OP [JSON params]")
+                continue
+        cmd = parts[0]
+        if cmd in ("exit", "quit"):
+            break
+        if cmd == "help":
+            console.print(SHELL_HELP)
+            continue
+        if cmd == "tools":
+            console.print(", ".join(sorted({t.get("name", "?") for t in tool_list})))
+            continue
+        if cmd == "discover":
+            tool, op = (" ".join(parts[1:]).split() + ["", ""])[:2]
+            if not tool or not op:
+                console.print("[red]Usage:[/red] discover TOOL OP")
+                continue
+            schema = _cached_schema(tool, op)
+            if schema is None:
+                try:
+                    resp, _ = _session_call(ctx, client, tool, op, {})
+                except httpx.HTTPError as exc:
+                    console.print(f"[red]{type(exc).__name__}:[/red] {exc}")
+                    continue
+                schema = _cached_schema(tool, op)
+                if schema is None:
+                    _output(resp, fmt)
+                    continue
+            console.print(
+                f"[bold]Required:[/bold] {', '.join(schema['required']) or '-'}"
+            )
+            console.print(
+                f"[bold]Optional:[/bold] {', '.join(schema['optional']) or '-'}"
+            )
+            continue
+        if len(parts) < 2:
+            console.print("[red]Usage:[/red] TOOL OP [JSON params]")
+            continue
+        try:
+            params = json.loads(parts[2]) if len(parts) > 2 else {}
+        except json.JSONDecodeError as exc:
+            console.print(f"[red]Invalid JSON params:[/red] {exc}")
+            continue
+        if not isinstance(params, dict):
+            console.print("[red]Invalid JSON params:[/red] expected a JSON object.")
+            continue
+        try:
+            resp, elapsed_ms = _session_call(ctx, client, parts[0], parts[1], params)
+        except httpx.HTTPError as exc:
+            console.print(f"[red]{type(exc).__name__}:[/red] {exc}")
+            continue
+        _output(resp, fmt)
+        console.print(f"[dim]{elapsed_ms:.0f} ms[/dim]")
 
-    for i, pb in enumerate(playbooks, 1):
-        table.add_row(
-            str(i),
-            str(pb.get("day", "?")),
-            pb["name"],
-            pb.get("time_estimate", "?"),
-            ", ".join(pb.get("agent_namespaces", [])),
-        )
 
-    console.print(table)
+# ---------------------------------------------------------------------------
+# replay — re-send captured traffic (--record) as a load test
+# ---------------------------------------------------------------------------
 
 
-@playbook.command("show")
-@click.argument("number", type=int)
+def _load_capture(fh, max_gap: float | None) -> list[dict]:
+    """Capture entries in send order, each with an ``offset`` in seconds.
+
+    Responses are dropped as entries are read, so only the requests are
+    held in memory. ``max_gap`` caps idle time between requests, e.g.
+    between CLI invocations recorded hours apart.
+    """
+    entries = []
+    for lineno, entry in _iter_capture(fh):
+        entries.append(
+            {
+                "line": lineno,
+                "ts": entry["ts"],
+                "request": entry["request"],
+                "recorded_ms": entry.get("latency_ms"),
+            }
+        )
+    entries.sort(key=lambda e: e["ts"])
+    offset, prev = 0.0, None
+    for entry in entries:
+        if prev is not None:
+            gap = max(0.0, entry["ts"] - prev)
+            offset += gap if max_gap is None else min(gap, max_gap)
+        prev = entry["ts"]
+        entry["offset"] = offset
+    return entries
+
+
+def _capture_key(request: dict | list) -> str:
+    if isinstance(request, list):
+        return f"batch of {len(request)}"
+    return _breaker_key(
+        request.get("method"), request.get("params") or {}
+    ) or request.get("method", "?")
+
+
+def _is_read_capture(request: dict | list) -> bool:
+    """Is a captured request (or every item of a captured batch) a read?"""
+    items = request if isinstance(request, list) else [request]
+    return all(
+        isinstance(item, dict)
+        and _is_read_request(item.get("method", ""), item.get("params") or {})
+        for item in items
+    )
+
+
+def _replay_request(client: MCPClient, request: dict | list) -> str | None:
+    """Send one captured request; returns an error message or None."""
+    if isinstance(request, list):
+        calls = []
+        for item in request:
+            params = (item.get("params") or {}) if isinstance(item, dict) else {}
+            arguments = params.get("arguments") or {}
+            calls.append(
+                (params.get("name"), arguments.get("op"), arguments.get("params"))
+            )
+        failed = [m for m in map(_error_message, client.batch(calls)) if m]
+        return f"{len(failed)}/{len(calls)} failed: {failed[0]}" if failed else None
+    return _error_message(
+        client._jsonrpc(request.get("method", ""), request.get("params") or {})
+    )
+
+
+@cli.command()
+@click.argument(
+    "capture", type=click.Path(exists=True, dir_okay=False, allow_dash=True)
+)
+@click.option(
+    "--speed",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="Pacing multiplier: 1 = captured pacing, 10 = ten times faster, "
+    "0 = as fast as concurrency allows.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(1, 256),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Max requests in flight.",
+)
+@click.option(
+    "--max-gap",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Cap idle time between captured requests (seconds).",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["rich", "json", "ndjson"]),
+    default="rich",
+    show_default=True,
+    help="ndjson also streams one line per replayed request.",
+)
+@click.option(
+    "--include-writes",
+    is_flag=True,
+    help="Also replay requests that are not read ops (skipped by default).",
+)
+@click.option(
+    "--yes",
+    "-y",
+    is_flag=True,
+    help="Don't ask before replaying write ops against the production endpoint.",
+)
+@click.pass_context
+def replay(ctx, capture, speed, concurrency, max_gap, fmt, include_writes, yes):
+    """Replay a --record capture against --endpoint as a load test.
+
+    Requests are sent at their captured offsets divided by --speed, through
+    the client's retry, rate-limit and metrics path (combine with
+    --profile or --metrics-out) but never the response cache. Retries in
+    the capture are skipped; the client makes its own. Reports achieved
+    rate, latency against the captured latency, and scheduling lag (how
+    late requests started because --concurrency was saturated).
+
+    Requests that are not read ops (creates, updates, task starts) are
+    skipped unless --include-writes is given; replaying them against the
+    production endpoint also asks for confirmation unless --yes.
+
+    \b
+    Examples:
+      searchatlas --record traffic.jsonl brand list_brand_vaults
+      searchatlas --endpoint http://127.0.0.1:8765/ replay traffic.jsonl --speed 5
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+    from concurrent.futures import wait as wait_futures
+
+    recorder = ctx.obj.get("recorder")
+    if (
+        recorder
+        and capture != "-"
+        and Path(capture).resolve() == recorder.path.resolve()
+    ):
+        raise click.UsageError("--record must not point at the capture being replayed.")
+    with click.open_file(capture) as fh:
+        entries = _load_capture(fh, max_gap)
+    if not entries:
+        click.echo(f"No requests found in {capture}", err=True)
+        sys.exit(1)
+    writes = [e for e in entries if not _is_read_capture(e["request"])]
+    if writes and not include_writes:
+        click.echo(
+            f"Skipping {len(writes)} write request(s); pass --include-writes "
+            "to replay them.",
+            err=True,
+        )
+        entries = [e for e in entries if _is_read_capture(e["request"])]
+        if not entries:
+            sys.exit(1)
+    elif writes and not yes:
+        endpoint = ctx.obj.get("endpoint", MCP_ENDPOINT)
+        if endpoint.rstrip("/") == MCP_ENDPOINT.rstrip("/"):
+            # On stderr with the prompt, so --format ndjson stdout stays clean.
+            click.echo(
+                f"{len(writes)} write request(s) will be re-sent to "
+                f"production ({MCP_ENDPOINT}).",
+                err=True,
+            )
+            if not click.confirm("Replay them?", err=True):
+                sys.exit(1)
+    ctx.obj["cache"] = False
+
+    results = []
+
+    def run(client, entry: dict, due: float) -> dict:
+        lag = time.monotonic() - due
+        start = time.perf_counter()
+        try:
+            error = _replay_request(client, entry["request"])
+        except Exception as exc:  # retries exhausted: record it, keep going
+            error = f"{type(exc).__name__}: {exc}"
+        result = {
+            "line": entry["line"],
+            "key": _capture_key(entry["request"]),
+            "ok": error is None,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "recorded_ms": entry["recorded_ms"],
+            "lag_ms": round(max(0.0, lag) * 1000, 1),
+        }
+        if error is not None:
+            result["error"] = error
+        return result
+
+    def emit(result: dict) -> None:
+        results.append(result)
+        if fmt == "ndjson":
+            click.echo(json.dumps(result))
+
+    with _client(ctx) as client, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.monotonic()
+        pending = set()
+        for entry in entries:
+            due = started + (entry["offset"] / speed if speed else 0.0)
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            pending.add(pool.submit(run, client, entry, due))
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+        while pending:
+            done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                emit(future.result())
+    wall = time.monotonic() - started
+
+    summary = _replay_summary(results, wall, entries[-1]["offset"])
+    if fmt == "json":
+        click.echo(json.dumps(summary, indent=2))
+    elif fmt == "ndjson":
+        click.echo(json.dumps({"summary": summary}), err=True)
+    else:
+        _print_replay_summary(capture, speed, concurrency, summary)
+    if summary["failed"]:
+        sys.exit(1)
+
+
+def _replay_summary(results: list[dict], wall: float, captured_s: float) -> dict:
+    def pct(values: list[float], q: float) -> float | None:
+        values = sorted(v for v in values if v is not None)
+        return values[min(len(values) - 1, int(len(values) * q))] if values else None
+
+    latency = [r["latency_ms"] for r in results]
+    recorded = [r["recorded_ms"] for r in results]
+    lag = [r["lag_ms"] for r in results]
+    failed = [r for r in results if not r["ok"]]
+    errors: dict[str, int] = {}
+    for r in failed:
+        errors[r["error"][:80]] = errors.get(r["error"][:80], 0) + 1
+    return {
+        "requests": len(results),
+        "ok": len(results) - len(failed),
+        "failed": len(failed),
+        "wall_s": round(wall, 3),
+        "captured_s": round(captured_s, 3),
+        "rate_per_s": round(len(results) / wall, 2) if wall else None,
+        "latency_ms": {
+            "p50": pct(latency, 0.5),
+            "p95": pct(latency, 0.95),
+            "p99": pct(latency, 0.99),
+            "max": max(latency),
+        },
+        "recorded_latency_ms": {
+            "p50": pct(recorded, 0.5),
+            "p95": pct(recorded, 0.95),
+            "p99": pct(recorded, 0.99),
+        },
+        "lag_ms": {"p50": pct(lag, 0.5), "max": max(lag)},
+        "errors": dict(sorted(errors.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def _print_replay_summary(
+    capture: str, speed: float, concurrency: int, summary: dict
+) -> None:
+    from rich.table import Table
+
+    pacing = f"{speed:g}x" if speed else "unpaced"
+    table = Table(title=f"Replay of {capture} ({pacing}, concurrency {concurrency})")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Requests", f"{summary['requests']} ({summary['failed']} failed)")
+    table.add_row(
+        "Wall / captured", f"{summary['wall_s']:.2f}s / {summary['captured_s']:.2f}s"
+    )
+    table.add_row("Rate", f"{summary['rate_per_s']} req/s")
+
+    def ms(stats: dict) -> str:
+        return " / ".join(
+            "-" if stats[k] is None else f"{stats[k]:.0f}"
+            for k in ("p50", "p95", "p99")
+        )
+
+    table.add_row("Latency p50/p95/p99 ms", ms(summary["latency_ms"]))
+    table.add_row("Captured p50/p95/p99 ms", ms(summary["recorded_latency_ms"]))
+    table.add_row(
+        "Lag p50 / max ms",
+        f"{summary['lag_ms']['p50']:.0f} / {summary['lag_ms']['max']:.0f}",
+    )
+    console.print(table)
+    for error, count in list(summary["errors"].items())[:5]:
+        console.print(f"  [red]{count}x[/red] {error}")
+
+
+# ---------------------------------------------------------------------------
+# wait — convenience wrapper for otto_wait
+# ---------------------------------------------------------------------------
+
+
+@cli.command()
+@click.option("--seconds", "-s", default=5, show_default=True, help="Seconds to wait.")
+@click.option(
+    "--tool",
+    "tool_type",
+    type=click.Choice(["otto", "ppc"]),
+    default="otto",
+    show_default=True,
+)
+@click.pass_context
+def wait(ctx, seconds, tool_type):
+    """Server-side wait (calls otto_wait on the MCP server)."""
+    tool_map = {"otto": "task_management", "ppc": "task"}
+    tool_name = tool_map[tool_type]
+
+    with _client(ctx, fmt="rich") as client:
+        with console.status(f"[bold blue]Waiting {seconds}s...[/bold blue]"):
+            resp = client.call_tool(tool_name, "otto_wait", {})
+    _output(resp, "rich")
+
+
+# ---------------------------------------------------------------------------
+# Playbook execution engine
+# ---------------------------------------------------------------------------
+#
+# A playbook may carry a "steps" list that makes it executable:
+#
+#   {"id": "create", "tool": "business_crud", "op": "create",
+#    "params": {"name": "${inputs.name}", "description": "${suggest.description}"},
+#    "needs": ["suggest"], "wait": "ppc"}
+#
+# "${step.path}" pulls a value out of an earlier step's decoded payload
+# (dotted keys, [n] for list indices); "${inputs.key}" comes from --set.
+# Dependencies are the explicit "needs" plus every step referenced in
+# params. "wait" ("otto"/"ppc") polls a returned task_id to completion.
+
+TEMPLATE_REF = re.compile(r"\$\{([A-Za-z_]\w*)((?:\.[^.}\[]+|\[\d+\])*)\}")
+TASK_TOOLS = {
+    "otto": ("task_management", "get_otto_task_status"),
+    "ppc": ("task", "get_otto_ppc_task_status"),
+}
+
+
+def _step_deps(step: dict) -> set[str]:
+    refs = {
+        m.group(1) for m in TEMPLATE_REF.finditer(json.dumps(step.get("params", {})))
+    }
+    return (set(step.get("needs", [])) | refs) - {"inputs"}
+
+
+def _playbook_levels(steps: list[dict]) -> list[list[str]]:
+    """Topologically sort steps into levels that can run concurrently.
+
+    Raises ValueError for duplicate ids, unknown ``wait`` kinds, unknown
+    dependencies or cycles.
+    """
+    ids = [s.get("id") for s in steps]
+    if None in ids or len(set(ids)) != len(ids):
+        raise ValueError("every step needs a unique 'id'")
+    for step in steps:
+        if step.get("wait") and step["wait"] not in TASK_TOOLS:
+            kinds = ", ".join(sorted(TASK_TOOLS))
+            raise ValueError(
+                f"step {step['id']!r} waits on unknown task kind "
+                f"{step['wait']!r} (expected one of: {kinds})"
+            )
+    deps = {s["id"]: _step_deps(s) for s in steps}
+    for sid, needs in deps.items():
+        unknown = needs - set(ids)
+        if unknown:
+            missing = ", ".join(sorted(unknown))
+            raise ValueError(f"step {sid!r} depends on unknown step(s): {missing}")
+
+    levels, placed = [], set()
+    while len(placed) < len(ids):
+        level = [sid for sid in ids if sid not in placed and deps[sid] <= placed]
+        if not level:
+            stuck = ", ".join(sorted(set(ids) - placed))
+            raise ValueError(f"dependency cycle between steps: {stuck}")
+        levels.append(level)
+        placed.update(level)
+    return levels
+
+
+def _lookup(value, path: str):
+    for key in re.findall(r"\.([^.\[]+)|\[(\d+)\]", path):
+        name, idx = key
+        if idx:
+            value = value[int(idx)]
+        elif isinstance(value, list) and name.isdigit():
+            value = value[int(name)]
+        else:
+            value = value[name]
+    return value
+
+
+def _render_params(params, scope: dict):
+    """Substitute ${step.path} references; a lone reference keeps its type."""
+    if isinstance(params, dict):
+        return {k: _render_params(v, scope) for k, v in params.items()}
+    if isinstance(params, list):
+        return [_render_params(v, scope) for v in params]
+    if not isinstance(params, str):
+        return params
+    whole = TEMPLATE_REF.fullmatch(params)
+    if whole:
+        return _lookup(scope[whole.group(1)], whole.group(2))
+    return TEMPLATE_REF.sub(
+        lambda m: str(_lookup(scope[m.group(1)], m.group(2))), params
+    )
+
+
+def _find_task_id(payload) -> str | None:
+    if isinstance(payload, dict):
+        if payload.get("task_id"):
+            return str(payload["task_id"])
+        for v in payload.values():
+            found = _find_task_id(v)
+            if found:
+                return found
+    elif isinstance(payload, list):
+        for v in payload:
+            found = _find_task_id(v)
+            if found:
+                return found
+    return None
+
+
+async def _run_playbook(
+    client: AsyncMCPClient,
+    steps: list[dict],
+    inputs: dict,
+    on_event,
+    wait_timeout: float = 900,
+) -> list[dict]:
+    """Run playbook steps as a DAG: each starts as soon as its deps succeed.
+
+    Independent steps run concurrently (bounded by the client). A failed step
+    (an error response or any exception it raises) marks everything
+    downstream as skipped. ``on_event(step_id, status,
+    record)`` reports progress. Returns one timing record per step.
+    """
+    by_id = {s["id"]: s for s in steps}
+    deps = {sid: _step_deps(s) for sid, s in by_id.items()}
+    _playbook_levels(steps)  # validate before sending anything
+    scope = {"inputs": inputs}
+    records: dict[str, dict] = {}
+    started = time.perf_counter()
+
+    async def run_step(sid: str) -> dict:
+        step = by_id[sid]
+        rec = {"id": sid, "tool": step["tool"], "op": step["op"]}
+        rec["start_s"] = round(time.perf_counter() - started, 3)
+        on_event(sid, "started", rec)
+        try:
+            params = _render_params(step.get("params", {}), scope)
+        except (KeyError, IndexError, TypeError) as exc:
+            rec.update(status="failed", error=f"Unresolved parameter reference: {exc}")
+            return rec
+        resp = await client.call_tool(step["tool"], step["op"], params)
+        payload = _payload(resp)
+        rec["call_s"] = round(time.perf_counter() - started - rec["start_s"], 3)
+        err = _error_message(resp)
+        if err:
+            rec.update(status="failed", error=err, response=resp)
+            return rec
+
+        task_id = _find_task_id(payload) if step.get("wait") else None
+        if task_id:
+            tool_name, op_name = TASK_TOOLS[step["wait"]]
+            on_event(sid, "waiting", {**rec, "task_id": task_id})
+            polled = (
+                await _poll_tasks(
+                    client, tool_name, op_name, [task_id], wait_timeout, lambda *a: None
+                )
+            )[0]
+            rec["task"] = {
+                k: polled[k] for k in ("task_id", "status", "elapsed_s", "polls")
+            }
+            if polled["status"] not in ("SUCCESS", "COMPLETED"):
+                rec.update(
+                    status="failed", error=f"task {task_id} ended {polled['status']}"
+                )
+                return rec
+        scope[sid] = payload
+        rec.update(status="ok", response=resp)
+        return rec
+
+    pending, ok, broken = set(by_id), set(), set()
+    running: dict[asyncio.Future, str] = {}
+    try:
+        while pending or running:
+            for sid in sorted(pending):
+                if deps[sid] & broken:
+                    pending.discard(sid)
+                    broken.add(sid)
+                    step = by_id[sid]
+                    records[sid] = {
+                        "id": sid,
+                        "tool": step["tool"],
+                        "op": step["op"],
+                        "status": "skipped",
+                    }
+                    on_event(sid, "skipped", records[sid])
+                elif deps[sid] <= ok:
+                    pending.discard(sid)
+                    running[asyncio.ensure_future(run_step(sid))] = sid
+            if not running:
+                continue
+            finished, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for fut in finished:
+                sid = running.pop(fut)
+                try:
+                    rec = fut.result()
+                except Exception as exc:  # any step error fails just that step
+                    step = by_id[sid]
+                    rec = {
+                        "id": sid,
+                        "tool": step["tool"],
+                        "op": step["op"],
+                        "start_s": 0.0,
+                    }
+                    rec.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+                rec["duration_s"] = round(
+                    time.perf_counter() - started - rec["start_s"], 3
+                )
+                records[sid] = rec
+                (ok if rec["status"] == "ok" else broken).add(sid)
+                on_event(sid, rec["status"], rec)
+    finally:
+        # Reached early only when on_event raises or the run is cancelled:
+        # don't leave steps running (and writing) in the background.
+        for fut in running:
+            fut.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    return [records[s["id"]] for s in steps]
+
+
+# ---------------------------------------------------------------------------
+# playbook — summit challenge playbook management
+# ---------------------------------------------------------------------------
+
+
+@cli.group()
+def playbook():
+    """Summit challenge playbooks — 15 ready-to-run marketing workflows."""
+    pass
+
+
+@playbook.command("list")
+def playbook_list():
+    """List all 15 summit challenge playbooks."""
+    playbooks = _load_playbooks()
+
+    from rich.table import Table
+
+    table = Table(
+        title="Summit Challenge Playbooks (15)",
+        show_header=True,
+        expand=True,
+    )
+    table.add_column("#", style="dim", max_width=4)
+    table.add_column("Day", style="yellow", max_width=4)
+    table.add_column("Playbook", style="cyan", ratio=1)
+    table.add_column("Time", max_width=8)
+    table.add_column("Agents", style="dim")
+
+    for i, pb in enumerate(playbooks, 1):
+        table.add_row(
+            str(i),
+            str(pb.get("day", "?")),
+            pb["name"],
+            pb.get("time_estimate", "?"),
+            ", ".join(pb.get("agent_namespaces", [])),
+        )
+
+    console.print(table)
+
+
+@playbook.command("show")
+@click.argument("number", type=int)
 @click.option(
     "--format",
     "fmt",
@@ -664,6 +5124,8 @@ def playbook_show(number, fmt):
         click.echo(json.dumps(pb, indent=2))
         return
 
+    from rich.panel import Panel
+
     console.print(
         Panel(
             f"[bold]{pb['name']}[/bold]\n\n"
@@ -698,19 +5160,100 @@ def playbook_show(number, fmt):
 
 @playbook.command("run")
 @click.argument("number", type=int)
-def playbook_run(number):
+@click.option(
+    "--file",
+    "pb_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=PLAYBOOK_FILE,
+    help="Playbook JSON file (default: the 15 summit playbooks).",
+)
+@click.option("--execute", is_flag=True, help="Run the playbook's executable steps.")
+@click.option(
+    "--set",
+    "assignments",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="Playbook input, referenced in steps as ${inputs.KEY}.",
+)
+@click.option("--yes", "-y", is_flag=True, help="Don't ask before running write ops.")
+@click.option(
+    "--concurrency",
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(1, 64),
+    help="Max steps in flight.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["rich", "json"]),
+    default="rich",
+    show_default=True,
+)
+@click.pass_context
+def playbook_run(ctx, number, pb_file, execute, assignments, yes, concurrency, fmt):
     """Show the MCP tool calls needed to execute a playbook.
 
     Extracts tool references from the playbook instructions and maps them
-    to concrete CLI commands.
+    to concrete CLI commands. Playbooks with a "steps" list also show their
+    dependency graph and can be run unattended with --execute: independent
+    steps run concurrently, outputs feed later steps' params, and async
+    tasks are polled to completion.
+
+    Example:
+      searchatlas playbook run 1 --file examples/ppc_build_playbook.json \\
+        --execute --set website_url=https://example.com --set google_ads_account=89
     """
-    playbooks = _load_playbooks()
+    playbooks = _load_playbooks(pb_file)
     if number < 1 or number > len(playbooks):
         console.print(f"[red]Invalid playbook number. Choose 1-{len(playbooks)}.[/red]")
         sys.exit(1)
 
     pb = playbooks[number - 1]
     instruction = pb.get("instruction", "")
+    steps = pb.get("steps", [])
+
+    levels = []
+    if steps:
+        try:
+            levels = _playbook_levels(steps)
+        except ValueError as exc:
+            console.print(f"[red]Invalid playbook steps:[/red] {exc}")
+            sys.exit(1)
+
+    if execute:
+        if not steps:
+            console.print(
+                f"[red]Playbook #{number} has no executable steps.[/red] "
+                'Add a "steps" list (see examples/ppc_build_playbook.json).'
+            )
+            sys.exit(1)
+        inputs = {}
+        for item in assignments:
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise click.BadParameter(
+                    f"expected KEY=VALUE, got {item!r}", param_hint="--set"
+                )
+            try:
+                inputs[key] = json.loads(value)  # numbers, booleans, JSON objects
+            except json.JSONDecodeError:
+                inputs[key] = value
+        writes = [
+            f"{st['tool']} -> {st['op']}" for st in steps if not _is_read_op(st["op"])
+        ]
+        if writes and not yes:
+            console.print(
+                "[yellow]This playbook makes changes:[/yellow] " + ", ".join(writes)
+            )
+            if not click.confirm("Run it?", err=True):
+                sys.exit(1)
+        _execute_playbook(ctx, pb, steps, inputs, concurrency, fmt)
+        return
+
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    from rich.table import Table
 
     console.print(
         Panel(
@@ -721,9 +5264,29 @@ def playbook_run(number):
     )
     console.print()
 
-    # Extract tool calls from instruction text (pattern: "Use tool_name" or "tool -> op")
-    import re
+    if levels:
+        by_id = {st["id"]: st for st in steps}
+        table = Table(
+            title="Executable steps (same stage runs concurrently)", expand=True
+        )
+        table.add_column("Stage", style="dim", max_width=6)
+        table.add_column("Step", style="cyan")
+        table.add_column("Call")
+        table.add_column("Needs", style="dim")
+        for stage, level in enumerate(levels, 1):
+            for sid in level:
+                st = by_id[sid]
+                table.add_row(
+                    str(stage),
+                    sid,
+                    f"{st['tool']} -> {st['op']}"
+                    + (" [dim](waits)[/dim]" if st.get("wait") else ""),
+                    ", ".join(sorted(_step_deps(st))),
+                )
+        console.print(table)
+        console.print()
 
+    # Extract tool calls from instruction text (pattern: "Use tool_name" or "tool -> op")
     # Find patterns like "tool_name → operation" in instruction text
     arrow_refs = re.findall(r"(\w+)\s*(?:→|->)\s*(\w+)", instruction)
 
@@ -740,220 +5303,1666 @@ def playbook_run(number):
     console.print(Markdown(instruction))
 
 
+def _execute_playbook(
+    ctx, pb: dict, steps: list, inputs: dict, concurrency: int, fmt: str
+):
+    def on_event(sid, state, rec):
+        if fmt != "rich":
+            return
+        colour = {"ok": "green", "failed": "red", "skipped": "yellow"}.get(
+            state, "blue"
+        )
+        extra = f" task {rec['task_id']}" if state == "waiting" else ""
+        if state == "failed":
+            extra = f" — {str(rec.get('error', ''))[:100]}"
+        console.print(
+            f"[dim]{time.strftime('%H:%M:%S')}[/dim] [cyan]{sid}[/cyan] [{colour}]{state}[/{colour}]{extra}"
+        )
+
+    async def run():
+        async with _async_client(ctx, concurrency) as client:
+            return await _run_playbook(client, steps, inputs, on_event)
+
+    started = time.perf_counter()
+    records = asyncio.run(run())
+    wall = time.perf_counter() - started
+
+    if fmt == "json":
+        click.echo(
+            json.dumps(
+                {"playbook": pb["name"], "wall_s": round(wall, 3), "steps": records},
+                indent=2,
+            )
+        )
+    else:
+        from rich.table import Table
+
+        table = Table(title=f"{pb['name']} — run summary", expand=True)
+        table.add_column("Step", style="cyan")
+        table.add_column("Call")
+        table.add_column("Status")
+        table.add_column("Start", justify="right")
+        table.add_column("Duration", justify="right")
+        for rec in records:
+            colour = {"ok": "green", "failed": "red"}.get(rec["status"], "yellow")
+            table.add_row(
+                rec["id"],
+                f"{rec['tool']} -> {rec['op']}",
+                f"[{colour}]{rec['status']}[/{colour}]",
+                f"{rec['start_s']:.1f}s" if "start_s" in rec else "",
+                f"{rec['duration_s']:.1f}s" if "duration_s" in rec else "",
+            )
+        console.print(table)
+        serial = sum(rec.get("duration_s", 0) for rec in records)
+        console.print(
+            f"[dim]Wall time {wall:.1f}s (steps sum to {serial:.1f}s sequentially)[/dim]"
+        )
+    if any(rec["status"] != "ok" for rec in records):
+        sys.exit(1)
+
+
 # ---------------------------------------------------------------------------
 # Convenience category commands
 # ---------------------------------------------------------------------------
 
 
+class _OpGroup(click.Group):
+    """A category command with subcommands of its own.
+
+    Anything that is not a subcommand (an op, a tool, an option) goes to
+    the hidden ``call`` subcommand, so ``geo get_visibility_trend`` keeps
+    working next to ``geo sync``.
+    """
+
+    def parse_args(self, ctx, args):
+        if not args or (
+            args[0] not in self.commands and args[0] not in ctx.help_option_names
+        ):
+            args = ["call", *args]
+        return super().parse_args(ctx, args)
+
+
+def _invoke_category(
+    ctx,
+    category: str,
+    target: tuple[str, ...],
+    default_tool: str,
+    default_op: str,
+    params: dict,
+    fmt: str,
+    fields: list[str] | None,
+) -> None:
+    """Run ``[TOOL] [OPERATION]`` for a category command.
+
+    With both, the call goes exactly where asked. With just an op, the tool
+    comes from the routing index (see ``_route``), so no guess costs a
+    round trip; with neither, the command's default tool and op are used.
+    """
+    if len(target) > 2:
+        raise click.UsageError("Expected at most TOOL and OPERATION.")
+    if len(target) == 2:
+        tool, op = target
+    elif not target:
+        tool, op = default_tool, default_op
+    else:
+        op = target[0]
+        tool, error = _route(ctx, category, op, default_tool, fmt)
+        if error:
+            _output(error, fmt)
+            sys.exit(1)
+    _invoke(ctx, tool, op, params, fmt, fields)
+
+
 @cli.command("brand")
-@click.argument("operation", default="list_brand_vaults")
+@click.argument("target", nargs=-1, metavar="[TOOL] [OPERATION]")
 @click.option("--params", "-p", default="{}", help="JSON params.")
 @click.option("--hostname", "-h", default=None, help="Shortcut: set hostname param.")
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["rich", "json"]),
+    type=click.Choice(["rich", "json", "ndjson"]),
     default="rich",
     show_default=True,
 )
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
 @click.pass_context
-def brand(ctx, operation, params, hostname, fmt):
+def brand(ctx, target, params, hostname, fmt, fields):
     """Brand Vault operations.
 
     Common ops: list_brand_vaults, retrieve_brand_vault_details,
     get_brand_vault_overview, get_brand_vault_business_info,
     ask_brand_vault, update_brand_vault, get_knowledge_graph
     """
-    params_dict = json.loads(params)
+    params_dict = _parse_params(params)
     if hostname:
         params_dict["hostname"] = hostname
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]brand_vault -> {operation}...[/bold blue]"):
-            resp = client.call_tool("brand_vault", operation, params_dict)
-    _output(resp, fmt)
+    _invoke_category(
+        ctx,
+        "brand",
+        target,
+        "brand_vault",
+        "list_brand_vaults",
+        params_dict,
+        fmt,
+        fields,
+    )
+
+
+@cli.group("otto", cls=_OpGroup)
+def otto():
+    """OTTO SEO operations.
+
+    `otto [TOOL] [OPERATION]` calls the server (see `otto call --help`);
+    `otto issues sync` mirrors seo_analysis issues locally and `otto issues
+    query` answers triage questions from the mirror.
+    """
 
 
-@cli.command("otto")
-@click.argument("tool", default="project_management")
-@click.argument("operation", default="list_otto_projects")
+@otto.command("call", hidden=True)
+@click.argument("target", nargs=-1, metavar="[TOOL] [OPERATION]")
 @click.option("--params", "-p", default="{}", help="JSON params.")
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["rich", "json"]),
+    type=click.Choice(["rich", "json", "ndjson"]),
     default="rich",
     show_default=True,
 )
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
 @click.pass_context
-def otto(ctx, tool, operation, params, fmt):
+def otto_call(ctx, target, params, fmt, fields):
     """OTTO SEO operations.
 
+    Give just the op (e.g. `otto get_project_issues_summary`) and the tool
+    is looked up in the registry; or name it: `otto TOOL OPERATION`.
+
     Tools: project_management, seo_analysis, audit_management,
     schema_markup, indexing_management, wildfire, seo_deployment,
     suggestion_management, recrawl_management, knowledge_graph
     """
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]{tool} -> {operation}...[/bold blue]"):
-            resp = client.call_tool(tool, operation, json.loads(params))
-    _output(resp, fmt)
+    _invoke_category(
+        ctx,
+        "otto",
+        target,
+        "project_management",
+        "list_otto_projects",
+        _parse_params(params),
+        fmt,
+        fields,
+    )
+
+
+@cli.group("geo", cls=_OpGroup)
+def geo():
+    """LLM Visibility / GEO operations.
+
+    `geo [TOOL] [OPERATION]` calls the server (see `geo call --help`);
+    `geo sync` pulls trend data points into a local store and `geo query`
+    aggregates them without a network call.
+    """
 
 
-@cli.command("geo")
-@click.argument("operation", default="get_brand_overview")
+@geo.command("call", hidden=True)
+@click.argument("target", nargs=-1, metavar="[TOOL] [OPERATION]")
 @click.option("--params", "-p", default="{}", help="JSON params.")
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["rich", "json"]),
+    type=click.Choice(["rich", "json", "ndjson"]),
     default="rich",
     show_default=True,
 )
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
 @click.pass_context
-def geo(ctx, operation, params, fmt):
+def geo_call(ctx, target, params, fmt, fields):
     """LLM Visibility / GEO operations.
 
+    The owning tool (visibility, sentiment, citations, prompt_simulator,
+    topics, queries) is looked up in the registry from the op.
+
     Common ops: get_brand_overview, get_visibility_trend,
     get_competitor_share_of_voice, get_sentiment_overview,
     get_citations_overview, submit_prompts, list_topics, list_queries
     """
-    # Route to the right tool based on operation name
-    op_tool_map = {
-        "get_brand_overview": "visibility",
-        "get_visibility_trend": "visibility",
-        "get_competitor_share_of_voice": "visibility",
-        "get_competitor_visibility_rank": "visibility",
-        "get_competitor_visibility_trend": "visibility",
-        "get_queries_overview": "visibility",
-        "get_topics_overview": "visibility",
-        "get_sentiment_overview": "sentiment",
-        "get_sentiment_trend": "sentiment",
-        "get_citations_overview": "citations",
-        "get_citations_urls": "citations",
-        "submit_prompts": "prompt_simulator",
-        "list_prompt_analyses": "prompt_simulator",
-        "get_prompt_analysis": "prompt_simulator",
-        "check_ps_status": "prompt_simulator",
-        "get_ps_responses": "prompt_simulator",
-        "get_ps_summary": "prompt_simulator",
-        "get_ps_visibility": "prompt_simulator",
-        "add_topic": "topics",
-        "list_topics": "topics",
-        "remove_topic": "topics",
-        "add_query": "queries",
-        "list_queries": "queries",
-        "remove_query": "queries",
-    }
-    tool_name = op_tool_map.get(operation, "visibility")
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]{tool_name} -> {operation}...[/bold blue]"):
-            resp = client.call_tool(tool_name, operation, json.loads(params))
-    _output(resp, fmt)
+    _invoke_category(
+        ctx,
+        "geo",
+        target,
+        "visibility",
+        "get_brand_overview",
+        _parse_params(params),
+        fmt,
+        fields,
+    )
 
 
 @cli.command("gbp")
-@click.argument("tool", default="gbp_locations_crud")
-@click.argument("operation", default="list_locations")
+@click.argument("target", nargs=-1, metavar="[TOOL] [OPERATION]")
 @click.option("--params", "-p", default="{}", help="JSON params.")
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["rich", "json"]),
+    type=click.Choice(["rich", "json", "ndjson"]),
     default="rich",
     show_default=True,
 )
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
 @click.pass_context
-def gbp(ctx, tool, operation, params, fmt):
+def gbp(ctx, target, params, fmt, fields):
     """Google Business Profile operations.
 
+    Give just the op, or `gbp TOOL OPERATION`.
+
     Tools: gbp_locations_crud, gbp_locations_deployment,
     gbp_locations_recommendations, posts_crud, posts_generation,
     posts_automation, reviews, connections
     """
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]{tool} -> {operation}...[/bold blue]"):
-            resp = client.call_tool(tool, operation, json.loads(params))
-    _output(resp, fmt)
+    _invoke_category(
+        ctx,
+        "gbp",
+        target,
+        "gbp_locations_crud",
+        "list_locations",
+        _parse_params(params),
+        fmt,
+        fields,
+    )
 
 
 @cli.command("ppc")
-@click.argument("tool", default="business_crud")
-@click.argument("operation", default="list_all")
+@click.argument("target", nargs=-1, metavar="[TOOL] [OPERATION]")
 @click.option("--params", "-p", default="{}", help="JSON params.")
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["rich", "json"]),
+    type=click.Choice(["rich", "json", "ndjson"]),
     default="rich",
     show_default=True,
 )
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
 @click.pass_context
-def ppc(ctx, tool, operation, params, fmt):
+def ppc(ctx, target, params, fmt, fields):
     """PPC / Google Ads operations.
 
+    Give just the op, or `ppc TOOL OPERATION`.
+
     Tools: business_crud, business_mgmt, campaign, product_crud,
     product_mgmt, ads_account_crud, ads_account_mgmt, ad_group,
     ad_content, keyword_cluster, keyword
     """
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]{tool} -> {operation}...[/bold blue]"):
-            resp = client.call_tool(tool, operation, json.loads(params))
-    _output(resp, fmt)
+    _invoke_category(
+        ctx,
+        "ppc",
+        target,
+        "business_crud",
+        "list_all",
+        _parse_params(params),
+        fmt,
+        fields,
+    )
 
 
 @cli.command("site")
-@click.argument("tool", default="projects")
-@click.argument("operation", default="list_sites")
+@click.argument("target", nargs=-1, metavar="[TOOL] [OPERATION]")
 @click.option("--params", "-p", default="{}", help="JSON params.")
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["rich", "json"]),
+    type=click.Choice(["rich", "json", "ndjson"]),
     default="rich",
     show_default=True,
 )
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
 @click.pass_context
-def site(ctx, tool, operation, params, fmt):
+def site(ctx, target, params, fmt, fields):
     """Site Explorer operations.
 
+    Give just the op, or `site TOOL OPERATION`.
+
     Tools: organic, backlinks, analysis, adwords, brand_signals,
     keyword_research, projects, holistic_audit
     """
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]{tool} -> {operation}...[/bold blue]"):
-            resp = client.call_tool(tool, operation, json.loads(params))
-    _output(resp, fmt)
+    _invoke_category(
+        ctx,
+        "site",
+        target,
+        "projects",
+        "list_sites",
+        _parse_params(params),
+        fmt,
+        fields,
+    )
 
 
 @cli.command("content")
-@click.argument("tool", default="content_generation")
-@click.argument("operation", default="topic_suggestions")
+@click.argument("target", nargs=-1, metavar="[TOOL] [OPERATION]")
 @click.option("--params", "-p", default="{}", help="JSON params.")
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["rich", "json"]),
+    type=click.Choice(["rich", "json", "ndjson"]),
     default="rich",
     show_default=True,
 )
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
 @click.pass_context
-def content_cmd(ctx, tool, operation, params, fmt):
+def content_cmd(ctx, target, params, fmt, fields):
     """Content Genius operations.
 
+    Give just the op, or `content TOOL OPERATION`.
+
     Tools: content_generation, article_management, dkn,
     content_retrieval, content_publication, folder_management,
     topical_maps
     """
-    key = _get_api_key(ctx.obj["api_key"])
-    with MCPClient(key) as client:
-        with console.status(f"[bold blue]{tool} -> {operation}...[/bold blue]"):
-            resp = client.call_tool(tool, operation, json.loads(params))
-    _output(resp, fmt)
+    _invoke_category(
+        ctx,
+        "content",
+        target,
+        "content_generation",
+        "topic_suggestions",
+        _parse_params(params),
+        fmt,
+        fields,
+    )
+
+
+@cli.group("gsc", cls=_OpGroup)
+def gsc():
+    """Google Search Console operations.
+
+    `gsc [TOOL] [OPERATION]` calls the server (see `gsc call --help`);
+    `gsc export` pulls long date ranges in chunks to a compressed file.
+    """
+
+
+@gsc.command("call", hidden=True)
+@click.argument("target", nargs=-1, metavar="[TOOL] [OPERATION]")
+@click.option("--params", "-p", default="{}", help="JSON params.")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["rich", "json", "ndjson"]),
+    default="rich",
+    show_default=True,
+)
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths to keep per record (e.g. id,url,meta.score).",
+)
+@click.pass_context
+def gsc_call(ctx, target, params, fmt, fields):
+    """Google Search Console operations.
+
+    Give just the op, or `gsc TOOL OPERATION`.
+
+    Tools: GSC_Performance_Tool, GSC_Site_Events_Tool
+    """
+    _invoke_category(
+        ctx,
+        "gsc",
+        target,
+        "GSC_Performance_Tool",
+        "get_gsc_sites",
+        _parse_params(params),
+        fmt,
+        fields,
+    )
+
+
+# ---------------------------------------------------------------------------
+# geo sync / geo query — local GEO time-series store
+# ---------------------------------------------------------------------------
+
+GEO_STORE_FILE = CACHE_DIR / "geo.sqlite"
+GEO_SYNC_OPS = (
+    "get_visibility_trend",
+    "get_sentiment_trend",
+    "get_competitor_visibility_trend",
+    "get_competitor_share_of_voice",
+)
+# Params that make a trend op return only points from a date on; the first
+# one the op's cached schema lists is used for incremental syncs.
+SINCE_PARAMS = ("start_date", "date_from", "from_date", "since", "start")
+DATE_KEYS = ("date", "day", "week", "period", "timestamp", "ts", "time")
+# String fields that tell series apart; "brand_name" etc. count as "brand".
+LABEL_KEYS = ("competitor", "domain", "brand", "topic", "query", "model")
+_ISO_TIME = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:[T ](\d{2}:\d{2}(?::\d{2})?))?")
+
+
+def _point_time(value) -> str | None:
+    """A date-ish value as ``YYYY-MM-DD`` or ``YYYY-MM-DD HH:MM:SS``."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if value > 1e11:  # epoch milliseconds
+            value /= 1000
+        value = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(value))
+    m = _ISO_TIME.match(value) if isinstance(value, str) else None
+    if not m:
+        return None
+    day, clock = m.groups()
+    if clock and len(clock) == 5:
+        clock += ":00"
+    return day if clock in (None, "00:00:00") else f"{day} {clock}"
+
+
+def _flatten(record: dict, prefix: str = "") -> dict:
+    out = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            out.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            out[f"{prefix}{key}"] = value
+    return out
+
+
+def _field_kind(key: str) -> str | None:
+    """``"id"``, ``"label"`` or None for a flattened record field name."""
+    name = key.rsplit(".", 1)[-1].lower()
+    if name in ("id", "uuid", "pk") or name.endswith(("_id", "_uuid", "_ids")):
+        return "id"
+    if name.split("_", 1)[0] in LABEL_KEYS:
+        return "label"
+    return None
+
+
+def _trend_points(payload, today: str) -> list[tuple[str, str, str, float]]:
+    """``(metric, label, ts, value)`` for every number in a trend payload.
+
+    Each record's first date field (``date``, ``week``, ...) is its time;
+    records without one are a snapshot taken ``today``. String fields named
+    after a LABEL_KEYS dimension label the series
+    (``competitor=example.com``); other numbers are metrics, except id-like
+    fields (``id``, ``*_id``). Nested lists of records
+    (``{"trend": [...], ...}``) are walked, tagged with their key.
+    """
+    points = []
+
+    def walk(node, tags: dict) -> None:
+        if isinstance(node, list):
+            for item in node:
+                walk(item, tags)
+            return
+        if not isinstance(node, dict):
+            return
+        nested = {
+            k: v
+            for k, v in node.items()
+            if isinstance(v, list) and any(isinstance(i, dict) for i in v)
+        }
+        flat = _flatten({k: v for k, v in node.items() if k not in nested})
+        ts = next((t for k in DATE_KEYS if (t := _point_time(flat.pop(k, None)))), None)
+        labels = dict(tags)
+        metrics = {}
+        for key, value in flat.items():
+            kind = _field_kind(key)
+            if isinstance(value, bool) or value is None or kind == "id":
+                continue
+            if isinstance(value, (int, float)):
+                metrics[key] = float(value)
+            elif isinstance(value, str) and kind == "label":
+                labels[key] = value
+        label = ", ".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        for metric, value in metrics.items():
+            points.append((metric, label, ts or today, value))
+        for key, value in nested.items():
+            walk(value, {**labels, "series": key} if len(nested) > 1 else labels)
+
+    walk(payload, {})
+    return points
+
+
+class TrendStore:
+    """SQLite store of trend data points, one row per point.
+
+    Rows are keyed (series, metric, label, ts) in a WITHOUT ROWID table,
+    so one metric of one series is stored contiguously in time order: a
+    query reads a single index range and computes rolling averages and
+    deltas with window functions inside SQLite. A series is one op with
+    one set of scope params.
+    """
+
+    def __init__(self, path: Path = GEO_STORE_FILE):
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS series ("
+            " id INTEGER PRIMARY KEY, tool TEXT NOT NULL, op TEXT NOT NULL,"
+            " scope TEXT NOT NULL, last_ts TEXT, synced_at REAL,"
+            " UNIQUE (op, scope));"
+            "CREATE TABLE IF NOT EXISTS points ("
+            " series INTEGER NOT NULL, metric TEXT NOT NULL, label TEXT NOT NULL,"
+            " ts TEXT NOT NULL, value REAL NOT NULL,"
+            " PRIMARY KEY (series, metric, label, ts)) WITHOUT ROWID;"
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    @staticmethod
+    def scope(params: dict) -> str:
+        return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+    def last_ts(self, op: str, scope: str) -> str | None:
+        row = self._db.execute(
+            "SELECT last_ts FROM series WHERE op = ? AND scope = ?", (op, scope)
+        ).fetchone()
+        return row[0] if row else None
+
+    def add(self, tool: str, op: str, scope: str, points: list) -> int:
+        """Upsert points for a series; returns how many were new."""
+        with self._db:
+            self._db.execute(
+                "INSERT INTO series (tool, op, scope, synced_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (op, scope) DO UPDATE SET tool = excluded.tool,"
+                " synced_at = excluded.synced_at",
+                (tool, op, scope, time.time()),
+            )
+            (series,) = self._db.execute(
+                "SELECT id FROM series WHERE op = ? AND scope = ?", (op, scope)
+            ).fetchone()
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO points VALUES (?, ?, ?, ?, ?)",
+                [(series, *point) for point in points],
+            )
+            new = self._db.total_changes - before
+            # Re-sent points (the overlap of an incremental sync) may be revised.
+            self._db.executemany(
+                "UPDATE points SET value = ? WHERE series = ? AND metric = ?"
+                " AND label = ? AND ts = ? AND value != ?",
+                [(v, series, m, lbl, ts, v) for m, lbl, ts, v in points],
+            )
+            self._db.execute(
+                "UPDATE series SET last_ts ="
+                " (SELECT MAX(ts) FROM points WHERE series = ?) WHERE id = ?",
+                (series, series),
+            )
+        return new
+
+    def inventory(self) -> list[dict]:
+        cur = self._db.execute(
+            "SELECT s.op, s.scope, p.metric, p.label, COUNT(*), MIN(p.ts),"
+            " MAX(p.ts), s.synced_at FROM points p JOIN series s ON s.id = p.series"
+            " GROUP BY p.series, p.metric, p.label ORDER BY s.op, s.scope, p.metric,"
+            " p.label"
+        )
+        keys = ("op", "scope", "metric", "label", "points", "first", "last")
+        return [
+            {
+                **dict(zip(keys, row)),
+                "synced_at": time.strftime("%Y-%m-%d %H:%M", time.localtime(row[7])),
+            }
+            for row in cur
+        ]
+
+    def query(
+        self,
+        metric: str,
+        op: str | None = None,
+        label: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        window: int = 7,
+        vs: str | None = None,
+    ) -> list[dict]:
+        """Points of ``metric`` with rolling average, change and WoW columns.
+
+        ``rolling_avg`` averages the last ``window`` points of the series,
+        ``change`` is the difference to the previous point, ``wow_pct`` the
+        change against the point exactly 7 days earlier and ``vs_delta``
+        the difference to the ``vs`` label (e.g. a competitor) at the same
+        time. Windows look back past ``since``, so the first rows returned
+        are complete.
+        """
+        where, args = ["p.metric = :metric"], {"metric": metric, "vs": vs}
+        if op:
+            where.append("s.op = :op")
+            args["op"] = op
+        if label:
+            where.append("p.label LIKE :label")
+            args["label"] = f"%{label}%"
+        outer, bounds = [], {"since": (">=", since), "until": ("<=", until)}
+        for name, (cmp, value) in bounds.items():
+            if value:
+                outer.append(f"ts {cmp} :{name}")
+                args[name] = value
+        sql = f"""
+            SELECT op, scope, label, ts, value, rolling_avg, change,
+                CASE WHEN week_ago THEN (value - week_ago) * 100.0 / ABS(week_ago)
+                END AS wow_pct, vs_delta
+            FROM (
+                SELECT s.op, s.scope, p.label, p.ts, p.value,
+                    AVG(p.value) OVER (
+                        PARTITION BY p.series, p.label ORDER BY p.ts
+                        ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW
+                    ) AS rolling_avg,
+                    p.value - LAG(p.value) OVER (
+                        PARTITION BY p.series, p.label ORDER BY p.ts
+                    ) AS change,
+                    (SELECT w.value FROM points w WHERE w.series = p.series
+                        AND w.metric = p.metric AND w.label = p.label
+                        AND w.ts = CASE WHEN length(p.ts) = 10
+                            THEN date(p.ts, '-7 days')
+                            ELSE datetime(p.ts, '-7 days') END) AS week_ago,
+                    p.value - (SELECT v.value FROM points v
+                        WHERE v.series = p.series AND v.metric = p.metric
+                        AND v.label = :vs AND v.ts = p.ts) AS vs_delta
+                FROM points p JOIN series s ON s.id = p.series
+                WHERE {" AND ".join(where)}
+            ){" WHERE " + " AND ".join(outer) if outer else ""}
+            ORDER BY op, scope, label, ts
+        """
+        keys = ("op", "scope", "label", "ts", "value")
+        keys += ("rolling_avg", "change", "wow_pct", "vs_delta")
+        rows = []
+        for row in self._db.execute(sql, args):
+            record = dict(zip(keys, row))
+            if vs is None:
+                del record["vs_delta"]
+            rows.append(record)
+        return rows
+
+
+def _print_rows(
+    rows: list[dict], fmt: str, title: str, empty: str = "no rows."
+) -> None:
+    """Print flat records as a rich table, a JSON array or NDJSON."""
+    if fmt == "json":
+        click.echo(json.dumps(rows, indent=2, default=str))
+        return
+    if fmt == "ndjson":
+        for row in rows:
+            click.echo(json.dumps(row, default=str))
+        return
+    if not rows:
+        console.print(f"[dim]{title}: {empty}[/dim]")
+        return
+    from rich.table import Table
+
+    table = Table(title=title, show_header=True)
+    for key in rows[0]:
+        numeric = isinstance(rows[0][key], (int, float))
+        table.add_column(key, justify="right" if numeric else "left")
+    for row in rows:
+        table.add_row(
+            *(
+                f"{v:.4g}" if isinstance(v, float) else "" if v is None else str(v)
+                for v in row.values()
+            )
+        )
+    console.print(table)
+
+
+@geo.command("sync")
+@click.argument("ops", nargs=-1, metavar="[OPERATION]...")
+@click.option(
+    "--params",
+    "-p",
+    default="{}",
+    help="JSON params identifying the series (e.g. hostname, project).",
+)
+@click.option(
+    "--since-param",
+    default=None,
+    help="Param that makes the op return points from a date on "
+    "(default: the first of start_date, date_from, ... in its cached schema).",
+)
+@click.option("--full", is_flag=True, help="Re-pull whole trends.")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["rich", "json", "ndjson"]),
+    default="rich",
+    show_default=True,
+)
+@click.pass_context
+def geo_sync(ctx, ops, params, since_param, full, fmt):
+    """Pull new trend data points into the local GEO store.
+
+    Default ops: get_visibility_trend, get_sentiment_trend,
+    get_competitor_visibility_trend, get_competitor_share_of_voice. After
+    the first sync, ops whose schema takes a start date only fetch from the
+    last stored point on; snapshot ops (no dates) add one point per sync.
+
+    \b
+      searchatlas geo sync -p '{"hostname": "example.com"}'
+      searchatlas geo sync get_sentiment_trend -p '{"hostname": "example.com"}'
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    base = _parse_params(params)
+    scope = TrendStore.scope(base)
+    today = time.strftime("%Y-%m-%d")
+    store = TrendStore()
+    try:
+        plans, results = [], []
+        for op in ops or GEO_SYNC_OPS:
+            tool, error = _route(ctx, "geo", op, "visibility", fmt)
+            row = {"op": op, "tool": tool, "since": None, "fetched": 0, "new": 0}
+            if error:
+                results.append({**row, "error": _error_message(error)})
+                continue
+            call_params = dict(base)
+            last = None if full else store.last_ts(op, scope)
+            param = since_param or _schema_param(tool, op, SINCE_PARAMS, None)
+            if last and param and param not in base:
+                row["since"] = call_params[param] = last[:10]
+            invalid = not ctx.obj.get("no_validate") and _validate_params(
+                tool, op, call_params
+            )
+            if invalid:
+                results.append({**row, "error": _error_message(invalid)})
+                continue
+            plans.append((row, call_params))
+
+        with _client(ctx) as client:
+
+            def fetch(plan):
+                row, call_params = plan
+                return (
+                    row,
+                    call_params,
+                    client.call_tool(row["tool"], row["op"], call_params),
+                )
+
+            with ThreadPoolExecutor(max_workers=max(1, len(plans))) as pool:
+                for row, call_params, resp in pool.map(fetch, plans):
+                    _learn_schema(row["tool"], row["op"], resp, call_params)
+                    msg = _error_message(resp)
+                    if msg is not None:
+                        results.append({**row, "error": msg})
+                        continue
+                    points = _trend_points(_payload(resp), today)
+                    row["fetched"] = len(points)
+                    row["new"] = store.add(row["tool"], row["op"], scope, points)
+                    row["last"] = store.last_ts(row["op"], scope)
+                    results.append(row)
+    finally:
+        store.close()
+
+    _print_rows(results, fmt, f"GEO sync → {GEO_STORE_FILE}")
+    if any("error" in row for row in results):
+        sys.exit(1)
+
+
+@geo.command("query")
+@click.argument("metric", required=False)
+@click.option("--op", default=None, help="Only series from this op.")
+@click.option(
+    "--label", default=None, help="Only labels containing this (e.g. a competitor)."
+)
+@click.option("--since", default=None, help="First date to return (YYYY-MM-DD).")
+@click.option("--until", default=None, help="Last date to return (YYYY-MM-DD).")
+@click.option(
+    "--window",
+    default=7,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Points in the rolling average.",
+)
+@click.option(
+    "--vs",
+    default=None,
+    help="Label to diff every row against at the same time (vs_delta), "
+    "e.g. your own brand's label for competitor deltas.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["rich", "json", "ndjson"]),
+    default="rich",
+    show_default=True,
+)
+def geo_query(metric, op, label, since, until, window, vs, fmt):
+    """Aggregate locally stored GEO trends; no network call.
+
+    Without METRIC, lists what the store holds (ops, metrics, labels and
+    date ranges). With one, returns its points with a rolling average,
+    change from the previous point and week-over-week change.
+
+    \b
+      searchatlas geo query
+      searchatlas geo query visibility --since 2026-01-01 --window 4
+      searchatlas geo query share --op get_competitor_share_of_voice \\
+        --vs "domain=example.com" --format json
+    """
+    if not GEO_STORE_FILE.exists():
+        raise click.ClickException("No GEO store yet; run `geo sync` first.")
+    store = TrendStore()
+    try:
+        if metric is None:
+            rows = store.inventory()
+            title = "GEO store"
+        else:
+            rows = store.query(metric, op, label, since, until, window, vs)
+            title = f"{metric} (rolling {window})"
+    finally:
+        store.close()
+    _print_rows(rows, fmt, title, "nothing stored yet — run `geo sync`.")
+
+
+# ---------------------------------------------------------------------------
+# gsc export — chunked Search Console performance export
+# ---------------------------------------------------------------------------
+
+GSC_TOOL = "GSC_Performance_Tool"
+GSC_EXPORT_OPS = {"query": "get_keyword_performance", "page": "get_page_performance"}
+GSC_DATE_PARAMS = (
+    ("start_date", "end_date"),
+    ("date_from", "date_to"),
+    ("start", "end"),
+)
+GSC_SITE_PARAMS = ("site_url", "site", "property", "property_url", "hostname", "domain")
+GSC_HISTORY_DAYS = 486  # Search Console keeps 16 months
+EXPORT_META = ("site", "dimension", "start_date", "end_date")
+EXPORT_SUFFIXES = (".csv.gz", ".ndjson.gz", ".jsonl.gz", ".parquet")
+
+
+def _export_path(output: Path, part: str) -> Path:
+    """``perf.csv.gz`` -> ``perf.query.csv.gz``."""
+    suffix = next(x for x in EXPORT_SUFFIXES if output.name.lower().endswith(x))
+    return output.with_name(f"{output.name[: -len(suffix)]}.{part}{suffix}")
+
+
+class _ExportWriter:
+    """Append row batches to ``.csv.gz``, ``.ndjson.gz`` or ``.parquet``.
+
+    Output goes to ``PATH.part`` and is renamed once complete, so a failed
+    or half-written export never looks finished. CSV and Parquet columns
+    are fixed by the first batch (later unknown fields are dropped with a
+    warning); Parquet writes one row group per batch and needs pyarrow.
+    """
+
+    def __init__(self, path: Path):
+        name = path.name.lower()
+        if name.endswith(".parquet"):
+            import importlib.util
+
+            if importlib.util.find_spec("pyarrow") is None:
+                raise click.ClickException(
+                    "Parquet output needs pyarrow (`pip install pyarrow`); "
+                    "or write .csv.gz / .ndjson.gz."
+                )
+            self.kind = "parquet"
+        elif name.endswith(EXPORT_SUFFIXES):
+            self.kind = "csv" if name.endswith(".csv.gz") else "ndjson"
+        else:
+            raise click.BadParameter(
+                f"use a {', '.join(EXPORT_SUFFIXES)} file name", param_hint="OUTPUT"
+            )
+        self.path = path
+        self.part = path.with_name(path.name + ".part")
+        self.columns: list[str] | None = None
+        self._dropped: set[str] = set()
+        self._fh = self._csv = self._parquet = None
+        if self.kind != "parquet":
+            import gzip
+
+            self._fh = gzip.open(self.part, "wt", newline="", encoding="utf-8")
+
+    def write(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        if self.kind == "ndjson":
+            self._fh.writelines(json.dumps(r, default=str) + "\n" for r in rows)
+            return
+        if self.columns is None:
+            self.columns = list(dict.fromkeys(k for r in rows for k in r))
+            self._open_columnar(rows)
+        extra = {k for r in rows for k in r} - set(self.columns) - self._dropped
+        if extra:
+            log.warning("Dropping fields not in the first chunk: %s", ", ".join(extra))
+            self._dropped |= extra
+        if self.kind == "csv":
+            self._csv.writerows(rows)
+            return
+        import pyarrow as pa
+
+        text = {k for k, t in self._types if t == pa.string()}
+        rows = [
+            {
+                k: str(v) if k in text and v is not None else v
+                for k, v in ((k, r.get(k)) for k in self.columns)
+            }
+            for r in rows
+        ]
+        self._parquet.write_table(
+            pa.Table.from_pylist(rows, schema=self._parquet.schema)
+        )
+
+    def _open_columnar(self, rows: list[dict]) -> None:
+        if self.kind == "csv":
+            import csv
+
+            self._csv = csv.DictWriter(
+                self._fh, self.columns, extrasaction="ignore", restval=""
+            )
+            self._csv.writeheader()
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        def column_type(key: str):
+            values = [r[key] for r in rows if r.get(key) is not None]
+            numeric = values and all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+            )
+            return pa.float64() if numeric else pa.string()
+
+        self._types = [(k, column_type(k)) for k in self.columns]
+        self._parquet = pq.ParquetWriter(
+            str(self.part), pa.schema(self._types), compression="zstd"
+        )
+
+    def close(self, complete: bool = True) -> None:
+        """Finish the file; an incomplete export stays at ``PATH.part``."""
+        if self._parquet is not None:
+            self._parquet.close()
+        elif self.kind == "parquet":
+            return  # nothing was written
+        if self._fh is not None:
+            self._fh.close()
+        if complete:
+            os.replace(self.part, self.path)
+
+
+def _date_chunks(start, end, days: int):
+    """Consecutive, non-overlapping ``(first, last)`` date windows."""
+    import datetime as dt
+
+    while start <= end:
+        last = min(end, start + dt.timedelta(days=days - 1))
+        yield start, last
+        start = last + dt.timedelta(days=1)
+
+
+def _chunk_params(chunk: dict) -> dict:
+    start_param, end_param = chunk["date_params"]
+    return {
+        **chunk["params"],
+        start_param: str(chunk["start"]),
+        end_param: str(chunk["end"]),
+    }
+
+
+def _should_split(exc: Exception) -> bool:
+    """Did a chunk fail the way a smaller chunk might not (timeout, 5xx)?"""
+    if isinstance(exc, RuntimeError):
+        return _classify_error({"error": {"message": str(exc)}}) == "retryable"
+    return _is_transient_http(exc)
+
+
+def _chunk_rows(chunk: dict, records: list) -> tuple[list[dict], int]:
+    """Flattened rows of one chunk tagged with it, minus duplicates.
+
+    Duplicates are rows repeated across pages of the chunk and dated rows
+    outside its window (the neighbouring chunk owns those), so the seen
+    set never outgrows one chunk.
+    """
+    rows, seen, dropped = [], set(), 0
+    first, last = str(chunk["start"]), str(chunk["end"])
+    for record in records:
+        flat = _flatten(record) if isinstance(record, dict) else {"value": record}
+        when = next(
+            (t for k in DATE_KEYS if k in flat and (t := _point_time(flat[k]))), None
+        )
+        key = json.dumps(flat, sort_keys=True, default=str)
+        if key in seen or (when and not first <= when[:10] <= last):
+            dropped += 1
+            continue
+        seen.add(key)
+        rows.append(
+            {
+                "site": chunk["site"],
+                "dimension": chunk["dimension"],
+                "start_date": first,
+                "end_date": last,
+                **{k: v for k, v in flat.items() if k not in EXPORT_META},
+            }
+        )
+    return rows, dropped
+
+
+@gsc.command("export")
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@click.option(
+    "--site", "sites", multiple=True, required=True, help="Site property. Repeatable."
+)
+@click.option(
+    "--start",
+    type=click.DateTime(["%Y-%m-%d"]),
+    default=None,
+    help=f"First day (default: {GSC_HISTORY_DAYS} days before --end, i.e. 16 months).",
+)
+@click.option(
+    "--end",
+    type=click.DateTime(["%Y-%m-%d"]),
+    default=None,
+    help="Last day (default: today).",
+)
+@click.option(
+    "--dimension",
+    "dimensions",
+    multiple=True,
+    type=click.Choice(sorted(GSC_EXPORT_OPS)),
+    help="query -> get_keyword_performance, page -> get_page_performance. "
+    "Repeatable (default: both).",
+)
+@click.option(
+    "--chunk-days",
+    default=7,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Days per request; chunks that time out are split in half and retried.",
+)
+@click.option(
+    "--params", "-p", default="{}", help="JSON params added to every request."
+)
+@click.option(
+    "--date-params",
+    default=None,
+    metavar="START,END",
+    help="Names of the date range params (default: from the cached schema, "
+    "else start_date,end_date).",
+)
+@click.option(
+    "--site-param",
+    default=None,
+    help="Name of the site param (default: from the cached schema, else site_url).",
+)
+@click.option(
+    "--concurrency",
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(1, 64),
+    help="Chunks in flight.",
+)
+@click.pass_context
+def gsc_export(
+    ctx,
+    output,
+    sites,
+    start,
+    end,
+    dimensions,
+    chunk_days,
+    params,
+    date_params,
+    site_param,
+    concurrency,
+):
+    """Export GSC query/page performance for long date ranges.
+
+    The range is split into --chunk-days windows per site and dimension,
+    fetched concurrently (every page of each) with the usual retries.
+    Rows are tagged with site, dimension and window, deduplicated and
+    appended to OUTPUT as chunks finish, so memory stays flat. OUTPUT is
+    .csv.gz, .ndjson.gz or .parquet (needs pyarrow); exporting both
+    dimensions writes one file each (perf.query.csv.gz, perf.page.csv.gz).
+
+    \b
+      searchatlas gsc export perf.csv.gz --site sc-domain:example.com
+      searchatlas gsc export perf.parquet --site https://a.com/ --site https://b.com/ \\
+        --start 2025-06-01 --dimension query --chunk-days 3 --concurrency 16
+    """
+    import datetime as dt
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+    from concurrent.futures import wait as wait_futures
+
+    end = end.date() if end else dt.date.today()
+    start = start.date() if start else end - dt.timedelta(days=GSC_HISTORY_DAYS)
+    if start > end:
+        raise click.BadParameter("--start is after --end", param_hint="--start")
+    base = _parse_params(params)
+    if date_params:
+        names = tuple(n.strip() for n in date_params.split(","))
+        if len(names) != 2 or not all(names):
+            raise click.BadParameter("expected START,END", param_hint="--date-params")
+    dimensions = dimensions or sorted(GSC_EXPORT_OPS)
+    chunks = []
+    for dimension in dimensions:
+        op = GSC_EXPORT_OPS[dimension]
+        start_param, end_param = (
+            names
+            if date_params
+            else _schema_param(GSC_TOOL, op, GSC_DATE_PARAMS, GSC_DATE_PARAMS[0])
+        )
+        site_key = site_param or _schema_param(
+            GSC_TOOL, op, GSC_SITE_PARAMS, "site_url"
+        )
+        for site in sites:
+            chunks.append(
+                {
+                    "site": site,
+                    "dimension": dimension,
+                    "op": op,
+                    "start": start,
+                    "end": end,
+                    "date_params": (start_param, end_param),
+                    "params": {**base, site_key: site},
+                }
+            )
+    if not ctx.obj.get("no_validate"):
+        for op in {c["op"] for c in chunks}:
+            sample = next(_chunk_params(c) for c in chunks if c["op"] == op)
+            invalid = _validate_params(GSC_TOOL, op, sample)
+            if invalid:
+                _output(invalid, "rich")
+                sys.exit(1)
+
+    counts = {"chunks": 0, "split": 0, "failed": 0, "rows": 0, "duplicates": 0}
+    started = time.monotonic()
+    writers = {
+        d: _ExportWriter(_export_path(output, d) if len(dimensions) > 1 else output)
+        for d in dimensions
+    }
+    # Whole ranges are cut into windows of at most ``span`` days as they are
+    # popped. A window that times out halves ``span`` for everything not yet
+    # sent and goes back on the queue, so only requests already in flight
+    # pay for a chunk size the server cannot handle.
+    span = {"days": chunk_days}
+    queue = list(reversed(chunks))
+
+    def next_chunk() -> dict:
+        chunk = queue.pop()
+        days = (chunk["end"] - chunk["start"]).days + 1
+        if days <= span["days"]:
+            return chunk
+        windows = list(_date_chunks(chunk["start"], chunk["end"], span["days"]))
+        queue.extend({**chunk, "start": a, "end": b} for a, b in reversed(windows))
+        return queue.pop()
+
+    def fetch(client, chunk: dict):
+        try:
+            return (
+                chunk,
+                list(
+                    client.iter_pages(
+                        GSC_TOOL, chunk["op"], _chunk_params(chunk), prefetch=1
+                    )
+                ),
+                None,
+            )
+        except Exception as exc:  # retries exhausted: split or record it
+            return chunk, None, exc
+
+    def emit(chunk: dict, records, exc) -> None:
+        if exc is None:
+            rows, dupes = _chunk_rows(chunk, records)
+            writers[chunk["dimension"]].write(rows)
+            counts["chunks"] += 1
+            counts["rows"] += len(rows)
+            counts["duplicates"] += dupes
+            log.debug(
+                "%s %s %s..%s: %d rows",
+                chunk["site"],
+                chunk["dimension"],
+                chunk["start"],
+                chunk["end"],
+                len(rows),
+            )
+            return
+        days = (chunk["end"] - chunk["start"]).days + 1
+        if days > 1 and _should_split(exc):
+            counts["split"] += 1
+            span["days"] = min(span["days"], days // 2)
+            queue.append(chunk)
+            return
+        counts["failed"] += 1
+        click.echo(
+            json.dumps(
+                {
+                    "failed": {
+                        k: str(chunk[k]) for k in ("site", "dimension", "start", "end")
+                    },
+                    "error": f"{type(exc).__name__}: {exc}",
+                }
+            ),
+            err=True,
+        )
+        if str(exc).startswith("Circuit open") and queue:
+            log.error("Stopping the export: %d date ranges not fetched", len(queue))
+            counts["failed"] += len(queue)
+            queue.clear()
+
+    complete = False
+    try:
+        with contextlib.ExitStack() as stack:
+            client = stack.enter_context(_client(ctx))
+            # Timeouts here mean "chunk too big", answered by splitting; only
+            # a run of them across every window in flight means a sick backend.
+            client.breaker = CircuitBreaker(threshold=4 * concurrency)
+            pool = stack.enter_context(ThreadPoolExecutor(max_workers=concurrency))
+            pending = set()
+            while queue or pending:
+                while queue and len(pending) < 2 * concurrency:
+                    pending.add(pool.submit(fetch, client, next_chunk()))
+                done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(*future.result())
+        complete = not counts["failed"]
+    finally:
+        for writer in writers.values():
+            writer.close(complete)
+
+    click.echo(
+        f"{counts['rows']} rows from {counts['chunks']} chunks "
+        f"({counts['split']} split, {counts['failed']} failed, "
+        f"{counts['duplicates']} duplicate rows dropped) -> "
+        f"{', '.join(str(w.path if complete else w.part) for w in writers.values())} "
+        f"in {time.monotonic() - started:.1f}s",
+        err=True,
+    )
+    if counts["failed"]:
+        sys.exit(1)
+
+
+# ---------------------------------------------------------------------------
+# otto issues — local mirror of seo_analysis issues
+# ---------------------------------------------------------------------------
+
+ISSUES_STORE_FILE = CACHE_DIR / "otto_issues.sqlite"
+ISSUES_TOOL = "seo_analysis"
+ISSUES_SUMMARY_OP = "get_project_issues_summary"
+ISSUES_BY_TYPE_OP = "get_website_issues_by_type"
+PROJECT_PARAMS = ("project_id", "project_uuid", "otto_project_id", "uuid")
+ISSUE_TYPE_PARAMS = ("issue_type", "type", "issue_types")
+ISSUE_TYPE_KEYS = ("issue_type", "type", "key", "slug", "name")
+SUMMARY_KEYS = ("issue_types", "issues", "by_type", "types", "summary")
+SEVERITY_KEYS = ("severity", "priority", "level", "impact")
+URL_KEYS = ("url", "page_url", "page", "address", "link")
+
+
+def _first_field(record, keys) -> str | None:
+    if not isinstance(record, dict):
+        return None
+    value = next((record[k] for k in keys if record.get(k) is not None), None)
+    return None if value is None else str(value)
+
+
+def _issue_types(payload) -> dict[str, dict]:
+    """``{issue_type: summary entry}`` from a get_project_issues_summary payload.
+
+    Takes a list of per-type records (``[{"issue_type": ..., "count": ...}]``)
+    or a mapping of type to count or details, possibly under ``issue_types``
+    / ``issues`` / ...; grand totals (``total``, ``count``) are skipped.
+    """
+    if isinstance(payload, dict):
+        nested = next((payload[k] for k in SUMMARY_KEYS if k in payload), None)
+        if isinstance(nested, (dict, list)):
+            return _issue_types(nested)
+    records = _record_list(payload)
+    if records is not None:
+        types = {}
+        for record in records:
+            name = _first_field(record, ISSUE_TYPE_KEYS)
+            if name is not None:
+                types[name] = record
+        return types
+    if isinstance(payload, dict):
+        return {
+            name: value if isinstance(value, dict) else {"count": value}
+            for name, value in payload.items()
+            if name not in TOTAL_KEYS
+            and isinstance(value, (int, float, dict))
+            and not isinstance(value, bool)
+        }
+    return {}
+
+
+class IssueStore:
+    """SQLite mirror of OTTO issues: one row per issue, indexed for triage.
+
+    ``issue_types`` keeps each type's summary entry as synced, so a sync
+    re-fetches only the types whose summary changed and replaces their
+    rows in one transaction.
+    """
+
+    def __init__(self, path: Path = ISSUES_STORE_FILE):
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS issues ("
+            " project TEXT NOT NULL, issue_type TEXT NOT NULL, severity TEXT,"
+            " url TEXT, data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS issues_type ON issues (project, issue_type);"
+            "CREATE INDEX IF NOT EXISTS issues_severity ON issues (project, severity);"
+            "CREATE INDEX IF NOT EXISTS issues_url ON issues (url);"
+            "CREATE TABLE IF NOT EXISTS issue_types ("
+            " project TEXT NOT NULL, issue_type TEXT NOT NULL,"
+            " signature TEXT NOT NULL, issues INTEGER NOT NULL, synced_at REAL,"
+            " PRIMARY KEY (project, issue_type));"
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def signatures(self, project: str) -> dict[str, str]:
+        return dict(
+            self._db.execute(
+                "SELECT issue_type, signature FROM issue_types WHERE project = ?",
+                (project,),
+            )
+        )
+
+    def replace(
+        self, project: str, issue_type: str, summary: dict, records: list
+    ) -> None:
+        """Swap in the current issues of one type."""
+        default_severity = _first_field(summary, SEVERITY_KEYS)
+        rows = [
+            (
+                project,
+                issue_type,
+                _first_field(r, SEVERITY_KEYS) or default_severity,
+                _first_field(r, URL_KEYS),
+                json.dumps(r, separators=(",", ":"), default=str),
+            )
+            for r in records
+        ]
+        with self._db:
+            self._db.execute(
+                "DELETE FROM issues WHERE project = ? AND issue_type = ?",
+                (project, issue_type),
+            )
+            self._db.executemany("INSERT INTO issues VALUES (?, ?, ?, ?, ?)", rows)
+            self._db.execute(
+                "INSERT OR REPLACE INTO issue_types VALUES (?, ?, ?, ?, ?)",
+                (project, issue_type, _signature(summary), len(rows), time.time()),
+            )
+
+    def drop(self, project: str, issue_types) -> None:
+        """Forget types the summary no longer lists (all fixed)."""
+        with self._db:
+            for issue_type in issue_types:
+                for table in ("issues", "issue_types"):
+                    self._db.execute(
+                        f"DELETE FROM {table} WHERE project = ? AND issue_type = ?",
+                        (project, issue_type),
+                    )
+
+    def query(
+        self,
+        projects=(),
+        issue_types=(),
+        severities=(),
+        url: str | None = None,
+        count_by: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        where, args = [], []
+        for column, values in (
+            ("project", projects),
+            ("issue_type", issue_types),
+            ("severity", severities),
+        ):
+            if values:
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                args.extend(values)
+        if url:
+            # A range, not LIKE, so the url index serves prefix lookups.
+            where.append("url >= ? AND url < ?")
+            args.extend([url, url + "\U0010ffff"])
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        if count_by:
+            sql = (
+                f"SELECT {count_by}, COUNT(*) FROM issues{clause}"
+                f" GROUP BY {count_by} ORDER BY COUNT(*) DESC, {count_by}"
+            )
+        else:
+            sql = (
+                "SELECT project, issue_type, severity, url, data FROM issues"
+                f"{clause} ORDER BY project, issue_type, url"
+            )
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        cur = self._db.execute(sql, args)
+        if count_by:
+            return [{count_by: key, "issues": n} for key, n in cur]
+        keys = ("project", "issue_type", "severity", "url")
+        return [{**dict(zip(keys, row)), "data": json.loads(row[4])} for row in cur]
+
+    def inventory(self) -> list[dict]:
+        cur = self._db.execute(
+            "SELECT project, COUNT(*), SUM(issues), MAX(synced_at) FROM issue_types"
+            " GROUP BY project ORDER BY project"
+        )
+        return [
+            {
+                "project": project,
+                "issue_types": types,
+                "issues": issues,
+                "synced_at": time.strftime("%Y-%m-%d %H:%M", time.localtime(at)),
+            }
+            for project, types, issues, at in cur
+        ]
+
+
+def _signature(summary: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(summary, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+
+@otto.group("issues")
+def otto_issues():
+    """Local mirror of seo_analysis issues for fast triage queries."""
+
+
+@otto_issues.command("sync")
+@click.argument("projects", nargs=-1, required=True)
+@click.option("--full", is_flag=True, help="Re-fetch every issue type, changed or not.")
+@click.option(
+    "--project-param",
+    default=None,
+    help="Name of the project param (default: from the cached schema, "
+    "else project_id).",
+)
+@click.option(
+    "--type-param",
+    default=None,
+    help="Name of the issue type param of get_website_issues_by_type "
+    "(default: from the cached schema, else issue_type).",
+)
+@click.option(
+    "--concurrency",
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(1, 64),
+    help="Issue types fetched at once.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["rich", "json", "ndjson"]),
+    default="rich",
+    show_default=True,
+)
+@click.pass_context
+def otto_issues_sync(ctx, projects, full, project_param, type_param, concurrency, fmt):
+    """Mirror the issues of OTTO PROJECTS into the local store.
+
+    Reads each project's issue summary, then re-fetches (every page of)
+    only the issue types whose summary entry changed since the last sync;
+    types no longer listed are dropped. Use --full to refresh everything,
+    e.g. when fixes and new issues may have cancelled out in the counts.
+
+    \b
+      searchatlas otto issues sync 1234 5678
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    project_key = project_param or _schema_param(
+        ISSUES_TOOL, ISSUES_SUMMARY_OP, PROJECT_PARAMS, PROJECT_PARAMS[0]
+    )
+    type_key = type_param or _schema_param(
+        ISSUES_TOOL, ISSUES_BY_TYPE_OP, ISSUE_TYPE_PARAMS, ISSUE_TYPE_PARAMS[0]
+    )
+    validate = not ctx.obj.get("no_validate")
+    store = IssueStore()
+    try:
+        results = []
+        with _client(ctx) as client, ThreadPoolExecutor(
+            max_workers=concurrency
+        ) as pool:
+
+            def fetch(project: str, issue_type: str):
+                params = {project_key: project, type_key: issue_type}
+                try:
+                    records = list(
+                        client.iter_pages(ISSUES_TOOL, ISSUES_BY_TYPE_OP, params)
+                    )
+                except Exception as exc:  # retries exhausted: report, keep going
+                    return issue_type, None, f"{type(exc).__name__}: {exc}"
+                return issue_type, records, None
+
+            for project in projects:
+                started = time.monotonic()
+                row = {"project": project, "types": 0, "changed": 0, "removed": 0}
+                row["fetched"] = 0
+                params = {project_key: project}
+                resp = (
+                    validate
+                    and _validate_params(ISSUES_TOOL, ISSUES_SUMMARY_OP, params)
+                ) or (client.call_tool(ISSUES_TOOL, ISSUES_SUMMARY_OP, params))
+                _learn_schema(ISSUES_TOOL, ISSUES_SUMMARY_OP, resp, params)
+                msg = _error_message(resp)
+                if msg is not None:
+                    results.append({**row, "error": msg})
+                    continue
+                summary = _issue_types(_payload(resp))
+                known = store.signatures(project)
+                changed = [
+                    t
+                    for t, entry in summary.items()
+                    if full or known.get(t) != _signature(entry)
+                ]
+                removed = set(known) - set(summary)
+                store.drop(project, removed)
+                row.update(
+                    types=len(summary), changed=len(changed), removed=len(removed)
+                )
+                errors = []
+                futures = [pool.submit(fetch, project, t) for t in changed]
+                for future in as_completed(futures):
+                    issue_type, records, error = future.result()
+                    if error:
+                        errors.append(f"{issue_type}: {error}")
+                        continue
+                    store.replace(project, issue_type, summary[issue_type], records)
+                    row["fetched"] += len(records)
+                row["seconds"] = round(time.monotonic() - started, 1)
+                if errors:
+                    row["error"] = "; ".join(errors)
+                results.append(row)
+    finally:
+        store.close()
+
+    _print_rows(results, fmt, f"OTTO issues sync → {ISSUES_STORE_FILE}")
+    if any("error" in row for row in results):
+        sys.exit(1)
+
+
+@otto_issues.command("query")
+@click.argument("projects", nargs=-1)
+@click.option("--type", "issue_types", multiple=True, help="Issue type. Repeatable.")
+@click.option("--severity", "severities", multiple=True, help="Repeatable.")
+@click.option("--url", default=None, help="Only URLs starting with this.")
+@click.option(
+    "--count-by",
+    type=click.Choice(["project", "issue_type", "severity", "url"]),
+    default=None,
+    help="Return issue counts per value instead of issues.",
+)
+@click.option("--limit", default=None, type=click.IntRange(1), help="Max rows.")
+@click.option(
+    "--fields",
+    default=None,
+    callback=_parse_fields,
+    help="Comma-separated dotted paths of each issue to keep (e.g. url,title).",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["rich", "json", "ndjson"]),
+    default="rich",
+    show_default=True,
+)
+def otto_issues_query(
+    projects, issue_types, severities, url, count_by, limit, fields, fmt
+):
+    """Query mirrored issues; no network call.
+
+    With no filters or --count-by, lists the synced projects. Issues come
+    back as project, issue_type, severity, url plus the full issue record
+    (json/ndjson) or the --fields picked from it.
+
+    \b
+      searchatlas otto issues query 1234 --count-by issue_type
+      searchatlas otto issues query 1234 --type missing_meta_description --count-by project
+      searchatlas otto issues query --severity high --url https://example.com/blog/ \\
+        --format ndjson --fields title
+    """
+    if not ISSUES_STORE_FILE.exists():
+        raise click.ClickException("No issue mirror yet; run `otto issues sync` first.")
+    store = IssueStore()
+    try:
+        if not (projects or issue_types or severities or url or count_by):
+            rows, title = store.inventory(), "OTTO issue mirror"
+        else:
+            rows = store.query(projects, issue_types, severities, url, count_by, limit)
+            title = f"Issues by {count_by}" if count_by else "Issues"
+    finally:
+        store.close()
+    if fields or fmt == "rich":
+        for row in rows:
+            data = row.pop("data", None)
+            if fields and data is not None:
+                row.update(_project(data, fields))
+    _print_rows(rows, fmt, title, "nothing matches — run `otto issues sync`?")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+"""Shared fixtures: the CLI module and a stand-in MCP server per test."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+# Registry, routes and response caches live here, never in the user's cache dir.
+os.environ["SEARCHATLAS_CACHE_DIR"] = tempfile.mkdtemp(prefix="sa-tests-")
+
+import searchatlas_cli as sa  # noqa: E402
+from standin_server import serve_in_thread  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    yield
+    shutil.rmtree(sa.CACHE_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def standin():
+    """Start a stand-in server: ``server, url = standin(**config)``."""
+    servers = []
+
+    def start(**config):
+        server, url = serve_in_thread(**{"latency_ms": 1.0, "seed": 0, **config})
+        servers.append(server)
+        return server, url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def env(standin):
+    """CliRunner environment pointing the CLI at a fresh stand-in server."""
+    server, url = standin()
+    return server, {"MCP_API_KEY": "test", "MCP_ENDPOINT": url}
@@ -0,0 +1,79 @@
+"""ResponseCache: hits, TTL expiry and invalidation by writes."""
+
+from __future__ import annotations
+
+import time
+
+from click.testing import CliRunner
+
+import searchatlas_cli as sa
+
+TOOL, OP = "project_management", "list_otto_projects"
+WRITE = "engage_otto_project"
+
+
+def client(url, api_key="test"):
+    return sa.MCPClient(api_key, url, cache=sa.ResponseCache())
+
+
+def test_read_ops_are_served_from_cache_per_api_key(standin):
+    server, url = standin()
+    with client(url) as c:
+        first = c.call_tool(TOOL, OP, {"page": 1})
+        assert c.call_tool(TOOL, OP, {"page": 1}) == first
+        c.call_tool(TOOL, OP, {"page": 2})
+    assert server.state.stats["rpc_calls"] == 2
+    with client(url, api_key="other") as c:
+        c.call_tool(TOOL, OP, {"page": 1})
+    assert server.state.stats["rpc_calls"] == 3
+
+
+def test_entries_expire_after_their_ttl(standin, monkeypatch):
+    server, url = standin()
+    with client(url) as c:
+        c.call_tool(TOOL, OP, {})
+        now = time.time()
+        monkeypatch.setattr(sa.time, "time", lambda: now + sa._response_ttl(OP) + 1)
+        c.call_tool(TOOL, OP, {})
+    assert server.state.stats["rpc_calls"] == 2
+
+
+def test_status_and_write_ops_are_never_cached():
+    assert sa._response_ttl("get_otto_task_status") == 0
+    assert sa._response_ttl("check_ps_status") == 0
+    assert sa._response_ttl(WRITE) == 0
+    assert sa._response_ttl("get_brand") == 300
+
+
+def test_write_invalidates_the_tool_only(standin):
+    server, url = standin()
+    with client(url) as c:
+        c.call_tool(TOOL, OP, {})
+        c.call_tool("reports", "list_reports", {})
+        c.call_tool(TOOL, WRITE, {"project_id": 1})
+        c.call_tool(TOOL, OP, {})
+        c.call_tool("reports", "list_reports", {})
+    # list, list, write, re-fetched list; reports still cached
+    assert server.state.stats["rpc_calls"] == 4
+
+
+def test_batch_reads_cache_and_writes_invalidate(standin):
+    server, url = standin()
+    with client(url) as c:
+        c.call_tool(TOOL, OP, {})
+        c.batch([(TOOL, OP, {}), (TOOL, OP, {"page": 2})])
+        assert server.state.stats["rpc_calls"] == 2  # only page 2 went out
+        c.batch([(TOOL, WRITE, {"project_id": 1})])
+        c.call_tool(TOOL, OP, {})
+    assert server.state.stats["rpc_calls"] == 4
+
+
+def test_cli_cache_flag(env):
+    server, environ = env
+    args = ["--cache", "call", TOOL, OP, "--format", "json"]
+    for _ in range(2):
+        assert CliRunner().invoke(sa.cli, args, env=environ).exit_code == 0
+    assert server.state.stats["rpc_calls"] == 1
+    refresh = ["--cache", "--refresh-cache", *args[1:]]
+    assert CliRunner().invoke(sa.cli, refresh, env=environ).exit_code == 0
+    assert server.state.stats["rpc_calls"] == 2
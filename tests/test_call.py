@@ -0,0 +1,171 @@
+"""`call` fan-out paths: --input bulk writes, journals, dry runs, --accounts."""
+
+from __future__ import annotations
+
+import json
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import searchatlas_cli as sa
+
+WRITE = ["website_studio_tools", "create_project"]
+
+
+@pytest.fixture
+def ndjson(tmp_path):
+    path = tmp_path / "in.ndjson"
+    path.write_text('{"name": "a"}\n\n{"name": "b"}\n')
+    return str(path)
+
+
+def test_input_dry_run_sends_nothing(env, ndjson):
+    server, environ = env
+    result = CliRunner().invoke(
+        sa.cli, ["call", *WRITE, "--input", ndjson, "--dry-run"], env=environ
+    )
+    assert result.exit_code == 0, result.output
+    payloads = [json.loads(line) for line in result.output.splitlines()[1:]]
+    assert [p["params"]["arguments"]["params"]["name"] for p in payloads] == [
+        "a",
+        "b",
+    ]
+    assert server.state.stats["rpc_calls"] == 0
+
+
+@pytest.mark.parametrize(
+    "extra", [["--all-pages"], ["--format", "json"], ["--batch", "{ndjson}"]]
+)
+def test_input_rejects_conflicting_flags(env, ndjson, extra):
+    server, environ = env
+    extra = [arg.format(ndjson=ndjson) for arg in extra]
+    result = CliRunner().invoke(
+        sa.cli, ["call", *WRITE, "--input", ndjson, *extra], env=environ
+    )
+    assert result.exit_code == 2
+    assert server.state.stats["rpc_calls"] == 0
+
+
+def recording(server) -> list:
+    """Wrap the stand-in so every tools/call's (op, params) is recorded."""
+    seen, call = [], server.state.call
+
+    def record(name, op, params):
+        seen.append((op, params))
+        return call(name, op, params)
+
+    server.state.call = record
+    return seen
+
+
+def test_write_input_is_sent_once_per_line(env, ndjson):
+    server, environ = env
+    seen = recording(server)
+    result = CliRunner().invoke(
+        sa.cli, ["call", *WRITE, "--input", ndjson], env=environ
+    )
+    assert result.exit_code == 0, result.output
+    assert sorted(p["name"] for _, p in seen) == ["a", "b"]
+    records = [json.loads(line) for line in result.output.splitlines()[:2]]
+    assert sorted(r["line"] for r in records) == [1, 3]
+    assert all(r["ok"] for r in records)
+
+
+def test_journal_resume_only_resends_failed_lines(env, tmp_path):
+    server, environ = env
+    seen, call = [], server.state.call
+
+    def flaky(name, op, params):
+        seen.append(params["name"])
+        if params["name"] == "b" and seen.count("b") == 1:
+            return {
+                "content": [{"type": "text", "text": "Invalid site"}],
+                "isError": True,
+            }
+        return call(name, op, params)
+
+    server.state.call = flaky
+    lines = tmp_path / "in.ndjson"
+    lines.write_text("".join(json.dumps({"name": n}) + "\n" for n in "abc"))
+    journal = tmp_path / "run.jsonl"
+    args = ["call", *WRITE, "--input", str(lines), "--journal", str(journal)]
+    runner = CliRunner()
+    assert runner.invoke(sa.cli, args, env=environ).exit_code == 1
+    result = runner.invoke(sa.cli, [*args, "--resume"], env=environ)
+    assert result.exit_code == 0, result.output
+    assert sorted(seen) == ["a", "b", "b", "c"]
+    entries = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert [e["ok"] for e in entries if e["line"] == 2] == [False, True]
+
+
+def test_resume_without_journal_is_a_usage_error(env, ndjson):
+    _, environ = env
+    result = CliRunner().invoke(
+        sa.cli, ["call", *WRITE, "--input", ndjson, "--resume"], env=environ
+    )
+    assert result.exit_code == 2
+
+
+ACCOUNTS = """
+[accounts.a]
+api_key = "key-a"
+params = {project_id = 1}
+
+[accounts.b]
+api_key_env = "B_KEY"
+params = {project_id = 2}
+
+[accounts.c]
+api_key = "key-c"
+params = {project_id = 3}
+"""
+
+
+@pytest.fixture
+def accounts(tmp_path):
+    path = tmp_path / "accounts.toml"
+    path.write_text(ACCOUNTS)
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "extra, names", [([], ["a", "b", "c"]), (["--shard", "1/2"], ["b"])]
+)
+def test_accounts_run_once_each_and_shard(env, accounts, extra, names):
+    server, environ = env
+    seen = recording(server)
+    args = ["call", "project_management", "list_otto_projects", "--accounts"]
+    result = CliRunner().invoke(
+        sa.cli,
+        [*args, accounts, "-p", '{"page": 1}', "--workers", "1", *extra],
+        env={**environ, "B_KEY": "key-b"},
+    )
+    assert result.exit_code == 0, result.output
+    records = [
+        json.loads(line) for line in result.output.splitlines() if line[:1] == "{"
+    ]
+    assert sorted(r["account"] for r in records) == names
+    assert all(r["ok"] for r in records)
+    project = {"a": 1, "b": 2, "c": 3}
+    assert sorted(p["project_id"] for _, p in seen) == [project[n] for n in names]
+    assert all(p["page"] == 1 for _, p in seen)
+
+
+def test_accounts_reject_missing_keys(env, tmp_path):
+    _, environ = env
+    path = tmp_path / "accounts.toml"
+    path.write_text('[accounts.a]\napi_key_env = "UNSET_KEY"\n')
+    result = CliRunner().invoke(
+        sa.cli,
+        ["call", "project_management", "list_otto_projects", "--accounts", str(path)],
+        env=environ,
+    )
+    assert result.exit_code == 2
+    assert "account 'a'" in result.output
+
+
+@pytest.mark.parametrize("value", ["2/2", "x/3", "1"])
+def test_shard_must_be_k_of_n(value):
+    with pytest.raises(click.BadParameter):
+        sa._parse_shard(None, None, value)
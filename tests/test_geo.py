@@ -0,0 +1,41 @@
+"""geo sync: trend payload parsing and the local store."""
+
+from __future__ import annotations
+
+from click.testing import CliRunner
+
+import searchatlas_cli as sa
+
+
+def test_trend_points_label_by_dimensions_and_skip_ids():
+    payload = {
+        "brand_id": 7,
+        "trend": [
+            {
+                "date": "2026-01-01",
+                "id": 99,
+                "competitor_id": 3,
+                "competitor": "a.com",
+                "model": "gpt-4o",
+                "note": "free text is not a dimension",
+                "visibility": 0.4,
+            }
+        ],
+    }
+    assert sa._trend_points(payload, "2026-02-01") == [
+        ("visibility", "competitor=a.com, model=gpt-4o", "2026-01-01", 0.4)
+    ]
+
+
+def test_sync_closes_the_store_when_a_call_raises(standin, monkeypatch):
+    _, url = standin(throttle_rate=1.0)
+    closed = []
+    close = sa.TrendStore.close
+    monkeypatch.setattr(sa.TrendStore, "close", lambda self: closed.append(close(self)))
+    result = CliRunner().invoke(
+        sa.cli,
+        ["--retries", "0", "geo", "sync", "get_visibility_trend", "--format", "json"],
+        env={"MCP_API_KEY": "test", "MCP_ENDPOINT": url},
+    )
+    assert isinstance(result.exception, sa.httpx.HTTPStatusError)
+    assert closed == [None]
@@ -0,0 +1,108 @@
+"""`gsc export`: date chunking, splitting of failing chunks, row dedupe."""
+
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import json
+
+from click.testing import CliRunner
+
+import searchatlas_cli as sa
+
+
+def gsc_server(server, max_days: int) -> list:
+    """Serve GSC rows per day; windows over ``max_days`` fail like a timeout.
+
+    Each window also repeats its first row and includes the day before it,
+    both of which the export must drop.
+    """
+    windows = []
+
+    def call(name, op, params):
+        start = dt.date.fromisoformat(params["start_date"])
+        end = dt.date.fromisoformat(params["end_date"])
+        windows.append((str(start), str(end)))
+        if (end - start).days + 1 > max_days:
+            text, error = "Internal Server Error", True
+        else:
+            days = [
+                start + dt.timedelta(days=i) for i in range(-1, (end - start).days + 1)
+            ]
+            rows = [{"date": str(d), "query": "q", "clicks": d.day} for d in days]
+            text, error = json.dumps(rows + rows[1:2]), False
+        return {"content": [{"type": "text", "text": text}], "isError": error}
+
+    server.state.call = call
+    return windows
+
+
+def export(environ, output, *extra):
+    args = ["--retries", "0", "gsc", "export", str(output), "--site", "sc-domain:a.com"]
+    args += ["--start", "2026-01-01", "--end", "2026-01-08", "--dimension", "query"]
+    return CliRunner().invoke(sa.cli, [*args, *extra], env=environ)
+
+
+def read_rows(path) -> list[dict]:
+    with gzip.open(path, "rt") as fh:
+        return [json.loads(line) for line in fh]
+
+
+def test_export_dedupes_rows_and_tags_windows(env, tmp_path):
+    server, environ = env
+    windows = gsc_server(server, max_days=31)
+    output = tmp_path / "perf.ndjson.gz"
+    result = export(environ, output, "--chunk-days", "3")
+    assert result.exit_code == 0, result.output
+    assert sorted(windows) == [
+        ("2026-01-01", "2026-01-03"),
+        ("2026-01-04", "2026-01-06"),
+        ("2026-01-07", "2026-01-08"),
+    ]
+    rows = read_rows(output)
+    assert sorted(r["date"] for r in rows) == [f"2026-01-0{d}" for d in range(1, 9)]
+    assert {(r["site"], r["dimension"]) for r in rows} == {("sc-domain:a.com", "query")}
+    first = next(r for r in rows if r["date"] == "2026-01-05")
+    assert (first["start_date"], first["end_date"]) == ("2026-01-04", "2026-01-06")
+    assert "6 duplicate rows dropped" in result.output
+
+
+def test_failing_chunks_are_split_and_retried(env, tmp_path):
+    server, environ = env
+    windows = gsc_server(server, max_days=2)
+    output = tmp_path / "perf.ndjson.gz"
+    result = export(environ, output, "--chunk-days", "4", "--concurrency", "1")
+    assert result.exit_code == 0, result.output
+    assert len(read_rows(output)) == 8
+    assert sorted(set(windows)) == [
+        ("2026-01-01", "2026-01-02"),
+        ("2026-01-01", "2026-01-04"),
+        ("2026-01-03", "2026-01-04"),
+        ("2026-01-05", "2026-01-06"),
+        ("2026-01-05", "2026-01-08"),
+        ("2026-01-07", "2026-01-08"),
+    ]
+    assert "(2 split, 0 failed" in result.output
+
+
+def test_failed_export_is_left_as_part_file(env, tmp_path):
+    server, environ = env
+    gsc_server(server, max_days=0)
+    output = tmp_path / "perf.ndjson.gz"
+    result = export(environ, output, "--chunk-days", "1", "--concurrency", "1")
+    assert result.exit_code == 1
+    assert not output.exists()
+    assert (tmp_path / "perf.ndjson.gz.part").exists()
+
+
+def test_both_dimensions_write_one_file_each(env, tmp_path):
+    server, environ = env
+    gsc_server(server, max_days=31)
+    output = tmp_path / "perf.ndjson.gz"
+    args = ["--retries", "0", "gsc", "export", str(output), "--site", "a.com"]
+    args += ["--start", "2026-01-01", "--end", "2026-01-02"]
+    result = CliRunner().invoke(sa.cli, args, env=environ)
+    assert result.exit_code == 0, result.output
+    for dimension in ("query", "page"):
+        rows = read_rows(tmp_path / f"perf.{dimension}.ndjson.gz")
+        assert {r["dimension"] for r in rows} == {dimension} and len(rows) == 2
@@ -0,0 +1,87 @@
+"""`otto issues sync`: only changed issue types are re-fetched."""
+
+from __future__ import annotations
+
+import json
+
+from click.testing import CliRunner
+
+import searchatlas_cli as sa
+
+
+def issues_server(server, summary: dict) -> list:
+    """Serve ``summary`` ({type: count}) and ``count`` issues per type."""
+    fetched = []
+
+    def call(name, op, params):
+        if op == sa.ISSUES_SUMMARY_OP:
+            payload = {
+                "total": sum(summary.values()),
+                "issue_types": [
+                    {"issue_type": t, "count": n, "severity": "high"}
+                    for t, n in summary.items()
+                ],
+            }
+        else:
+            issue_type = params["issue_type"]
+            fetched.append((params["project_id"], issue_type))
+            payload = [
+                {"url": f"https://a.com/{issue_type}/{i}"}
+                for i in range(summary[issue_type])
+            ]
+        return {"content": [{"type": "text", "text": json.dumps(payload)}]}
+
+    server.state.call = call
+    return fetched
+
+
+def sync(environ, *args):
+    result = CliRunner().invoke(
+        sa.cli, ["otto", "issues", "sync", "p1", "--format", "json", *args], env=environ
+    )
+    assert result.exit_code == 0, result.output
+    (row,) = json.loads(result.output)
+    return row
+
+
+def stored() -> dict:
+    store = sa.IssueStore(sa.ISSUES_STORE_FILE)
+    try:
+        return {
+            r["issue_type"]: r["issues"]
+            for r in store.query(["p1"], count_by="issue_type")
+        }
+    finally:
+        store.close()
+
+
+def test_sync_refetches_changed_types_and_drops_fixed_ones(env):
+    server, environ = env
+    summary = {"missing_title": 2, "broken_link": 1}
+    fetched = issues_server(server, summary)
+    row = sync(environ)
+    assert (row["types"], row["changed"], row["fetched"]) == (2, 2, 3)
+    assert stored() == {"missing_title": 2, "broken_link": 1}
+
+    fetched.clear()
+    row = sync(environ)
+    assert (row["changed"], row["fetched"], fetched) == (0, 0, [])
+
+    summary.update(broken_link=3, thin_content=1)
+    del summary["missing_title"]
+    row = sync(environ)
+    assert sorted(fetched) == [("p1", "broken_link"), ("p1", "thin_content")]
+    assert (row["changed"], row["removed"]) == (2, 1)
+    assert stored() == {"broken_link": 3, "thin_content": 1}
+
+    fetched.clear()
+    sync(environ, "--full")
+    assert sorted(fetched) == [("p1", "broken_link"), ("p1", "thin_content")]
+
+
+def test_issue_types_shapes():
+    assert sa._issue_types({"summary": {"a": 2, "b": {"count": 1}, "total": 3}}) == {
+        "a": {"count": 2},
+        "b": {"count": 1},
+    }
+    assert list(sa._issue_types([{"type": "a"}, {"slug": "b"}])) == ["a", "b"]
@@ -0,0 +1,33 @@
+"""`_output` rendering of tools/call responses in each format."""
+
+from __future__ import annotations
+
+import json
+
+import searchatlas_cli as sa
+
+
+def test_ndjson_writes_every_record_across_chunks(capsys):
+    records = [{"id": i, "url": f"https://a.com/{i}"} for i in range(2500)]
+    data = {"result": {"content": [{"type": "text", "text": json.dumps(records)}]}}
+    sa._output(data, "ndjson", ["id"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": i} for i in range(2500)]
+
+
+def rich_output(monkeypatch, capsys, text: str) -> str:
+    from rich.console import Console
+
+    monkeypatch.setattr(sa, "console", Console(width=200, no_color=True))
+    sa._output({"result": {"content": [{"type": "text", "text": text}]}}, "rich")
+    return capsys.readouterr().out
+
+
+def test_rich_prints_labelled_text_as_sent(monkeypatch, capsys):
+    out = rich_output(monkeypatch, capsys, 'Location details\n{"id": 1}')
+    assert out.splitlines() == ["Location details", '{"id": 1}']
+
+
+def test_rich_pretty_prints_json_text(monkeypatch, capsys):
+    out = rich_output(monkeypatch, capsys, '{"id": 1}')
+    assert [line.rstrip() for line in out.splitlines()] == ["{", '  "id": 1', "}"]
@@ -0,0 +1,114 @@
+"""`_run_playbook` scheduling: dependencies, failures and cancellation."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+import searchatlas_cli as sa
+
+
+class FakeClient:
+    """Answers call_tool from ``handlers[op]``: a value, or an exception."""
+
+    def __init__(self, **handlers):
+        self.handlers = handlers
+        self.calls = []
+        self.cancelled = []
+
+    async def call_tool(self, name, op, params=None):
+        self.calls.append((op, params))
+        handler = self.handlers.get(op, {"ok": True})
+        if isinstance(handler, float):
+            try:
+                await asyncio.sleep(handler)
+            except asyncio.CancelledError:
+                self.cancelled.append(op)
+                raise
+            handler = {"ok": True}
+        if isinstance(handler, Exception):
+            raise handler
+        return {"result": {"content": [{"type": "text", "text": json.dumps(handler)}]}}
+
+
+def step(sid, op=None, **extra):
+    return {"id": sid, "tool": "t", "op": op or sid, **extra}
+
+
+def run(client, steps, on_event=lambda *a: None):
+    return asyncio.run(sa._run_playbook(client, steps, {}, on_event))
+
+
+def test_exception_in_a_step_fails_it_and_skips_dependents():
+    client = FakeClient(a=ValueError("bad payload"), c={"id": 7})
+    steps = [
+        step("a"),
+        step("b", params={"x": "${a.id}"}),
+        step("c"),
+        step("d", params={"id": "${c.id}"}),
+    ]
+    records = {r["id"]: r for r in run(client, steps)}
+    assert records["a"]["status"] == "failed"
+    assert records["a"]["error"] == "ValueError: bad payload"
+    assert records["b"]["status"] == "skipped"
+    assert records["c"]["status"] == records["d"]["status"] == "ok"
+    assert ("d", {"id": 7}) in client.calls
+    assert [op for op, _ in client.calls].count("b") == 0
+
+
+def test_pending_steps_are_cancelled_when_the_run_aborts():
+    client = FakeClient(slow=5.0)
+
+    def on_event(sid, status, rec):
+        if sid == "fast" and status == "ok":
+            raise RuntimeError("reporter broke")
+
+    async def main():
+        steps = [step("fast"), step("slow")]
+        with pytest.raises(RuntimeError):
+            await sa._run_playbook(client, steps, {}, on_event)
+        # Cancelled by _run_playbook itself, not by asyncio.run's cleanup
+        return list(client.cancelled)
+
+    assert asyncio.run(main()) == ["slow"]
+
+
+def test_dag_against_standin_waits_renders_and_skips(standin):
+    server, url = standin(task_seconds=0.2)
+    seen, call = [], server.state.call
+
+    def record(name, op, params):
+        seen.append((op, params))
+        if op == "get_broken":
+            return {"content": [{"type": "text", "text": "Not found"}], "isError": True}
+        return call(name, op, params)
+
+    server.state.call = record
+    steps = [
+        step("projects", "list_otto_projects", params={"page_size": 2}),
+        step(
+            "recommend",
+            "generate_bulk_recommendations",
+            params={"project_id": "${projects.results[1].id}"},
+            wait="otto",
+        ),
+        step("report", "list_reports", params={"after": "${recommend.task_id}"}),
+        step("broken", "get_broken"),
+        step("after_broken", "list_reports", params={"x": "${broken.id}"}),
+    ]
+
+    async def main():
+        async with sa.AsyncMCPClient("test", url) as client:
+            return await sa._run_playbook(client, steps, {}, lambda *a: None)
+
+    records = {r["id"]: r for r in asyncio.run(main())}
+    assert records["recommend"]["task"]["status"] == "SUCCESS"
+    assert records["report"]["status"] == "ok"
+    assert records["broken"]["status"] == "failed"
+    assert records["after_broken"]["status"] == "skipped"
+    assert ("generate_bulk_recommendations", {"project_id": 1}) in seen
+    report = next(p for op, p in seen if op == "list_reports")
+    assert report == {"after": records["recommend"]["task"]["task_id"]}
+    assert [op for op, _ in seen].count("list_reports") == 1
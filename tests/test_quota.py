@@ -0,0 +1,68 @@
+"""QuotaGuard matching of QUOTA_RULES to snapshot balances."""
+
+from __future__ import annotations
+
+import json
+
+import searchatlas_cli as sa
+
+
+def text(payload) -> dict:
+    return {"result": {"content": [{"type": "text", "text": json.dumps(payload)}]}}
+
+
+def guard() -> sa.QuotaGuard:
+    quota = sa.QuotaGuard()
+    quota.load(
+        {
+            ("quota_management", "get_otto_quota"): text(
+                {"ai_suggestions": {"remaining": 2}, "content": {"remaining": 5}}
+            ),
+            ("payment", "get_hdc_balance"): text({"balance": 1}),
+            ("grids", "get_heatmap_quota"): text({"remaining": 0}),
+        }
+    )
+    return quota
+
+
+def test_rules_spend_the_balance_of_their_source():
+    quota = guard()
+    assert quota.reserve("distribution", "publish_press_release", {}) is None
+    refused = quota.reserve("distribution", "publish_press_release", {})
+    assert "payment.get_hdc_balance" in sa._error_message(refused)
+    assert quota.reserve("grids", "refresh_grid", {}) is not None
+
+
+def test_rule_patterns_ignore_the_source_prefix():
+    quota = guard()
+    quota.reserve("seo_analysis", "generate_bulk_recommendations", {"urls": [1, 2]})
+    assert quota.balances["quota_management.get_otto_quota.ai_suggestions"] == 0
+    quota.reserve("content_generation", "generate_complete_article", {})
+    assert quota.balances["quota_management.get_otto_quota.content"] == 4
+
+
+def test_batch_applies_quota_guard_and_circuit_breaker(standin):
+    server, url = standin()
+    call = server.state.call
+
+    def with_quota(name, op, params):
+        if op == "get_heatmap_quota":
+            return {"content": [{"type": "text", "text": '{"remaining": 0}'}]}
+        return call(name, op, params)
+
+    server.state.call = with_quota
+    with sa.MCPClient("test", url, quota=sa.QuotaGuard()) as client:
+        for _ in range(client.breaker.threshold):
+            client.breaker.record("reports -> list_reports", failed=True)
+        refused, open_circuit, ok = client.batch(
+            [
+                ("grids", "refresh_grid", {"grid_id": 1}),
+                ("reports", "list_reports", {}),
+                ("project_management", "list_otto_projects", {}),
+            ]
+        )
+    assert "Quota exhausted" in sa._error_message(refused)
+    assert "Circuit open" in sa._error_message(open_circuit)
+    assert sa._error_message(ok) is None
+    # 3 quota sources + the one batch POST holding only the healthy call
+    assert server.state.stats["http_requests"] == 4
@@ -0,0 +1,159 @@
+"""Smoke tests of the client and CLI against benchmarks/standin_server.py."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import searchatlas_cli as sa
+
+TOOL, OP = "project_management", "list_otto_projects"
+FAST_RETRY = sa.RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.01)
+
+
+def records(resp: dict) -> list:
+    return sa._record_list(sa._payload(resp))
+
+
+def test_call_tool(standin):
+    _, url = standin(items=5)
+    with sa.MCPClient("test", url) as client:
+        resp = client.call_tool(TOOL, OP, {})
+    assert sa._error_message(resp) is None
+    assert [r["id"] for r in records(resp)] == [0, 1, 2, 3, 4]
+
+
+def test_batch_is_one_post_in_submission_order(standin):
+    server, url = standin()
+    calls = [(TOOL, OP, {"page": 1, "page_size": 1 + i}) for i in range(5)]
+    with sa.MCPClient("test", url) as client:
+        results = client.batch(calls)
+    assert [len(records(r)) for r in results] == [1, 2, 3, 4, 5]
+    assert server.state.stats["http_requests"] == 1
+
+
+def test_failed_batch_post_is_traced(standin, tmp_path):
+    _, url = standin(throttle_rate=1.0)
+    metrics, recorder = sa.Metrics(), sa.Recorder(tmp_path / "traffic.jsonl")
+    retry = sa.RetryPolicy(max_attempts=1)
+    client = sa.MCPClient("test", url, retry=retry, metrics=metrics, recorder=recorder)
+    with client, pytest.raises(sa.httpx.HTTPStatusError):
+        client.batch([(TOOL, OP, {}), ("reports", "list_reports", {})])
+    recorder.close()
+    assert metrics.summary()["batch -> tools/call"]["errors"] == {"http_429": 1}
+    first = json.loads((tmp_path / "traffic.jsonl").read_text().splitlines()[0])
+    assert isinstance(first["request"], list)
+
+
+def test_iter_pages_fetches_every_record(standin):
+    _, url = standin(items=120)
+    with sa.MCPClient("test", url) as client:
+        ids = [r["id"] for r in client.iter_pages(TOOL, OP, {"page_size": 50})]
+    assert ids == list(range(120))
+
+
+def test_read_ops_retry_and_write_ops_do_not(standin):
+    server, url = standin(error_rate=1.0)
+    with sa.MCPClient("test", url, retry=FAST_RETRY) as client:
+        client.call_tool(TOOL, OP, {})
+        assert server.state.stats["rpc_calls"] == 3
+        resp = client.call_tool("website_studio_tools", "create_project", {})
+    assert sa._error_message(resp) == "Internal Server Error"
+    assert server.state.stats["rpc_calls"] == 4
+
+
+def test_throttled_write_is_retried(standin):
+    server, url = standin(throttle_rate=0.5)
+    with sa.MCPClient("test", url, retry=sa.RetryPolicy(max_attempts=10)) as client:
+        for _ in range(5):
+            resp = client.call_tool("website_studio_tools", "create_project", {})
+            assert sa._error_message(resp) is None
+    assert server.state.stats["throttled"] > 0
+
+
+def test_task_polling_reaches_success(standin):
+    _, url = standin(task_seconds=0.3)
+
+    async def run():
+        async with sa.AsyncMCPClient("test", url) as client:
+            started = await client.call_tool(
+                "seo_analysis", "generate_bulk_recommendations", {}
+            )
+            task_id = sa._find_task_id(sa._payload(started))
+            return await sa._poll_tasks(
+                client,
+                *sa.TASK_TOOLS["otto"],
+                [task_id],
+                10,
+                lambda *a: None,
+            )
+
+    (result,) = asyncio.run(run())
+    assert result["status"] == "SUCCESS"
+
+
+def test_playbook_rejects_unknown_wait_kind():
+    with pytest.raises(ValueError, match="unknown task kind"):
+        sa._playbook_levels([{"id": "a", "tool": TOOL, "op": OP, "wait": "nope"}])
+
+
+def test_cli_call_json(env):
+    _, environ = env
+    result = CliRunner().invoke(
+        sa.cli, ["call", TOOL, OP, "--format", "json"], env=environ
+    )
+    assert result.exit_code == 0, result.output
+    assert "result" in json.loads(result.output)
+
+
+def test_cli_category_shortcut_routes_op(env):
+    server, environ = env
+    result = CliRunner().invoke(sa.cli, ["otto", OP, "--format", "json"], env=environ)
+    assert result.exit_code == 0, result.output
+    assert server.state.stats["rpc_calls"] == 2  # tools/list + the call
+
+
+def test_cli_replay_skips_writes(env, tmp_path):
+    server, environ = env
+    capture = tmp_path / "traffic.jsonl"
+    runner = CliRunner()
+    for op in (OP, "engage_otto_project"):
+        args = ["--record", str(capture), "call", TOOL, op, "--format", "json"]
+        assert runner.invoke(sa.cli, args, env=environ).exit_code == 0
+    before = server.state.stats["rpc_calls"]
+    result = runner.invoke(
+        sa.cli,
+        ["replay", str(capture), "--speed", "0", "--format", "json"],
+        env=environ,
+    )
+    assert result.exit_code == 0, result.output
+    assert server.state.stats["rpc_calls"] - before == 1
+
+
+def test_cli_replay_confirms_production_writes_on_stderr(env, tmp_path):
+    _, environ = env
+    capture = tmp_path / "traffic.jsonl"
+    args = ["--record", str(capture), "call", TOOL, "engage_otto_project"]
+    assert CliRunner().invoke(sa.cli, args, env=environ).exit_code == 0
+    result = CliRunner().invoke(
+        sa.cli,
+        ["replay", str(capture), "--include-writes", "--format", "ndjson"],
+        env={**environ, "MCP_ENDPOINT": None},
+        input="n\n",
+    )
+    assert result.exit_code == 1
+    assert result.stdout == ""
+    assert "re-sent to production" in result.stderr
+
+
+def test_shell_survives_bare_commands(env):
+    _, environ = env
+    result = CliRunner().invoke(
+        sa.cli, ["shell"], env=environ, input="call\ndiscover\nexit\n"
+    )
+    assert result.exit_code == 0, result.output
+    assert "Usage: call TOOL OP" in result.output
+    assert "Usage: discover TOOL OP" in result.output